@@ -0,0 +1,7 @@
+import importlib.metadata
+
+try:
+    __version__ = importlib.metadata.version("ladar")
+except importlib.metadata.PackageNotFoundError:
+    # Running from a source tree that is not installed
+    __version__ = "0+unknown"
@@ -0,0 +1,36 @@
+# Manifest of the built-in algorithms, so that they are discovered without
+# importing them and their dependencies (scikit-learn, numpy, Levenshtein). The
+# command line arguments of an algorithm are only added, by the `add_arguments`
+# of its class, when a pipeline uses it.
+ALGORITHMS = {
+    "dbscan": {
+        "module": "ladar.api.algorithms.dbscan",
+        "class": "DBSCAN",
+        "category": "clustering",
+    },
+    "hashing": {
+        "module": "ladar.api.algorithms.hashing",
+        "class": "Hashing",
+        "category": "feature_extraction",
+    },
+    "minhash": {
+        "module": "ladar.api.algorithms.minhash",
+        "class": "MinHash",
+        "category": "blocking",
+    },
+    "minmaxscaler": {
+        "module": "ladar.api.algorithms.minmaxscaler",
+        "class": "MinMaxScaler",
+        "category": "normalization",
+    },
+    "tfidf": {
+        "module": "ladar.api.algorithms.tfidf",
+        "class": "TFIDF",
+        "category": "feature_extraction",
+    },
+    "tiered": {
+        "module": "ladar.api.algorithms.tiered",
+        "class": "Tiered",
+        "category": "matching",
+    },
+}
@@ -13,6 +13,8 @@ class AlgorithmCategory(Enum):
     FEATURE_EXTRACTION = "feature_extraction"
     TRANSFORMATION = "transformation"
     NORMALIZATION = "normalization"
+    BLOCKING = "blocking"
+    MATCHING = "matching"
 
 
 class BaseAlgorithm:
@@ -21,9 +23,13 @@ class BaseAlgorithm:
 
     Attributes:
         category (AlgorithmCategory): The category of the algorithm (e.g., clustering, transformation).
+        streaming (bool): Whether the algorithm only reads the elements of the
+            structures (see `ladar.api.elements.iter_elements`), so that the
+            structures streamed from JSON Lines files are not loaded for it.
     """
 
     category = None  # To be defined in the child classes
+    streaming = False
 
     def __init__(self, **params):
         """
@@ -1,36 +1,232 @@
 import logging
 
-import Levenshtein
 import numpy as np
-from sklearn.cluster import DBSCAN
-
-logger = logging.getLogger(__name__)
-
-
-# ladar/algorithms/dbscan.py
+import sklearn.cluster
 
 from ladar.api.algorithms.base import AlgorithmCategory, BaseAlgorithm
+from ladar.api.blocking import (
+    are_compatible,
+    get_partitions,
+    iter_partition_blocks,
+    unpack_blocking,
+)
+from ladar.api.distance import (
+    block_neighbors_graph,
+    hierarchical_neighbors_graph,
+    radius_neighbors_graph,
+)
+from ladar.api.elements import collect_elements, get_parents
+
+logger = logging.getLogger(__name__)
 
 
 class DBSCAN(BaseAlgorithm):
     """
     DBSCAN clustering algorithm.
+
+    The classes, functions and methods of the structures are clustered on the
+    normalized Levenshtein distance between their names and signatures (and
+    optionally docstrings): elements of different structures in the same cluster
+    are likely to be equivalent.
+
+    After a blocking step (e.g., 'block:minhash,cluster:dbscan'), only the
+    candidate pairs of elements are compared.
     """
 
     category = AlgorithmCategory.CLUSTERING
+    streaming = True
+
+    # The pairs of elements compared by each mode
+    MODES = ("all", "bipartite", "hierarchical")
+
+    def __init__(
+        self,
+        eps=0.5,
+        min_samples=2,
+        jobs=1,
+        include_docstrings=False,
+        exact=False,
+        mode="all",
+        partition=False,
+        arity_tolerance=1,
+    ):
+        """
+        Initialize the DBSCAN algorithm.
+
+        Args:
+            eps (float): The maximum normalized distance between two elements for
+                one to be considered as in the neighborhood of the other.
+            min_samples (int): The number of elements in a neighborhood for an
+                element to be considered as a core element, itself included.
+            jobs (int): The number of processes computing the distances.
+            include_docstrings (bool): Whether the docstrings are compared too.
+            exact (bool): Compute the exact distance of every pair. By default, the
+                pairs farther than `eps` are pruned, see
+                `ladar.api.distance.radius_neighbors_graph`: the clusters are the
+                same.
+            mode (str): The pairs of elements compared: 'all' of them, or only the
+                pairs of elements of different structures ('bipartite'), each
+                element being clustered with its counterparts in the other
+                structures only. The 'hierarchical' mode also compares the
+                elements of different structures only, but the members (e.g.,
+                methods) of two elements within `eps` (e.g., classes) are
+                compared with each other only, and the elements left without a
+                match with every element of the other structures, see
+                `ladar.api.distance.hierarchical_neighbors_graph`.
+            partition (bool): Whether only the elements of the same kind with a
+                close arity are compared, see `ladar.api.blocking.are_compatible`.
+                Not available in the hierarchical mode.
+            arity_tolerance (int): The maximum difference of arities of the
+                elements compared, with `partition`.
 
-    def __init__(self, eps=0.5, min_samples=5):
-        super().__init__(eps=eps, min_samples=min_samples)
+        Raises:
+            ValueError: If the mode is unknown, or partitioned in the
+                hierarchical mode.
+        """
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown DBSCAN mode {mode!r}, expected one of {', '.join(self.MODES)}."
+            )
+        if partition and mode == "hierarchical":
+            raise ValueError("The hierarchical mode cannot be partitioned.")
+        super().__init__(
+            eps=eps,
+            min_samples=min_samples,
+            jobs=jobs,
+            include_docstrings=include_docstrings,
+            exact=exact,
+            mode=mode,
+            partition=partition,
+            arity_tolerance=arity_tolerance,
+        )
         self.eps = eps
         self.min_samples = min_samples
+        self.jobs = jobs
+        self.include_docstrings = include_docstrings
+        self.exact = exact
+        self.mode = mode
+        self.partition = partition
+        self.arity_tolerance = arity_tolerance
+        self.elements = None
+        self.labels_ = None
+        self.comparisons_ = None
+
+    def fit(self, structures):
+        """
+        Cluster the elements of the structures.
 
-    def fit(self, data):
-        # Implémentation du fitting pour DBSCAN
-        pass
+        Args:
+            structures (list or dict): The API structures to compare, or the
+                results of a blocking step, with the `structures` and their
+                `candidates` pairs of elements.
 
-    def transform(self, data):
-        # Implémentation de la transformation après le fit pour DBSCAN
-        pass
+        Raises:
+            ValueError: If the structures have no elements to compare, or if the
+                hierarchical mode follows a blocking step.
+        """
+        structures, candidates = unpack_blocking(structures)
+        if candidates is not None and self.mode == "hierarchical":
+            raise ValueError(
+                "The hierarchical mode selects its own pairs, without blocking."
+            )
+        self.elements = collect_elements(
+            structures, include_docstrings=self.include_docstrings
+        )
+        if not self.elements:
+            raise ValueError("No elements found in the structures for comparison.")
+
+        # DBSCAN only needs the pairs within eps: the other pairs are left out of
+        # the graph, and are not neighbors
+        texts = [element["text"] for element in self.elements]
+        groups = [element["structure"] for element in self.elements]
+        if self.mode == "hierarchical":
+            graph, self.comparisons_ = hierarchical_neighbors_graph(
+                texts,
+                self.eps,
+                get_parents(self.elements),
+                groups,
+                jobs=self.jobs,
+                prune=not self.exact,
+            )
+        elif self.partition and candidates is None:
+            # Only the elements of compatible partitions are compared
+            graph, self.comparisons_ = block_neighbors_graph(
+                texts,
+                self.eps,
+                iter_partition_blocks(
+                    get_partitions(self.elements), self.arity_tolerance
+                ),
+                jobs=self.jobs,
+                prune=not self.exact,
+                groups=groups if self.mode == "bipartite" else None,
+            )
+        else:
+            if self.partition:
+                candidates = np.asarray(candidates, dtype=np.int64).reshape(-1, 2)
+                candidates = candidates[
+                    are_compatible(
+                        get_partitions(self.elements),
+                        candidates,
+                        self.arity_tolerance,
+                    )
+                ]
+                self.comparisons_ = len(candidates)
+            graph = radius_neighbors_graph(
+                texts,
+                self.eps,
+                jobs=self.jobs,
+                prune=not self.exact,
+                pairs=candidates,
+                groups=groups if self.mode == "bipartite" else None,
+            )
+        clustering = sklearn.cluster.DBSCAN(
+            eps=self.eps, min_samples=self.min_samples, metric="precomputed"
+        ).fit(graph)
+        self.labels_ = clustering.labels_.astype(int).tolist()
+
+    def transform(self, structures):
+        """
+        Build the comparison results from the clusters.
+
+        Args:
+            structures (list or dict): The API structures, as given to `fit`.
+
+        Returns:
+            dict: The label of each element (`mapping`), the label of each element
+            by structure (`detailed_mapping`), the elements of each cluster
+            (`cluster_mapping`, noise excluded) and the parameters.
+        """
+        structures, _ = unpack_blocking(structures)
+        detailed_mapping = {
+            f"struct_{index + 1}": {} for index in range(len(structures))
+        }
+        cluster_mapping = {}
+        for element, label in zip(self.elements, self.labels_):
+            structure_name = f"struct_{element['structure'] + 1}"
+            detailed_mapping[structure_name][element["path"]] = label
+            if label != -1:
+                # Labels are strings, as some output formats (TOML) require
+                cluster_mapping.setdefault(str(label), []).append(
+                    {structure_name: element["path"]}
+                )
+
+        results = {
+            "algorithm_used": "dbscan",
+            "mapping": {"clusters": self.labels_},
+            "detailed_mapping": detailed_mapping,
+            "cluster_mapping": cluster_mapping,
+            "additional_info": {
+                "eps": self.eps,
+                "min_samples": self.min_samples,
+                "mode": self.mode,
+                "elements": len(self.elements),
+                "clusters": len(cluster_mapping),
+                "noise": self.labels_.count(-1),
+            },
+        }
+        if self.comparisons_ is not None:
+            results["additional_info"]["comparisons"] = self.comparisons_
+        return results
 
     @staticmethod
     def add_arguments(parser):
@@ -38,230 +234,47 @@ class DBSCAN(BaseAlgorithm):
         Add DBSCAN-specific arguments to the parser.
         """
         parser.add_argument(
-            "--dbscan-eps", type=float, default=0.5, help="DBSCAN epsilon parameter"
+            "--dbscan-eps",
+            type=float,
+            default=0.5,
+            help="DBSCAN: The maximum normalized distance between two elements (eps).",
         )
         parser.add_argument(
-            "--dbscan-min_samples", type=int, default=5, help="DBSCAN minimum samples"
+            "--dbscan-min_samples",
+            type=int,
+            default=2,
+            help="DBSCAN: The number of elements in a neighborhood for an element to be a core element.",
+        )
+        parser.add_argument(
+            "--dbscan-jobs",
+            type=int,
+            default=1,
+            help="DBSCAN: The number of processes computing the distances.",
+        )
+        parser.add_argument(
+            "--dbscan-include_docstrings",
+            action="store_true",
+            help="DBSCAN: Compare the docstrings too (slower).",
+        )
+        parser.add_argument(
+            "--dbscan-exact",
+            action="store_true",
+            help="DBSCAN: Compute the exact distance of every pair, even those farther than eps (slower).",
+        )
+        parser.add_argument(
+            "--dbscan-mode",
+            choices=DBSCAN.MODES,
+            default="all",
+            help="DBSCAN: Compare all the pairs of elements, only those of different structures (bipartite), or the members of matched classes (hierarchical).",
+        )
+        parser.add_argument(
+            "--dbscan-partition",
+            action="store_true",
+            help="DBSCAN: Only compare the elements of the same kind with a close arity.",
+        )
+        parser.add_argument(
+            "--dbscan-arity_tolerance",
+            type=int,
+            default=1,
+            help="DBSCAN: The maximum difference of arities of the elements compared, with --dbscan-partition.",
         )
-
-
-# def add_arguments(parser):
-#    """
-#    Add DBSCAN-specific arguments to the parser.
-#
-#    Parameters for the DBSCAN algorithm:
-#
-#    - `eps`: The maximum distance between two samples for one to be considered as
-#      in the neighborhood of the other. Smaller values of `eps` result in smaller,
-#      denser clusters. Default is `0.5`.
-#
-#    - `min_samples`: The number of samples (or total weight) in a neighborhood for
-#      a point to be considered a core point. This includes the point itself. Higher
-#      values of `min_samples` make the algorithm more conservative in forming clusters.
-#      Default is `2`.
-#
-#    These parameters control how the DBSCAN algorithm clusters the API structures.
-#
-#    Args:
-#        parser (argparse.ArgumentParser): The argument parser instance where the DBSCAN-specific
-#                                          options are added.
-#    """
-#    parser.add_argument(
-#        "--dbscan-eps",
-#        type=float,
-#        default=0.5,
-#        help="DBSCAN: The maximum distance between two samples (eps).",
-#    )
-#    parser.add_argument(
-#        "--dbscan-min_samples",
-#        type=int,
-#        default=2,
-#        help="DBSCAN: The number of samples in a neighborhood for a point to be a core point.",
-#    )
-#
-#
-# def create_similarity_matrix(elements):
-#    """
-#    Create a similarity matrix based on the Levenshtein distance between
-#    element names, signatures, and docstrings.
-#
-#    Args:
-#        elements (list): List of all elements (from all structures) to compare.
-#
-#    Returns:
-#        numpy.ndarray: A matrix representing similarities between the elements.
-#    """
-#    num_elements = len(elements)
-#    if num_elements == 0:
-#        raise ValueError("No elements found in the structures for comparison.")
-#
-#    similarity_matrix = np.zeros((num_elements, num_elements))
-#
-#    for i in range(num_elements):
-#        for j in range(num_elements):
-#            if i == j:
-#                similarity_matrix[i][j] = 0
-#            else:
-#                # Extract the names, docstrings, and signatures (if available)
-#                name_i = (
-#                    elements[i]["name"]
-#                    if isinstance(elements[i], dict)
-#                    else elements[i]
-#                )
-#                name_j = (
-#                    elements[j]["name"]
-#                    if isinstance(elements[j], dict)
-#                    else elements[j]
-#                )
-#
-#                doc_i = (
-#                    elements[i].get("docstring", "")
-#                    if isinstance(elements[i], dict)
-#                    else ""
-#                )
-#                doc_j = (
-#                    elements[j].get("docstring", "")
-#                    if isinstance(elements[j], dict)
-#                    else ""
-#                )
-#
-#                signature_i = (
-#                    elements[i].get("signature", "")
-#                    if isinstance(elements[i], dict)
-#                    else ""
-#                )
-#                signature_j = (
-#                    elements[j].get("signature", "")
-#                    if isinstance(elements[j], dict)
-#                    else ""
-#                )
-#
-#                # Combine name, docstring, and signature for similarity calculation
-#                combined_i = name_i + " " + signature_i + " " + doc_i
-#                combined_j = name_j + " " + signature_j + " " + doc_j
-#
-#                # Calculate Levenshtein distance between the combined strings
-#                lev_distance = Levenshtein.distance(combined_i, combined_j)
-#                max_length = max(len(combined_i), len(combined_j))
-#
-#                if max_length == 0:
-#                    similarity_matrix[i][j] = 0
-#                else:
-#                    similarity_matrix[i][j] = lev_distance / max_length
-#
-#    if np.isnan(similarity_matrix).any() or np.isinf(similarity_matrix).any():
-#        raise ValueError("Similarity matrix contains NaN or infinity values.")
-#
-#    logger.info(f"Similarity matrix calculated: {similarity_matrix}")
-#    return similarity_matrix
-#
-#
-# def generate_mapping(detailed_mapping):
-#    """
-#    Generates a mapping based on the clusters assigned by DBSCAN.
-#
-#    Args:
-#        detailed_mapping (dict): A dictionary with elements and their corresponding clusters.
-#
-#    Returns:
-#        dict: A mapping that associates similar elements from different structures within each cluster.
-#    """
-#    cluster_mapping = {}
-#
-#    for structure, elements in detailed_mapping.items():
-#        for element, cluster in elements.items():
-#            if cluster not in cluster_mapping:
-#                cluster_mapping[cluster] = []
-#            cluster_mapping[cluster].append({structure: element})
-#
-#    return cluster_mapping
-#
-#
-# def filter_elements(elements):
-#    """
-#    Filters the relevant elements in the structure to keep only
-#    functions, methods, and classes. Excludes nested modules and
-#    members without useful information.
-#
-#    Args:
-#        elements (dict): Dictionary of extracted elements from the structures.
-#
-#    Returns:
-#        list: Filtered list of relevant elements (functions, methods, classes).
-#    """
-#    filtered_elements = []
-#    for element_name, element_info in elements.items():
-#        if element_info["type"] in ["class", "function", "method"]:
-#            filtered_elements.append(element_name)
-#    return filtered_elements
-#
-#
-# def compare(structures: list, params: dict = None) -> dict:
-#    """
-#    Compare API structures using the DBSCAN algorithm and return clusters.
-#
-#    Args:
-#        structures (list): List of API structures to compare.
-#        params (dict): Parameters for the DBSCAN algorithm (eps, min_samples).
-#
-#    Returns:
-#        dict: A dictionary containing the comparison results, clusters, detailed mapping, and automatic cluster mapping.
-#    """
-#    if not structures or any(len(structure) == 0 for structure in structures):
-#        raise ValueError("One or more structures are empty or missing.")
-#
-#    eps = params.get("eps", 0.5)
-#    min_samples = params.get("min_samples", 2)
-#
-#    all_elements = []
-#    structure_mapping = []
-#    for i, structure in enumerate(structures):
-#        filtered_structure = filter_elements(structure)
-#        all_elements.extend(filtered_structure)
-#        structure_mapping.extend([f"struct_{i+1}"] * len(filtered_structure))
-#
-#    logger.info(f"All elements merged after filtering: {all_elements}")
-#
-#    similarity_matrix = create_similarity_matrix(all_elements)
-#
-#    try:
-#        clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed").fit(
-#            similarity_matrix
-#        )
-#    except Exception as e:
-#        logger.error(f"DBSCAN failed with error: {e}")
-#        raise e
-#
-#    labels = clustering.labels_.astype(int).tolist()
-#
-#    if len(labels) != len(all_elements):
-#        raise ValueError(
-#            f"Mismatch between labels and elements: {len(labels)} labels for {len(all_elements)} elements"
-#        )
-#
-#    detailed_mapping = {}
-#    label_index = 0
-#    for i, structure in enumerate(structures):
-#        filtered_structure = filter_elements(structure)
-#        detailed_mapping[f"struct_{i+1}"] = {}
-#
-#        for idx in range(len(filtered_structure)):
-#            element_name = filtered_structure[idx]
-#            detailed_mapping[f"struct_{i+1}"][element_name] = labels[label_index]
-#            label_index += 1
-#
-#    cluster_mapping = generate_mapping(detailed_mapping)
-#
-#    return {
-#        "algorithm_used": "dbscan",
-#        "similarity_score": labels,
-#        "mapping": {
-#            "clusters": labels,
-#        },
-#        "detailed_mapping": detailed_mapping,
-#        "cluster_mapping": cluster_mapping,
-#        "additional_info": {
-#            "eps": eps,
-#            "min_samples": min_samples,
-#        },
-#    }
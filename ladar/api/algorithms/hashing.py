@@ -0,0 +1,218 @@
+import concurrent.futures
+import contextlib
+import logging
+
+import scipy.sparse
+from sklearn.preprocessing import normalize
+
+from ladar.api.algorithms.base import AlgorithmCategory, BaseAlgorithm
+from ladar.api.elements import iter_elements
+from ladar.api.hashing import (
+    BATCH_SIZE,
+    DEFAULT_FEATURES,
+    DocumentFrequencies,
+    iter_hashed_batches,
+)
+from ladar.api.similarity import match_elements
+
+logger = logging.getLogger(__name__)
+
+
+class Hashing(BaseAlgorithm):
+    """
+    Hashing feature extraction step.
+
+    Each class, function and method is a document: the words of its name,
+    signature and optionally docstring, hashed to a fixed number of features
+    instead of being looked up in a vocabulary. There is no vocabulary to fit,
+    so the members are featurized as they are read, by batches, in parallel, with
+    the same features whatever the order, the batches or the processes. The
+    inverse document frequencies are optionally accumulated along the way, then
+    each member of the first structure is mapped to its most similar members in
+    the other structures, as the member level of the TF-IDF step does.
+    """
+
+    category = AlgorithmCategory.FEATURE_EXTRACTION
+    streaming = True
+
+    def __init__(
+        self,
+        n_features=DEFAULT_FEATURES,
+        idf=True,
+        top_k=5,
+        include_docstrings=True,
+        jobs=1,
+        batch_size=BATCH_SIZE,
+    ):
+        """
+        Initialize the hashing step.
+
+        Args:
+            n_features (int): The number of hashed features. Fewer features take
+                less memory, but distinct words are more likely to collide.
+            idf (bool or int): Whether the word counts are weighted by the inverse
+                document frequencies, accumulated over the members.
+            top_k (int): The number of matches of each member.
+            include_docstrings (bool): Whether the member documents include the
+                docstrings.
+            jobs (int): The number of processes hashing the members.
+            batch_size (int): The number of members hashed by a task.
+        """
+        super().__init__(
+            n_features=n_features,
+            idf=idf,
+            top_k=top_k,
+            include_docstrings=include_docstrings,
+            jobs=jobs,
+            batch_size=batch_size,
+        )
+        self.n_features = n_features
+        self.idf = bool(idf)
+        self.top_k = top_k
+        self.include_docstrings = include_docstrings
+        self.jobs = jobs
+        self.batch_size = batch_size
+        self.frequencies_ = None
+
+    def _hash_structures(self, structures, frequencies=None):
+        """
+        Hash the members of the structures, structure by structure, with a
+        single pool of worker processes for all of them.
+
+        Args:
+            structures (list): The API structures.
+            frequencies (DocumentFrequencies, optional): The document frequencies
+                to update with the members.
+
+        Returns:
+            tuple: The elements (their structure and path) and their word counts.
+
+        Raises:
+            ValueError: If a structure is empty, or if the structures have no
+                elements to compare.
+        """
+        elements = []
+        counts = []
+        with contextlib.ExitStack() as stack:
+            executor = None
+            if self.jobs > 1:
+                executor = stack.enter_context(
+                    concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs)
+                )
+            for index, structure in enumerate(structures):
+                if not structure:
+                    raise ValueError(f"Structure {index + 1} is empty or missing.")
+                for paths, batch in iter_hashed_batches(
+                    iter_elements(structure),
+                    n_features=self.n_features,
+                    include_docstrings=self.include_docstrings,
+                    jobs=self.jobs,
+                    batch_size=self.batch_size,
+                    executor=executor,
+                ):
+                    elements.extend(
+                        {"structure": index, "path": path} for path in paths
+                    )
+                    counts.append(batch)
+                    if frequencies is not None:
+                        frequencies.update(batch)
+        if not elements:
+            raise ValueError("No elements found in the structures for comparison.")
+        logger.debug(f"{len(elements)} elements hashed to {self.n_features} features")
+        return elements, scipy.sparse.vstack(counts, format="csr")
+
+    def fit(self, structures):
+        """
+        Accumulate the document frequencies of the members of the structures.
+
+        Without inverse document frequencies, there is nothing to fit.
+
+        Args:
+            structures (list): The API structures.
+        """
+        if not self.idf:
+            return
+        self.frequencies_ = DocumentFrequencies(self.n_features)
+        self._hash_structures(structures, self.frequencies_)
+
+    def transform(self, structures):
+        """
+        Hash the members of the structures, and match them.
+
+        Args:
+            structures (list): The API structures.
+
+        Returns:
+            dict: The sparse features of the members, the `elements` (their
+            structure and path) and the `matches` of the members of the first
+            structure in each of the other ones.
+        """
+        elements, counts = self._hash_structures(structures)
+        return self._build_results(counts, structures, elements)
+
+    def fit_transform(self, structures):
+        """
+        Hash the members of the structures and accumulate their document
+        frequencies in a single pass, then match them.
+
+        Args:
+            structures (list): The API structures.
+
+        Returns:
+            dict: The results, see `transform`.
+        """
+        self.frequencies_ = DocumentFrequencies(self.n_features) if self.idf else None
+        elements, counts = self._hash_structures(structures, self.frequencies_)
+        return self._build_results(counts, structures, elements)
+
+    def _build_results(self, counts, structures, elements):
+        if self.idf:
+            if self.frequencies_ is None:
+                raise ValueError("The hashing step must be fitted to weight by IDF.")
+            features = self.frequencies_.transform(counts)
+        else:
+            features = normalize(counts)
+        return {
+            "algorithm_used": "hashing",
+            "hashing_features": features,
+            "elements": elements,
+            "matches": match_elements(
+                features, elements, len(structures), k=self.top_k
+            ),
+            "additional_info": {
+                "n_features": self.n_features,
+                "idf": self.idf,
+                "elements": len(elements),
+                "nnz": int(features.nnz),
+            },
+        }
+
+    @staticmethod
+    def add_arguments(parser):
+        """
+        Add hashing-specific arguments to the parser.
+        """
+        parser.add_argument(
+            "--hashing-n_features",
+            type=int,
+            default=DEFAULT_FEATURES,
+            help="Hashing: The number of hashed features. Default is 262144.",
+        )
+        parser.add_argument(
+            "--hashing-idf",
+            type=int,
+            default=1,
+            help="Hashing: Weight the words by inverse document frequency (0 to skip).",
+        )
+        parser.add_argument(
+            "--hashing-top_k",
+            type=int,
+            default=5,
+            help="Hashing: The number of matches of each member. Default is 5.",
+        )
+        parser.add_argument(
+            "--hashing-jobs",
+            type=int,
+            default=1,
+            help="Hashing: The number of processes hashing the members.",
+        )
@@ -0,0 +1,213 @@
+import logging
+
+import numpy as np
+
+from ladar.api.algorithms.base import AlgorithmCategory, BaseAlgorithm
+from ladar.api.blocking import (
+    candidate_probability,
+    estimate_recall,
+    lsh_candidates,
+    lsh_threshold,
+    minhash_signatures,
+    normalize_text,
+)
+from ladar.api.elements import collect_elements
+
+logger = logging.getLogger(__name__)
+
+
+class MinHash(BaseAlgorithm):
+    """
+    MinHash blocking step.
+
+    Instead of comparing every pair of elements, the elements of the structures
+    are bucketed with locality-sensitive hashing of the MinHash signatures of the
+    character n-grams of their normalized names and signatures (and optionally
+    docstrings). Only the pairs sharing a bucket are candidates, compared by the
+    next step of the pipeline (e.g., 'block:minhash,cluster:dbscan').
+    """
+
+    category = AlgorithmCategory.BLOCKING
+    streaming = True
+
+    def __init__(
+        self,
+        bands=16,
+        rows=4,
+        ngram=3,
+        include_docstrings=False,
+        within_structures=False,
+        threshold=None,
+        recall_sample=100,
+        seed=0,
+    ):
+        """
+        Initialize the MinHash blocking step.
+
+        Args:
+            bands (int): The number of LSH bands. More bands find more candidates.
+            rows (int): The number of signature values of each band. More rows
+                find fewer, more similar, candidates.
+            ngram (int): The number of characters of the n-grams.
+            include_docstrings (bool): Whether the docstrings are hashed too.
+            within_structures (bool): Whether elements of the same structure can
+                be candidates. By default, only elements of different structures
+                are paired.
+            threshold (float, optional): The Jaccard similarity of the n-grams
+                from which pairs are expected to be candidates, for the recall
+                reporting. Defaults to the threshold of the bands and rows.
+            recall_sample (int): The number of elements sampled to measure the
+                recall, 0 to skip the measure.
+            seed (int): The seed of the hash functions and of the sampling.
+        """
+        super().__init__(
+            bands=bands,
+            rows=rows,
+            ngram=ngram,
+            include_docstrings=include_docstrings,
+            within_structures=within_structures,
+            threshold=threshold,
+            recall_sample=recall_sample,
+            seed=seed,
+        )
+        self.bands = bands
+        self.rows = rows
+        self.ngram = ngram
+        self.include_docstrings = include_docstrings
+        self.within_structures = within_structures
+        self.threshold = (
+            threshold if threshold is not None else lsh_threshold(bands, rows)
+        )
+        self.recall_sample = recall_sample
+        self.seed = seed
+        self.elements = None
+        self.candidates_ = None
+        self.recall_ = None
+        self.similar_pairs_ = 0
+
+    def fit(self, structures):
+        """
+        Find the candidate pairs of elements of the structures.
+
+        Args:
+            structures (list): The API structures to compare.
+
+        Raises:
+            ValueError: If the structures have no elements to compare.
+        """
+        self.elements = collect_elements(
+            structures, include_docstrings=self.include_docstrings
+        )
+        if not self.elements:
+            raise ValueError("No elements found in the structures for comparison.")
+
+        texts = [normalize_text(element["text"]) for element in self.elements]
+        groups = None
+        if not self.within_structures:
+            groups = np.array([element["structure"] for element in self.elements])
+        signatures = minhash_signatures(
+            texts, self.bands * self.rows, size=self.ngram, seed=self.seed
+        )
+        self.candidates_ = lsh_candidates(signatures, self.bands, self.rows, groups)
+        if self.recall_sample:
+            self.recall_, self.similar_pairs_ = estimate_recall(
+                texts,
+                self.candidates_,
+                self.threshold,
+                size=self.ngram,
+                sample=self.recall_sample,
+                groups=groups,
+                seed=self.seed,
+            )
+        logger.debug(
+            f"{len(self.candidates_)} candidate pairs among {len(self.elements)} "
+            f"elements (recall {self.recall_})"
+        )
+
+    def transform(self, structures):
+        """
+        Build the blocking results, to be compared by the next step.
+
+        Args:
+            structures (list): The API structures, as given to `fit`.
+
+        Returns:
+            dict: The `structures`, the `elements` (their structure and path) and
+            the `candidates`, pairs of indices in the elements, with the blocking
+            statistics.
+        """
+        sizes = np.bincount(
+            [element["structure"] for element in self.elements],
+            minlength=len(structures),
+        )
+        if self.within_structures:
+            comparisons = len(self.elements) * (len(self.elements) - 1) // 2
+        else:
+            comparisons = int((sizes.sum() ** 2 - (sizes**2).sum()) // 2)
+
+        return {
+            "algorithm_used": "minhash",
+            "structures": structures,
+            "elements": [
+                {"structure": element["structure"], "path": element["path"]}
+                for element in self.elements
+            ],
+            "candidates": self.candidates_.tolist(),
+            "additional_info": {
+                "bands": self.bands,
+                "rows": self.rows,
+                "ngram": self.ngram,
+                "elements": len(self.elements),
+                "comparisons": comparisons,
+                "candidates": len(self.candidates_),
+                "reduction": (
+                    1 - len(self.candidates_) / comparisons if comparisons else 0.0
+                ),
+                "threshold": self.threshold,
+                "candidate_probability": candidate_probability(
+                    self.threshold, self.bands, self.rows
+                ),
+                "recall": self.recall_,
+                "recall_pairs": self.similar_pairs_,
+            },
+        }
+
+    @staticmethod
+    def add_arguments(parser):
+        """
+        Add MinHash-specific arguments to the parser.
+        """
+        parser.add_argument(
+            "--minhash-bands",
+            type=int,
+            default=16,
+            help="MinHash: The number of LSH bands (more bands, more candidates).",
+        )
+        parser.add_argument(
+            "--minhash-rows",
+            type=int,
+            default=4,
+            help="MinHash: The number of values of each band (more rows, fewer candidates).",
+        )
+        parser.add_argument(
+            "--minhash-ngram",
+            type=int,
+            default=3,
+            help="MinHash: The number of characters of the n-grams.",
+        )
+        parser.add_argument(
+            "--minhash-include_docstrings",
+            action="store_true",
+            help="MinHash: Hash the docstrings too.",
+        )
+        parser.add_argument(
+            "--minhash-within_structures",
+            action="store_true",
+            help="MinHash: Also pair elements of the same structure.",
+        )
+        parser.add_argument(
+            "--minhash-recall_sample",
+            type=int,
+            default=100,
+            help="MinHash: The number of elements sampled to measure the recall (0 to skip).",
+        )
@@ -1,31 +1,84 @@
 # ladar/api/algorithms/tfidf.py
 
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
 
 from ladar.api.algorithms.base import AlgorithmCategory, BaseAlgorithm
+from ladar.api.blocking import get_partitions
+from ladar.api.elements import collect_elements, split_words
+from ladar.api.similarity import match_elements
 
 
 class TFIDF(BaseAlgorithm):
     """
     TF-IDF algorithm extracts and compares textual features from API structures using Term Frequency-Inverse Document Frequency.
+
+    At the structure level, each structure is a document, and the structures are
+    compared as a whole. At the member level, each class, function and method is
+    a document, and each member of the first structure is mapped to its most
+    similar members in the other structures.
     """
 
     category = AlgorithmCategory.FEATURE_EXTRACTION
 
-    def __init__(self, max_features=500, stop_words="english"):
+    # The documents compared at each level
+    LEVELS = ("structure", "member")
+
+    def __init__(
+        self,
+        max_features=500,
+        stop_words="english",
+        level="structure",
+        top_k=5,
+        max_df=1.0,
+        include_docstrings=True,
+        partition=False,
+        arity_tolerance=1,
+    ):
         """
         Initialize the TF-IDF algorithm with specified parameters.
 
         Args:
             max_features (int): Maximum number of features (terms) to extract.
             stop_words (str or list): Stop words to ignore in text processing. Default is "english".
+            level (str): The documents: a whole 'structure', or each 'member'.
+            top_k (int): The number of matches of each member, at the member level.
+            max_df (float or int): Ignore the terms found in more than this share
+                (or number) of the documents. Terms found in most members barely
+                change the ranking of the matches, but make every member similar
+                to every other one, which is slower to select from.
+            include_docstrings (bool): Whether the member documents include the
+                docstrings, at the member level.
+            partition (bool): Whether members are only matched to members of the
+                same kind with a close arity, at the member level, see
+                `ladar.api.blocking.are_compatible`.
+            arity_tolerance (int): The maximum difference of arities of the
+                members matched, with `partition`.
+
+        Raises:
+            ValueError: If the level is unknown.
         """
+        if level not in self.LEVELS:
+            raise ValueError(
+                f"Unknown TF-IDF level {level!r}, expected one of {', '.join(self.LEVELS)}."
+            )
         self.max_features = max_features
         self.stop_words = stop_words
+        self.level = level
+        self.top_k = top_k
+        self.max_df = max_df
+        self.include_docstrings = include_docstrings
+        self.partition = partition
+        self.arity_tolerance = arity_tolerance
         self.vectorizer = (
             None  # The TfidfVectorizer will be initialized in the fit method
         )
 
+    @property
+    def streaming(self):
+        # The member level only reads the elements of the structures
+        return self.level == "member"
+
     @staticmethod
     def add_arguments(parser):
         """
@@ -46,6 +99,42 @@ class TFIDF(BaseAlgorithm):
             default="english",
             help='Stop words to ignore in text processing. Default is "english".',
         )
+        parser.add_argument(
+            "--tfidf-level",
+            choices=TFIDF.LEVELS,
+            default="structure",
+            help="Compare whole structures, or map each member to its top-k matches. Default is structure.",
+        )
+        parser.add_argument(
+            "--tfidf-top_k",
+            type=int,
+            default=5,
+            help="Number of matches of each member, at the member level. Default is 5.",
+        )
+        parser.add_argument(
+            "--tfidf-max_df",
+            type=float,
+            default=1.0,
+            help="Ignore the terms found in more than this share of the documents. Default is 1.0.",
+        )
+        parser.add_argument(
+            "--tfidf-partition",
+            action="store_true",
+            help="Only match members of the same kind with a close arity, at the member level.",
+        )
+        parser.add_argument(
+            "--tfidf-arity_tolerance",
+            type=int,
+            default=1,
+            help="Maximum difference of arities of the members matched, with --tfidf-partition. Default is 1.",
+        )
+
+    def _new_vectorizer(self):
+        return TfidfVectorizer(
+            max_features=self.max_features,
+            stop_words=self.stop_words,
+            max_df=self.max_df,
+        )
 
     def fit(self, structures):
         """
@@ -54,13 +143,10 @@ class TFIDF(BaseAlgorithm):
         Args:
             structures (list): List of input structures (API descriptions).
         """
-        # Flatten the structures into a list of text documents
-        documents = [self._structure_to_text(structure) for structure in structures]
+        documents, _ = self._get_documents(structures)
 
         # Initialize the TfidfVectorizer and fit it to the documents
-        self.vectorizer = TfidfVectorizer(
-            max_features=self.max_features, stop_words=self.stop_words
-        )
+        self.vectorizer = self._new_vectorizer()
         self.vectorizer.fit(documents)
 
     def transform(self, structures):
@@ -71,15 +157,13 @@ class TFIDF(BaseAlgorithm):
             structures (list): List of input structures (API descriptions).
 
         Returns:
-            dict: Dictionary containing the TF-IDF feature vectors for each structure.
+            dict: Dictionary containing the sparse TF-IDF feature vectors, and the
+            similarities between the structures or the matches of the members.
         """
-        documents = [self._structure_to_text(structure) for structure in structures]
-        tfidf_matrix = self.vectorizer.transform(documents)
-
-        return {
-            "tfidf_features": tfidf_matrix.toarray(),
-            "feature_names": self.vectorizer.get_feature_names_out(),
-        }
+        documents, elements = self._get_documents(structures)
+        return self._build_results(
+            self.vectorizer.transform(documents), structures, elements
+        )
 
     def fit_transform(self, structures):
         """
@@ -89,10 +173,84 @@ class TFIDF(BaseAlgorithm):
             structures (list): List of input structures (API descriptions).
 
         Returns:
-            dict: Dictionary containing the TF-IDF feature vectors for each structure.
+            dict: Dictionary containing the sparse TF-IDF feature vectors, and the
+            similarities between the structures or the matches of the members.
         """
-        self.fit(structures)
-        return self.transform(structures)
+        documents, elements = self._get_documents(structures)
+        self.vectorizer = self._new_vectorizer()
+        return self._build_results(
+            self.vectorizer.fit_transform(documents), structures, elements
+        )
+
+    def _get_documents(self, structures):
+        """
+        Build the documents of the structures, at the level of the algorithm.
+
+        Args:
+            structures (list): List of input structures (API descriptions).
+
+        Returns:
+            tuple: The documents, and the elements they describe at the member
+            level (None at the structure level).
+        """
+        if self.level == "structure":
+            documents = [self._structure_to_text(structure) for structure in structures]
+            return documents, None
+
+        elements = collect_elements(
+            structures, include_docstrings=self.include_docstrings
+        )
+        if not elements:
+            raise ValueError("No elements found in the structures for comparison.")
+        documents = [" ".join(split_words(element["text"])) for element in elements]
+        return documents, elements
+
+    def _build_results(self, tfidf_matrix, structures, elements=None):
+        """
+        Build the results of the TF-IDF features, kept sparse.
+
+        The features are a CSR matrix, never densified: most terms of the
+        vocabulary are absent from a given document. The cosine similarities are
+        computed with sparse matrix products.
+
+        Args:
+            tfidf_matrix (scipy.sparse.csr_matrix): The features, one row per
+                document.
+            structures (list): The structures.
+            elements (list, optional): The elements of the documents, at the member
+                level.
+
+        Returns:
+            dict: The features, the names of the features, and the similarities
+            between the structures or the matches of the members of the first
+            structure in each of the other ones.
+        """
+        results = {
+            "algorithm_used": "tfidf",
+            "level": self.level,
+            "tfidf_features": tfidf_matrix.tocsr(),
+            "feature_names": self.vectorizer.get_feature_names_out().tolist(),
+        }
+        if elements is None:
+            similarity = cosine_similarity(tfidf_matrix, dense_output=False)
+            # One row and column per structure, small enough to be dense
+            results["similarity"] = similarity.toarray().tolist()
+            return results
+
+        matches = match_elements(
+            tfidf_matrix,
+            elements,
+            len(structures),
+            k=self.top_k,
+            partitions=get_partitions(elements) if self.partition else None,
+            tolerance=self.arity_tolerance,
+        )
+        results["elements"] = [
+            {"structure": element["structure"], "path": element["path"]}
+            for element in elements
+        ]
+        results["matches"] = matches
+        return results
 
     def _structure_to_text(self, structure):
         """
@@ -104,13 +262,17 @@ class TFIDF(BaseAlgorithm):
         Returns:
             str: A text representation of the structure.
         """
-        if isinstance(structure, dict):
-            return " ".join(
-                self._structure_to_text(value) for value in structure.values()
-            )
-        elif isinstance(structure, list):
-            return " ".join(self._structure_to_text(item) for item in structure)
-        elif isinstance(structure, str):
-            return structure
-        else:
-            return str(structure)
+        parts = []
+        # Depth-first, in order, without joining the intermediate levels
+        stack = [structure]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(reversed(list(value.values())))
+            elif isinstance(value, list):
+                stack.extend(reversed(value))
+            elif isinstance(value, str):
+                parts.append(value)
+            else:
+                parts.append(str(value))
+        return " ".join(parts)
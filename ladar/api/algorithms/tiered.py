@@ -0,0 +1,131 @@
+import logging
+
+from ladar.api.algorithms.base import AlgorithmCategory, BaseAlgorithm
+from ladar.api.elements import iter_elements
+from ladar.api.matching import match_tiered
+
+logger = logging.getLogger(__name__)
+
+
+class Tiered(BaseAlgorithm):
+    """
+    Tiered matching step.
+
+    Most members of two versions of a library keep their name: the elements of
+    the first structure are first hash-joined with those of each other structure
+    on their normalized qualified name, then on their own name and arity. Only
+    the leftovers are compared by normalized Levenshtein distance, the expensive
+    tier, see `ladar.api.matching.match_tiered`. The results report how many
+    elements each tier matched, and how long it took.
+    """
+
+    category = AlgorithmCategory.MATCHING
+    streaming = True
+
+    def __init__(self, max_distance=0.3, fuzzy=True, jobs=1, include_docstrings=False):
+        """
+        Initialize the tiered matching step.
+
+        Args:
+            max_distance (float): The maximum normalized distance of a match at
+                the fuzzy tier.
+            fuzzy (bool or int): Whether the elements left unmatched by the hash
+                joins are compared by distance.
+            jobs (int): The number of processes computing the distances.
+            include_docstrings (bool): Whether the fuzzy tier compares the
+                docstrings too.
+        """
+        super().__init__(
+            max_distance=max_distance,
+            fuzzy=fuzzy,
+            jobs=jobs,
+            include_docstrings=include_docstrings,
+        )
+        self.max_distance = max_distance
+        self.fuzzy = bool(fuzzy)
+        self.jobs = jobs
+        self.include_docstrings = include_docstrings
+        self.matches_ = None
+        self.tiers_ = None
+        self.sources_ = None
+
+    def fit(self, structures):
+        """
+        Match the elements of the first structure in each of the other ones.
+
+        Args:
+            structures (list): The API structures to compare.
+
+        Raises:
+            ValueError: If a structure is empty.
+        """
+        elements = []
+        for index, structure in enumerate(structures):
+            if not structure:
+                raise ValueError(f"Structure {index + 1} is empty or missing.")
+            elements.append(list(iter_elements(structure)))
+
+        self.matches_ = {}
+        self.tiers_ = {}
+        for index in range(1, len(structures)):
+            key = f"struct_{index + 1}"
+            self.matches_[key], self.tiers_[key] = match_tiered(
+                elements[0],
+                elements[index],
+                max_distance=self.max_distance,
+                fuzzy=self.fuzzy,
+                jobs=self.jobs,
+                include_docstrings=self.include_docstrings,
+            )
+        self.sources_ = [path for path, _ in elements[0]]
+
+    def transform(self, structures):
+        """
+        Build the matching results.
+
+        Args:
+            structures (list): The API structures, as given to `fit`.
+
+        Returns:
+            dict: The `matches` of the elements of the first structure in each of
+            the other ones, with their tier and distance, the `unmatched`
+            elements, and the number of elements matched and the time taken by
+            each tier.
+        """
+        return {
+            "algorithm_used": "tiered",
+            "matches": self.matches_,
+            "unmatched": {
+                key: [path for path in self.sources_ if path not in matches]
+                for key, matches in self.matches_.items()
+            },
+            "additional_info": {
+                "elements": len(self.sources_),
+                "max_distance": self.max_distance,
+                "tiers": self.tiers_,
+            },
+        }
+
+    @staticmethod
+    def add_arguments(parser):
+        """
+        Add tiered matching arguments to the parser.
+        """
+        parser.add_argument(
+            "--tiered-max_distance",
+            type=float,
+            default=0.3,
+            help="Tiered: The maximum normalized distance of a fuzzy match.",
+        )
+        parser.add_argument(
+            "--tiered-fuzzy",
+            type=int,
+            default=1,
+            help="Tiered: Compare the unmatched elements by distance (0 to skip).",
+        )
+        parser.add_argument(
+            "--tiered-jobs",
+            type=int,
+            default=1,
+            help="Tiered: The number of processes computing the distances.",
+        )
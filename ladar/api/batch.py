@@ -0,0 +1,322 @@
+import concurrent.futures
+import contextlib
+import logging
+import multiprocessing
+import re
+import subprocess
+import time
+
+import ladar.common.envpool as envpool
+
+logger = logging.getLogger(__name__)
+
+
+def requirement_name(requirement):
+    """
+    Return the normalized project name of a requirement.
+
+    Args:
+        requirement (str): A requirement specifier (e.g., 'Flask_Login>=0.6').
+
+    Returns:
+        str: The normalized project name (e.g., 'flask-login').
+    """
+    name = re.split(r"[\s<>=!~;\[@]", requirement.strip(), maxsplit=1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def are_compatible(requirements, others):
+    """
+    Tell whether two requirement sets can be installed in the same environment.
+
+    Two sets are compatible when every project required by both is required
+    with the same specifier.
+
+    Args:
+        requirements (list): The first requirement set.
+        others (list): The second requirement set.
+
+    Returns:
+        bool: True if the requirement sets are compatible.
+    """
+    specifiers = {requirement_name(r): r.strip() for r in requirements}
+    for requirement in others:
+        specifier = specifiers.get(requirement_name(requirement))
+        if specifier is not None and specifier != requirement.strip():
+            return False
+    return True
+
+
+def plan_environments(targets, jobs=1, merge=False):
+    """
+    Group the targets by the environment they will be extracted in.
+
+    Targets with the same requirement set always share an environment, so the
+    environments only depend on the requirements of each target, and the pooled
+    environments of a run are reused by the next ones. With `merge`, targets with
+    compatible requirement sets also share one as soon as `jobs` environments are
+    planned, so that more targets are installed with a single pip command without
+    reducing the parallelism; the environments then depend on the order of the
+    targets and on `jobs`, and the versions resolved for a target may change with
+    the requirements of the others. Targets without requirements (standard
+    library modules and local projects) do not need any environment.
+
+    Args:
+        targets (list): The targets, dicts with a `requirements` list.
+        jobs (int): The number of environments that are built concurrently.
+        merge (bool): Whether targets with compatible requirement sets share an
+            environment.
+
+    Returns:
+        list: The environments, dicts with the `requirements` to install (None when
+        no environment is needed) and the `targets` to extract in it.
+    """
+    environments = []
+    for target in targets:
+        requirements = target.get("requirements")
+        if not requirements:
+            environments.append({"requirements": None, "targets": [target]})
+            continue
+
+        candidates = [
+            environment
+            for environment in environments
+            if environment["requirements"] is not None
+        ]
+        same = [
+            environment
+            for environment in candidates
+            if set(environment["requirements"]) == set(requirements)
+        ]
+        compatible = [
+            environment
+            for environment in candidates
+            if are_compatible(environment["requirements"], requirements)
+        ]
+        if same:
+            environment = same[0]
+        elif merge and compatible and len(candidates) >= jobs:
+            environment = min(
+                compatible, key=lambda environment: len(environment["targets"])
+            )
+        else:
+            environment = {"requirements": [], "targets": []}
+            environments.append(environment)
+
+        environment["targets"].append(target)
+        for requirement in requirements:
+            if requirement not in environment["requirements"]:
+                environment["requirements"].append(requirement)
+    return environments
+
+
+def run_in_subprocess(func, *args):
+    """
+    Run a function in a fresh interpreter and return its result.
+
+    The interpreter is spawned rather than forked: the batch runs threads, and
+    every target must be imported in a clean process so that the modules of
+    different environments never mix.
+
+    Args:
+        func (callable): A picklable (module level) function.
+        *args: The arguments passed to the function.
+
+    Returns:
+        The return value of the function.
+    """
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=1, mp_context=context
+    ) as executor:
+        return executor.submit(func, *args).result()
+
+
+def run_environment(
+    environment,
+    worker,
+    index,
+    pip_options=None,
+    cache_dir=None,
+    max_size=envpool.DEFAULT_MAX_SIZE,
+):
+    """
+    Acquire an environment and extract each of its targets in a fresh process.
+
+    The environments come from the pool of `ladar.common.envpool`, so they are
+    reused across runs. When the requirements of several targets cannot be
+    installed together, each target is retried in an environment of its own.
+
+    Args:
+        environment (dict): The environment, as planned by `plan_environments`.
+        worker (callable): A module level function called with a target and the
+            environment directory (None when no environment is needed) in the
+            spawned process, returning True on success.
+        index (int): The index of the environment, reported in the results.
+        pip_options (list, optional): Extra options passed to `pip install`.
+        cache_dir (str, optional): An explicit base cache directory.
+        max_size (int): The disk budget of the environment pool, in bytes.
+
+    Returns:
+        list: The result of each target of the environment.
+    """
+    requirements = environment["requirements"]
+    targets = environment["targets"]
+    env_dir = None
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if requirements is not None:
+            try:
+                env_dir = stack.enter_context(
+                    envpool.acquire(
+                        requirements,
+                        options=pip_options,
+                        cache_dir=cache_dir,
+                        max_size=max_size,
+                    )
+                )
+            except subprocess.CalledProcessError as e:
+                if len(targets) > 1:
+                    logger.warning(
+                        f"Requirements {requirements} cannot be installed together, "
+                        "installing each target separately."
+                    )
+                    return [
+                        result
+                        for target in targets
+                        for result in run_environment(
+                            {
+                                "requirements": target["requirements"],
+                                "targets": [target],
+                            },
+                            worker,
+                            index,
+                            pip_options=pip_options,
+                            cache_dir=cache_dir,
+                            max_size=max_size,
+                        )
+                    ]
+                install_time = time.perf_counter() - start
+                return [
+                    dict(
+                        make_result(target, index, "failed", install_time),
+                        error=f"Installation failed: {e}",
+                    )
+                    for target in targets
+                ]
+            except Exception as e:
+                # e.g., a full disk or a broken pool: the other environments
+                # still run, and the summary is still written
+                install_time = time.perf_counter() - start
+                logger.error(f"Environment {index} could not be prepared: {e}")
+                return [
+                    dict(
+                        make_result(target, index, "failed", install_time),
+                        error=f"Environment failed: {e}",
+                    )
+                    for target in targets
+                ]
+        install_time = time.perf_counter() - start
+
+        results = []
+        for target in targets:
+            extract_start = time.perf_counter()
+            try:
+                status = (
+                    "ok" if run_in_subprocess(worker, target, env_dir) else "failed"
+                )
+                error = None
+            except Exception as e:
+                status, error = "failed", str(e)
+            extract_time = time.perf_counter() - extract_start
+            result = make_result(target, index, status, install_time, extract_time)
+            if error is not None:
+                result["error"] = error
+            logger.info(
+                f"{target['name']}: {status} in {result['total_time']:.2f}s "
+                f"(install {install_time:.2f}s, extraction {extract_time:.2f}s)"
+            )
+            results.append(result)
+        return results
+
+
+def make_result(target, environment, status, install_time, extract_time=0.0):
+    """
+    Build the summary entry of a target.
+
+    Args:
+        target (dict): The target.
+        environment (int): The index of the environment the target was extracted in.
+        status (str): 'ok' or 'failed'.
+        install_time (float): The time spent building the environment, in seconds.
+        extract_time (float): The time spent extracting the target, in seconds.
+
+    Returns:
+        dict: The summary entry of the target.
+    """
+    return {
+        "name": target["name"],
+        "output": target.get("output"),
+        "status": status,
+        "environment": environment,
+        "install_time": round(install_time, 3),
+        "extract_time": round(extract_time, 3),
+        "total_time": round(install_time + extract_time, 3),
+    }
+
+
+def run_batch(
+    targets,
+    worker,
+    jobs=1,
+    pip_options=None,
+    cache_dir=None,
+    max_size=envpool.DEFAULT_MAX_SIZE,
+    merge=False,
+):
+    """
+    Extract many targets concurrently, reusing environments between targets.
+
+    The environments are planned with `plan_environments`, then built and used
+    by a pool of `jobs` threads; each target is extracted in a spawned process by
+    `worker`, so at most `jobs` installations or extractions run at once.
+
+    Args:
+        targets (list): The targets, dicts with a `name`, a `requirements` list and
+            any other key needed by the worker.
+        worker (callable): A module level function called with a target and its
+            environment directory in a spawned process, returning True on success.
+        jobs (int): The number of concurrent workers.
+        pip_options (list, optional): Extra options passed to `pip install`
+            (e.g., ['--find-links', '/path/to/wheelhouse']).
+        cache_dir (str, optional): An explicit base cache directory.
+        max_size (int): The disk budget of the environment pool, in bytes.
+        merge (bool): Whether targets with compatible requirement sets share an
+            environment, see `plan_environments`.
+
+    Returns:
+        list: The result of each target, in the order of the targets.
+    """
+    environments = plan_environments(targets, jobs=jobs, merge=merge)
+    logger.info(
+        f"Extracting {len(targets)} targets in {len(environments)} environments "
+        f"with {jobs} workers."
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                run_environment,
+                environment,
+                worker,
+                index,
+                pip_options=pip_options,
+                cache_dir=cache_dir,
+                max_size=max_size,
+            )
+            for index, environment in enumerate(environments)
+        ]
+        results = {
+            result["name"]: result for future in futures for result in future.result()
+        }
+    return [results[target["name"]] for target in targets]
@@ -0,0 +1,346 @@
+import logging
+import re
+import zlib
+
+import numpy as np
+import scipy.sparse
+
+logger = logging.getLogger(__name__)
+
+# Mask of the multiply-shift hash functions, whose products wrap around 2**64
+_MASK = (1 << 64) - 1
+
+
+def normalize_text(text):
+    """
+    Normalize the text of an element before it is cut into n-grams.
+
+    The case, the underscores and the repeated whitespace are left out, so that
+    e.g. 'get_event_loop' and 'getEventLoop' share their n-grams.
+
+    Args:
+        text (str): The text of an element, see `ladar.api.elements.get_element_text`.
+
+    Returns:
+        str: The normalized text.
+    """
+    return re.sub(r"\s+", " ", text.lower().replace("_", "")).strip()
+
+
+def iter_ngrams(text, size=3):
+    """
+    Iterate over the distinct character n-grams of a text.
+
+    A text shorter than `size` is its own single n-gram.
+
+    Args:
+        text (str): The text.
+        size (int): The number of characters of the n-grams.
+
+    Yields:
+        str: The n-grams.
+    """
+    if len(text) <= size:
+        yield text
+        return
+    yield from {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def ngram_hashes(texts, size=3):
+    """
+    Hash the n-grams of texts.
+
+    Args:
+        texts (list): The texts.
+        size (int): The number of characters of the n-grams.
+
+    Returns:
+        tuple: The uint64 hashes of the n-grams of every text, concatenated, and
+        the offsets of the n-grams of each text in them, with a final offset.
+    """
+    hashes = []
+    offsets = [0]
+    for text in texts:
+        hashes.extend(
+            zlib.crc32(ngram.encode("utf-8")) for ngram in iter_ngrams(text, size)
+        )
+        offsets.append(len(hashes))
+    return np.array(hashes, dtype=np.uint64), np.array(offsets, dtype=np.int64)
+
+
+def minhash_signatures(texts, permutations, size=3, seed=0):
+    """
+    Compute the MinHash signatures of the n-gram sets of texts.
+
+    Two signatures agree on a given position with a probability equal to the
+    Jaccard similarity of the n-gram sets of their texts. The permutations are
+    multiply-shift hash functions of the 32-bit n-gram hashes.
+
+    Args:
+        texts (list): The texts.
+        permutations (int): The number of values of each signature.
+        size (int): The number of characters of the n-grams.
+        seed (int): The seed of the hash functions.
+
+    Returns:
+        numpy.ndarray: The uint64 signatures, one row per text.
+    """
+    hashes, offsets = ngram_hashes(texts, size)
+    generator = np.random.default_rng(seed)
+    # Odd multipliers
+    multipliers = generator.integers(0, _MASK, size=permutations, dtype=np.uint64) | 1
+    increments = generator.integers(0, _MASK, size=permutations, dtype=np.uint64)
+    signatures = np.empty((len(texts), permutations), dtype=np.uint64)
+    if not len(texts):
+        return signatures
+    for index in range(permutations):
+        values = (hashes * multipliers[index] + increments[index]) >> np.uint64(32)
+        signatures[:, index] = np.minimum.reduceat(values, offsets[:-1])
+    return signatures
+
+
+def lsh_candidates(signatures, bands, rows, groups=None):
+    """
+    Find the candidate pairs of signatures with locality-sensitive hashing.
+
+    The signatures are cut into `bands` bands of `rows` values: two texts are
+    candidates when their signatures are equal on at least one band, which
+    happens with a probability of `1 - (1 - s ** rows) ** bands` for a Jaccard
+    similarity `s`, see `candidate_probability`.
+
+    Args:
+        signatures (numpy.ndarray): The MinHash signatures, with at least
+            `bands * rows` values each.
+        bands (int): The number of bands.
+        rows (int): The number of values of each band.
+        groups (numpy.ndarray, optional): The group of each signature (e.g., the
+            structure of each element), to only pair signatures of different groups.
+
+    Returns:
+        numpy.ndarray: The `(i, j)` candidate pairs, with `i < j`, sorted, in an
+        array of shape `(n, 2)`.
+    """
+    size = len(signatures)
+    if bands * rows > signatures.shape[1]:
+        raise ValueError(
+            f"{bands} bands of {rows} rows need signatures of {bands * rows} values."
+        )
+    codes = []
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        _, buckets = np.unique(
+            keys.view(np.dtype((np.void, keys.dtype.itemsize * rows))).ravel(),
+            return_inverse=True,
+        )
+        order = np.argsort(buckets, kind="stable")
+        bounds = np.flatnonzero(np.diff(buckets[order])) + 1
+        for members in np.split(order, bounds):
+            if len(members) < 2:
+                continue
+            left, right = np.triu_indices(len(members), 1)
+            left, right = members[left], members[right]
+            if groups is not None:
+                cross = groups[left] != groups[right]
+                left, right = left[cross], right[cross]
+            codes.append(
+                np.minimum(left, right).astype(np.int64) * size
+                + np.maximum(left, right)
+            )
+    if not codes:
+        return np.empty((0, 2), dtype=np.int64)
+    codes = np.unique(np.concatenate(codes))
+    return np.stack([codes // size, codes % size], axis=1)
+
+
+def candidate_probability(similarity, bands, rows):
+    """
+    Return the probability that two texts are candidates, given their Jaccard
+    similarity.
+
+    Args:
+        similarity (float): The Jaccard similarity of the n-gram sets.
+        bands (int): The number of bands.
+        rows (int): The number of values of each band.
+
+    Returns:
+        float: The probability.
+    """
+    return 1 - (1 - similarity**rows) ** bands
+
+
+def lsh_threshold(bands, rows):
+    """
+    Return the Jaccard similarity from which texts are likely to be candidates.
+
+    This is the approximate inflection point of `candidate_probability`: tuning
+    the bands and rows moves it.
+
+    Args:
+        bands (int): The number of bands.
+        rows (int): The number of values of each band.
+
+    Returns:
+        float: The similarity.
+    """
+    return (1 / bands) ** (1 / rows)
+
+
+def estimate_recall(
+    texts, candidates, threshold, size=3, sample=100, groups=None, seed=0
+):
+    """
+    Measure the recall of candidate pairs on a sample of texts.
+
+    The exact Jaccard similarities between the sampled texts and every other text
+    are computed: the recall is the share of the pairs at least as similar as the
+    threshold that are candidates.
+
+    Args:
+        texts (list): The texts.
+        candidates (numpy.ndarray): The candidate pairs, see `lsh_candidates`.
+        threshold (float): The Jaccard similarity of the pairs expected to be
+            candidates.
+        size (int): The number of characters of the n-grams.
+        sample (int): The number of texts sampled.
+        groups (numpy.ndarray, optional): The group of each text, to only count
+            the pairs of different groups.
+        seed (int): The seed of the sampling.
+
+    Returns:
+        tuple: The recall, None when the sample holds no similar pair, and the
+        number of similar pairs found.
+    """
+    hashes, offsets = ngram_hashes(texts, size)
+    _, columns = np.unique(hashes, return_inverse=True)
+    counts = np.diff(offsets)
+    ngrams = scipy.sparse.csr_matrix(
+        (np.ones(len(hashes), dtype=np.float32), columns.ravel(), offsets),
+        shape=(len(texts), int(columns.max()) + 1 if len(hashes) else 0),
+    )
+
+    generator = np.random.default_rng(seed)
+    sampled = np.sort(
+        generator.choice(len(texts), size=min(sample, len(texts)), replace=False)
+    )
+    shared = (ngrams[sampled] @ ngrams.T).tocoo()
+    rows, others = sampled[shared.row], shared.col
+    similarity = shared.data / (counts[rows] + counts[others] - shared.data)
+    similar = (similarity >= threshold) & (rows != others)
+    if groups is not None:
+        similar &= groups[rows] != groups[others]
+    rows, others = rows[similar], others[similar]
+    if not len(rows):
+        return None, 0
+
+    size = len(texts)
+    codes = np.unique(
+        np.minimum(rows, others).astype(np.int64) * size + np.maximum(rows, others)
+    )
+    found = np.isin(codes, candidates[:, 0].astype(np.int64) * size + candidates[:, 1])
+    return float(found.mean()), len(codes)
+
+
+def get_partitions(elements):
+    """
+    Return the partition of each element: its kind and the arity of its
+    signature.
+
+    The kind is the type of the element, asynchronous or not (e.g., 'method' for
+    an 'async method'), so that the synchronous and asynchronous versions of an
+    API are compared.
+
+    Args:
+        elements (list): The elements, with their `type` and `arity`, see
+            `ladar.api.elements.collect_elements`.
+
+    Returns:
+        tuple: The integer code of the kind of each element, and its arity, -1
+        when it has no signature, in two arrays.
+    """
+    kinds = [(element.get("type") or "").replace("async ", "") for element in elements]
+    _, codes = np.unique(np.array(kinds, dtype=object), return_inverse=True)
+    arities = [
+        -1 if element.get("arity") is None else element["arity"] for element in elements
+    ]
+    return (
+        np.asarray(codes, dtype=np.int64).reshape(-1),
+        np.array(arities, dtype=np.int64),
+    )
+
+
+def are_compatible(partitions, pairs, tolerance=1):
+    """
+    Tell whether pairs of elements are in compatible partitions: of the same
+    kind, with arities differing by at most `tolerance`. An element without a
+    signature is compatible with any arity.
+
+    Args:
+        partitions (tuple): The kinds and arities of the elements, see
+            `get_partitions`.
+        pairs (numpy.ndarray): The `(i, j)` pairs of elements, in an array of
+            shape `(n, 2)`.
+        tolerance (int): The maximum difference of arities.
+
+    Returns:
+        numpy.ndarray: Whether each pair is compatible.
+    """
+    kinds, arities = partitions
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    left, right = arities[pairs[:, 0]], arities[pairs[:, 1]]
+    return (kinds[pairs[:, 0]] == kinds[pairs[:, 1]]) & (
+        (left < 0) | (right < 0) | (np.abs(left - right) <= tolerance)
+    )
+
+
+def iter_partition_blocks(partitions, tolerance=1, rows=None, columns=None):
+    """
+    Iterate over the blocks of compatible elements, see `are_compatible`.
+
+    Each block holds the elements of a partition, and every element of the
+    compatible partitions: only the pairs of a block need to be compared.
+
+    Args:
+        partitions (tuple): The kinds and arities of the elements, see
+            `get_partitions`.
+        tolerance (int): The maximum difference of arities.
+        rows (numpy.ndarray, optional): The indices of the elements partitioned
+            (e.g., the elements of a structure), all of them by default.
+        columns (numpy.ndarray, optional): The indices of the elements they are
+            compared with, all of them by default.
+
+    Yields:
+        tuple: The indices of the elements of a partition among `rows`, and of
+        the compatible elements among `columns`, in two sorted arrays.
+    """
+    kinds, arities = partitions
+    rows = np.arange(len(kinds)) if rows is None else np.asarray(rows, dtype=np.int64)
+    columns = (
+        np.arange(len(kinds))
+        if columns is None
+        else np.asarray(columns, dtype=np.int64)
+    )
+    keys = np.stack([kinds[rows], arities[rows]], axis=1)
+    for kind, arity in np.unique(keys, axis=0).tolist():
+        block_rows = rows[(kinds[rows] == kind) & (arities[rows] == arity)]
+        compatible = kinds[columns] == kind
+        if arity >= 0:
+            others = arities[columns]
+            compatible &= (others < 0) | (np.abs(others - arity) <= tolerance)
+        yield block_rows, columns[compatible]
+
+
+def unpack_blocking(data):
+    """
+    Return the structures and the candidate pairs given to a step.
+
+    Args:
+        data (list or dict): The API structures, or the results of a blocking
+            step (see `ladar.api.algorithms.minhash.MinHash`).
+
+    Returns:
+        tuple: The structures, and the candidate pairs of elements, None when
+        every pair is to be compared.
+    """
+    if isinstance(data, dict) and "candidates" in data:
+        return data["structures"], data["candidates"]
+    return data, None
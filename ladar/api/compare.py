@@ -1,62 +1,151 @@
-import concurrent.futures
+import functools
 import importlib
+import importlib.metadata
 import logging
-import os
-import pkgutil
 
+from ladar.api.algorithms import ALGORITHMS
 from ladar.api.algorithms.base import AlgorithmCategory, BaseAlgorithm
-from ladar.common.helpers import discover_modules
 
 logger = logging.getLogger(__name__)
 
+# Entry point group where third-party packages register their algorithms, e.g.:
+#
+#   [project.entry-points."ladar.algorithms"]
+#   myalgorithm = "mypackage.algorithms:MyAlgorithm"
+ENTRY_POINT_GROUP = "ladar.algorithms"
 
-def load_algorithms():
-    """
-    Dynamically load and validate all algorithms in the ladar/api/algorithms directory.
 
-    Returns:
-        dict: A dictionary where keys are algorithm names and values are their corresponding classes and categories.
+def add_algorithm_arguments(parser, names):
     """
-    algorithms = {}
+    Add the command line arguments of some algorithms to a parser.
 
-    logger.debug("Starting to load algorithms from 'ladar/api/algorithms'")
+    Only the classes of these algorithms are imported, and their `add_arguments`
+    called. The algorithms that cannot be loaded, or that have no command line
+    arguments, are skipped: a pipeline using them reports the error.
 
-    for _, module_name, _ in pkgutil.iter_modules(["ladar/api/algorithms"]):
-        logger.debug(f"Attempting to load module: {module_name}")
+    Args:
+        parser (argparse.ArgumentParser): The parser to which arguments are added.
+        names (iterable): The names of the algorithms (case insensitive).
+    """
+    for name in dict.fromkeys(name.lower() for name in names):
         try:
-            module = importlib.import_module(f"ladar.api.algorithms.{module_name}")
-        except ImportError as e:
-            logger.debug(f"Error importing module {module_name}: {e}")
-            continue
+            get_algorithm_class(name).add_arguments(parser)
+        except (ValueError, NotImplementedError) as e:
+            logger.debug(f"No command line arguments for algorithm {name}: {e}")
+
+
+def _iter_entry_points():
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=ENTRY_POINT_GROUP)
+    # Python < 3.10
+    return entry_points.get(ENTRY_POINT_GROUP, [])
+
 
-        # Find the algorithm class in the module, allowing different class names
-        algorithm_class = None
-        for name, cls in vars(module).items():
-            if (
-                isinstance(cls, type)
-                and issubclass(cls, BaseAlgorithm)
-                and cls is not BaseAlgorithm
-            ):
-                algorithm_class = cls
-                break
-
-        if algorithm_class:
-            logger.debug(f"Found algorithm class: {algorithm_class}")
-            if isinstance(algorithm_class.category, AlgorithmCategory):
-                algorithms[module_name] = {
-                    "class": algorithm_class,
-                    "category": algorithm_class.category.value,
-                }
-                logger.debug(
-                    f"Algorithm {module_name} loaded successfully with category: {algorithm_class.category.value}"
+@functools.lru_cache(maxsize=None)
+def discover_algorithms():
+    """
+    Discover the built-in algorithms and those registered by other packages.
+
+    The built-in algorithms are read from the manifest of `ladar.api.algorithms`,
+    and third-party algorithms from the `ladar.algorithms` entry points. No
+    algorithm is imported, see `get_algorithm_class`. The result is memoized for
+    the lifetime of the process.
+
+    Returns:
+        dict: The algorithms, by lowercase name, with their `category` (None for
+        third-party algorithms, until they are loaded) and where to load them
+        from (`module` and `class`, or `entry_point`).
+    """
+    algorithms = {
+        name: {
+            "module": algorithm["module"],
+            "class": algorithm["class"],
+            "category": algorithm["category"],
+        }
+        for name, algorithm in ALGORITHMS.items()
+    }
+
+    for entry_point in _iter_entry_points():
+        name = entry_point.name.lower()
+        if name in algorithms:
+            # Built-in algorithms are also registered as entry points by ladar
+            if name not in ALGORITHMS:
+                logger.warning(
+                    f"Algorithm {name} registered several times, ignoring "
+                    f"{entry_point.value}."
                 )
-            else:
-                logger.debug(f"Algorithm {module_name} has an invalid category.")
+            continue
+        algorithms[name] = {"entry_point": entry_point, "category": None}
+
+    logger.debug(f"Discovered algorithms: {', '.join(algorithms)}")
+    return algorithms
+
+
+@functools.lru_cache(maxsize=None)
+def get_algorithm_class(name):
+    """
+    Import the class of an algorithm, the first time it is needed.
+
+    Args:
+        name (str): The name of the algorithm (case insensitive).
+
+    Returns:
+        type: The algorithm class.
+
+    Raises:
+        ValueError: If the algorithm is unknown, cannot be imported, or is not a
+            valid algorithm.
+    """
+    algorithms = discover_algorithms()
+    algorithm = algorithms.get(name.lower())
+    if algorithm is None:
+        raise ValueError(
+            f"Algorithm '{name}' not found in available algorithms: "
+            f"{', '.join(algorithms)}"
+        )
+
+    try:
+        if "entry_point" in algorithm:
+            algorithm_class = algorithm["entry_point"].load()
         else:
-            logger.debug(f"No valid algorithm class found in module {module_name}.")
+            module = importlib.import_module(algorithm["module"])
+            algorithm_class = getattr(module, algorithm["class"])
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Error loading algorithm {name}: {e}")
+
+    if not (
+        isinstance(algorithm_class, type)
+        and issubclass(algorithm_class, BaseAlgorithm)
+        and isinstance(algorithm_class.category, AlgorithmCategory)
+    ):
+        raise ValueError(
+            f"Algorithm {name} is not a BaseAlgorithm subclass with a valid category."
+        )
+
+    logger.debug(f"Algorithm {name} loaded from {algorithm_class.__module__}")
+    return algorithm_class
 
-    logger.debug(
-        f"Finished loading algorithms. Total algorithms loaded: {len(algorithms)}"
-    )
 
+def load_algorithms():
+    """
+    Load and validate every available algorithm.
+
+    This imports every algorithm and its dependencies: prefer
+    `discover_algorithms` and `get_algorithm_class`.
+
+    Returns:
+        dict: A dictionary where keys are algorithm names and values are their corresponding classes and categories.
+    """
+    algorithms = {}
+    for name in discover_algorithms():
+        try:
+            algorithm_class = get_algorithm_class(name)
+        except ValueError as e:
+            logger.debug(e)
+            continue
+        algorithms[name] = {
+            "class": algorithm_class,
+            "category": algorithm_class.category.value,
+        }
     return algorithms
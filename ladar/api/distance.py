@@ -0,0 +1,559 @@
+import collections
+import concurrent.futures
+import logging
+
+import Levenshtein
+import numpy as np
+import scipy.sparse
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of pairs computed by a task, bounding the memory of a block
+BLOCK_PAIRS = 4 * 1024 * 1024
+
+# Distance reported for the pairs known to be farther than the maximum distance,
+# greater than any normalized distance
+FAR = 2.0
+
+# Number of character classes of the histograms used to prune far pairs
+HISTOGRAM_SIZE = 32
+
+# The texts compared by a worker process, sent once when the worker starts
+_texts = None
+_lengths = None
+_histograms = None
+
+
+def normalized_distance(text, other):
+    """
+    Compute the Levenshtein distance between two texts, normalized by the length
+    of the longest one.
+
+    Args:
+        text (str): The first text.
+        other (str): The second text.
+
+    Returns:
+        float: The distance, between 0 (identical texts) and 1.
+    """
+    longest = max(len(text), len(other))
+    if longest == 0:
+        return 0.0
+    return Levenshtein.distance(text, other) / longest
+
+
+def plan_row_blocks(size, blocks, firsts=None):
+    """
+    Split the rows of the upper triangle of a distance matrix into blocks of
+    consecutive rows with about the same number of pairs.
+
+    Row `i` holds the pairs `(i, j)` with `j > i`, so the first rows hold more
+    pairs than the last ones.
+
+    Args:
+        size (int): The number of texts.
+        blocks (int): The desired number of blocks.
+        firsts (numpy.ndarray, optional): The first column of each row, when rows
+            do not start right after the diagonal, see `get_first_columns`.
+
+    Returns:
+        list: The `(start, stop)` ranges of rows of each block.
+    """
+    if firsts is None:
+        firsts = np.arange(1, size + 1)
+    counts = (size - np.asarray(firsts)).tolist()
+    target = sum(counts) / max(1, blocks)
+    ranges = []
+    start = 0
+    pairs = 0
+    for row, count in enumerate(counts):
+        pairs += count
+        # Cumulative targets, so that rounding errors do not accumulate
+        if count and pairs >= target * (len(ranges) + 1):
+            ranges.append((start, row + 1))
+            start = row + 1
+    if start < size:
+        if ranges and not any(counts[start:]):
+            # The last rows hold no pair
+            ranges[-1] = (ranges[-1][0], size)
+        else:
+            ranges.append((start, size))
+    return ranges
+
+
+def get_first_columns(groups):
+    """
+    Return the first column of each row of the upper triangle of a distance
+    matrix, when only the pairs of texts of different groups are compared.
+
+    Args:
+        groups (list): The group of each text (e.g., the index of its structure),
+            the texts of a group being consecutive.
+
+    Returns:
+        numpy.ndarray: For each text, the index of the first text of the next
+        groups.
+
+    Raises:
+        ValueError: If the texts of a group are not consecutive.
+    """
+    groups = np.asarray(groups)
+    changes = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    if len(np.unique(groups)) != len(changes) + (len(groups) > 0):
+        raise ValueError("The texts of a group must be consecutive.")
+    ends = np.append(changes, len(groups))
+    return ends[np.searchsorted(ends, np.arange(len(groups)), side="right")]
+
+
+def character_histograms(texts, size=HISTOGRAM_SIZE):
+    """
+    Count the characters of texts, by classes of characters.
+
+    Each of the `size - 1` most frequent characters has its own class, the others
+    share the last one. The number of characters of a text missing from another,
+    by class, is a lower bound of their Levenshtein distance: each of them needs
+    an insertion or a substitution.
+
+    Args:
+        texts (list): The texts.
+        size (int): The number of character classes.
+
+    Returns:
+        numpy.ndarray: The histograms, one row per text.
+    """
+    frequencies = collections.Counter()
+    counters = [collections.Counter(text) for text in texts]
+    for counter in counters:
+        frequencies.update(counter)
+    classes = {
+        char: index for index, (char, _) in enumerate(frequencies.most_common(size - 1))
+    }
+    histograms = np.zeros((len(texts), size), dtype=np.int32)
+    for row, counter in enumerate(counters):
+        for char, count in counter.items():
+            histograms[row, classes.get(char, size - 1)] += count
+    return histograms
+
+
+def _init_worker(texts):
+    global _texts, _lengths, _histograms
+    _texts = texts
+    _lengths = np.fromiter(map(len, texts), dtype=np.float32, count=len(texts))
+    _histograms = None
+
+
+def _row_distances(i, others, max_distance=None):
+    global _histograms
+    distance = Levenshtein.distance
+    text = _texts[i]
+    lengths = _lengths[others]
+    longest = np.maximum(lengths, _lengths[i])
+    if max_distance is None:
+        row = np.fromiter(
+            (distance(text, _texts[j]) for j in others.tolist()),
+            dtype=np.float32,
+            count=len(others),
+        )
+    else:
+        if _histograms is None:
+            _histograms = character_histograms(_texts)
+        # The edits allowed for each pair, one more than needed, so that rounding
+        # never turns a pair within the maximum distance into a far one
+        cutoffs = np.floor(longest * max_distance).astype(np.int64) + 1
+        row = np.full(len(others), np.inf, dtype=np.float32)
+        # At least as many edits as the difference of lengths are needed
+        candidates = np.flatnonzero(np.abs(lengths - _lengths[i]) <= cutoffs)
+        # And at least as many as the characters missing on either side
+        differences = _histograms[others[candidates]] - _histograms[i]
+        bounds = np.maximum(
+            np.clip(differences, 0, None).sum(axis=1),
+            np.clip(-differences, 0, None).sum(axis=1),
+        )
+        candidates = candidates[bounds <= cutoffs[candidates]]
+        row[candidates] = np.fromiter(
+            (
+                distance(text, _texts[j], score_cutoff=cutoff)
+                for j, cutoff in zip(
+                    others[candidates].tolist(), cutoffs[candidates].tolist()
+                )
+            ),
+            dtype=np.float32,
+            count=len(candidates),
+        )
+        row[row > cutoffs] = np.inf
+    np.divide(row, longest, out=row, where=longest > 0)
+    if max_distance is not None:
+        row[np.isinf(row)] = FAR
+    return row
+
+
+def _compute_block(start, stop, max_distance=None, firsts=None):
+    size = len(_texts)
+    if firsts is None:
+        firsts = range(start + 1, stop + 1)
+    rows = [
+        _row_distances(i, np.arange(first, size), max_distance)
+        for i, first in zip(range(start, stop), firsts)
+    ]
+    return np.concatenate(rows) if rows else np.empty(0, dtype=np.float32)
+
+
+def _compute_neighbors(start, stop, radius, prune=True, firsts=None):
+    if firsts is None:
+        firsts = np.arange(start + 1, stop + 1)
+    distances = _compute_block(start, stop, radius if prune else None, firsts)
+    near = np.flatnonzero(distances <= radius)
+    # Locate the near pairs in the rows of the block
+    counts = len(_texts) - firsts
+    ends = np.cumsum(counts)
+    rows = np.searchsorted(ends, near, side="right")
+    columns = near - (ends - counts)[rows] + firsts[rows]
+    return (
+        (rows + start).astype(np.int32),
+        columns.astype(np.int32),
+        distances[near],
+    )
+
+
+def _compute_pairs(rows, columns, radius, prune=True):
+    # The pairs are sorted by row: the distances of a row are computed at once
+    distances = np.empty(len(rows), dtype=np.float32)
+    starts = np.flatnonzero(np.diff(rows, prepend=-1))
+    for start, stop in zip(starts.tolist(), [*starts[1:].tolist(), len(rows)]):
+        distances[start:stop] = _row_distances(
+            int(rows[start]), columns[start:stop], radius if prune else None
+        )
+    near = np.flatnonzero(distances <= radius)
+    return rows[near], columns[near], distances[near]
+
+
+def _compute_cross(rows, columns, later, starts, ends, radius, prune=True):
+    # Each row is compared with the columns out of its own group, and with the
+    # columns that are rows too from the end of its group on
+    near_rows, near_columns, near_distances = [], [], []
+    for i, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist()):
+        others = np.concatenate(
+            [
+                columns[: np.searchsorted(columns, start)],
+                columns[np.searchsorted(columns, end) :],
+                later[np.searchsorted(later, end) :],
+            ]
+        )
+        distances = _row_distances(i, others, radius if prune else None)
+        near = np.flatnonzero(distances <= radius)
+        near_rows.append(np.full(len(near), i, dtype=np.int32))
+        near_columns.append(others[near].astype(np.int32))
+        near_distances.append(distances[near])
+    if not near_rows:
+        return (
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.float32),
+        )
+    return (
+        np.concatenate(near_rows),
+        np.concatenate(near_columns),
+        np.concatenate(near_distances),
+    )
+
+
+def _map_tasks(texts, function, tasks, jobs=1):
+    if jobs <= 1 or len(tasks) <= 1:
+        _init_worker(texts)
+        try:
+            for task in tasks:
+                yield function(*task)
+        finally:
+            _init_worker([])
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(texts,)
+    ) as executor:
+        yield from executor.map(function, *zip(*tasks))
+
+
+def _plan_blocks(size, jobs, firsts=None):
+    if firsts is None:
+        pairs = size * (size - 1) // 2
+    else:
+        pairs = int((size - firsts).sum())
+    blocks = max(jobs * 4 if jobs > 1 else 1, -(-pairs // BLOCK_PAIRS))
+    ranges = plan_row_blocks(size, blocks, firsts)
+    logger.debug(f"Computing {pairs} distances in {len(ranges)} blocks")
+    return ranges
+
+
+def radius_neighbors_graph(texts, radius, jobs=1, prune=True, pairs=None, groups=None):
+    """
+    Build the sparse graph of the pairs of texts within a normalized distance.
+
+    The graph only holds the pairs within the radius, their distance stored
+    explicitly even when it is zero, so its memory is proportional to the number
+    of near pairs. The workers only send back the near pairs of their blocks.
+
+    Args:
+        texts (list): The texts to compare.
+        radius (float): The maximum normalized distance of the pairs kept.
+        jobs (int): The number of worker processes.
+        prune (bool): Whether to skip the pairs proven farther than the radius:
+            pairs whose difference of lengths or of character histograms alone
+            exceeds it are not compared, and the others are compared with a
+            bounded number of edits. The graph is the same either way.
+        pairs (numpy.ndarray, optional): The `(i, j)` pairs of texts to compare,
+            e.g. candidates found by blocking, in an array of shape `(n, 2)`.
+            Every pair is compared when not given.
+        groups (list, optional): The group of each text (e.g., the index of its
+            structure), the texts of a group being consecutive: only the pairs of
+            texts of different groups are compared when given.
+
+    Returns:
+        scipy.sparse.csr_matrix: The symmetric float32 distance graph, without its
+        diagonal.
+    """
+    size = len(texts)
+    if pairs is None:
+        firsts = None if groups is None else get_first_columns(groups)
+        tasks = [
+            (
+                start,
+                stop,
+                radius,
+                prune,
+                None if firsts is None else firsts[start:stop],
+            )
+            for start, stop in _plan_blocks(size, jobs, firsts)
+        ]
+        function = _compute_neighbors
+    else:
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        # Unique pairs, sorted by row, as integer codes: sorting them is faster
+        # than np.unique, of rows or of codes
+        codes = np.sort(pairs.min(axis=1) * size + pairs.max(axis=1))
+        codes = codes[np.diff(codes, prepend=-1) != 0]
+        pairs = np.stack([codes // size, codes % size], axis=1).astype(np.int32)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        if groups is not None:
+            groups = np.asarray(groups)
+            pairs = pairs[groups[pairs[:, 0]] != groups[pairs[:, 1]]]
+        chunks = max(jobs * 4 if jobs > 1 else 1, -(-len(pairs) // BLOCK_PAIRS))
+        logger.debug(f"Computing {len(pairs)} distances in {chunks} blocks")
+        tasks = [
+            (chunk[:, 0], chunk[:, 1], radius, prune)
+            for chunk in np.array_split(pairs, chunks)
+            if len(chunk)
+        ]
+        function = _compute_pairs
+
+    graph = _build_graph(_map_tasks(texts, function, tasks, jobs), size)
+    logger.debug(f"{graph.nnz // 2} pairs within {radius}")
+    return graph
+
+
+def _build_graph(blocks, size):
+    # The symmetric graph of the near pairs of blocks, found once each
+    rows, columns, distances = [], [], []
+    for block_rows, block_columns, block_distances in blocks:
+        rows.append(block_rows)
+        columns.append(block_columns)
+        distances.append(block_distances)
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+    columns = np.concatenate(columns) if columns else np.empty(0, dtype=np.int32)
+    distances = (
+        np.concatenate(distances) if distances else np.empty(0, dtype=np.float32)
+    )
+    return scipy.sparse.csr_matrix(
+        (
+            np.concatenate([distances, distances]),
+            (np.concatenate([rows, columns]), np.concatenate([columns, rows])),
+        ),
+        shape=(size, size),
+        dtype=np.float32,
+    )
+
+
+def block_neighbors_graph(texts, radius, blocks, jobs=1, prune=True, groups=None):
+    """
+    Build the sparse graph of the pairs of texts within a normalized distance,
+    comparing each text with the texts of its block only.
+
+    The rows of a block are compared with its columns, row by row, by the worker
+    processes: unlike the explicit pairs of `radius_neighbors_graph`, the pairs
+    of a block are never materialized, so the memory stays proportional to the
+    number of texts and of near pairs. A pair found from both of its texts (e.g.,
+    two texts of compatible partitions) is compared once, from the lowest one.
+
+    Args:
+        texts (list): The texts to compare.
+        radius (float): The maximum normalized distance of the pairs kept.
+        blocks (iterable): The `(rows, columns)` blocks, two arrays of indices of
+            texts without duplicates, e.g. the compatible partitions yielded by
+            `ladar.api.blocking.iter_partition_blocks`. A row paired with a
+            column that is a row too must be among the columns of its block.
+        jobs (int): The number of worker processes.
+        prune (bool): Whether to skip the pairs proven farther than the radius,
+            see `radius_neighbors_graph`.
+        groups (list, optional): The group of each text, the texts of a group
+            being consecutive: only the pairs of texts of different groups are
+            compared when given.
+
+    Returns:
+        tuple: The symmetric float32 distance graph, as `radius_neighbors_graph`
+        builds it, and the number of pairs compared.
+    """
+    size = len(texts)
+    if groups is None:
+        starts = np.arange(size)
+        ends = starts + 1
+    else:
+        ends = get_first_columns(groups)
+        changes = np.unique(ends)
+        starts = np.append(0, changes)[np.searchsorted(changes, ends)]
+    blocks = [
+        (np.asarray(rows, dtype=np.int64), np.sort(np.asarray(columns, dtype=np.int64)))
+        for rows, columns in blocks
+    ]
+    is_row = np.zeros(size, dtype=bool)
+    for rows, _ in blocks:
+        is_row[rows] = True
+
+    # The number of pairs of each row of each block
+    plans = []
+    for rows, columns in blocks:
+        later = columns[is_row[columns]]
+        columns = columns[~is_row[columns]]
+        counts = (
+            len(columns)
+            - np.searchsorted(columns, ends[rows])
+            + np.searchsorted(columns, starts[rows])
+            + len(later)
+            - np.searchsorted(later, ends[rows])
+        )
+        kept = counts > 0
+        plans.append((rows[kept], columns, later, counts[kept]))
+    pairs = int(sum(counts.sum() for *_, counts in plans))
+
+    # Blocks of rows with about the same number of pairs
+    target = BLOCK_PAIRS
+    if jobs > 1:
+        target = max(1, min(target, -(-pairs // (jobs * 4))))
+    tasks = []
+    for rows, columns, later, counts in plans:
+        chunks = (np.cumsum(counts) - 1) // target
+        for chunk in np.split(rows, np.flatnonzero(np.diff(chunks)) + 1):
+            if len(chunk):
+                tasks.append(
+                    (chunk, columns, later, starts[chunk], ends[chunk], radius, prune)
+                )
+    logger.debug(f"Computing {pairs} distances in {len(tasks)} blocks")
+    graph = _build_graph(_map_tasks(texts, _compute_cross, tasks, jobs), size)
+    logger.debug(f"{graph.nnz // 2} pairs within {radius}")
+    return graph, pairs
+
+
+def _cross_pairs(left, right):
+    left, right = np.meshgrid(
+        np.asarray(left, dtype=np.int64),
+        np.asarray(right, dtype=np.int64),
+        indexing="ij",
+    )
+    return np.stack([left.ravel(), right.ravel()], axis=1)
+
+
+def hierarchical_neighbors_graph(texts, radius, parents, groups, jobs=1, prune=True):
+    """
+    Build the sparse graph of the pairs of texts of different groups within a
+    normalized distance, comparing the members of matched parents only.
+
+    The texts at the top level (e.g., classes and functions) of every group are
+    compared first. The members of two texts within the radius (e.g., the
+    methods of two matched classes) are then compared with each other only,
+    level by level. The orphans, texts left without a match (e.g., the methods
+    of a class matched with no other), are compared with every text of the other
+    groups, row by row (see `block_neighbors_graph`). The number of pairs
+    compared drops from the product of the sizes of the groups to about the sum
+    of the products of the numbers of members of the matched parents, plus the
+    pairs of the orphans.
+
+    Args:
+        texts (list): The texts to compare.
+        radius (float): The maximum normalized distance of the pairs kept, and
+            of the parents whose members are compared.
+        parents (list): The index of the parent of each text, -1 at the top
+            level, see `ladar.api.elements.get_parents`.
+        groups (list): The group of each text (e.g., the index of its structure).
+        jobs (int): The number of worker processes.
+        prune (bool): Whether to skip the pairs proven farther than the radius,
+            see `radius_neighbors_graph`.
+
+    Returns:
+        tuple: The symmetric float32 distance graph, as `radius_neighbors_graph`
+        builds it, and the number of pairs compared.
+    """
+    size = len(texts)
+    parents = np.asarray(parents, dtype=np.int64).reshape(-1)
+    groups = np.asarray(groups).reshape(-1)
+    members = collections.defaultdict(list)
+    for index, parent in enumerate(parents.tolist()):
+        members[parent].append(index)
+
+    top = np.flatnonzero(parents == -1)
+    names = np.unique(groups)
+    level = [
+        _cross_pairs(top[groups[top] == first], top[groups[top] == second])
+        for position, first in enumerate(names)
+        for second in names[position + 1 :]
+    ]
+    matched = np.zeros(size, dtype=bool)
+    rows, columns, distances = [], [], []
+    compared = []
+    while level:
+        pairs = np.sort(np.concatenate(level), axis=1)
+        compared.append(pairs[:, 0] * size + pairs[:, 1])
+        graph = radius_neighbors_graph(
+            texts, radius, jobs=jobs, prune=prune, pairs=pairs
+        ).tocoo()
+        upper = graph.row < graph.col
+        rows.append(graph.row[upper])
+        columns.append(graph.col[upper])
+        distances.append(graph.data[upper])
+        matched[graph.row] = True
+        level = [
+            _cross_pairs(members[first], members[second])
+            for first, second in zip(
+                graph.row[upper].tolist(), graph.col[upper].tolist()
+            )
+            if members[first] and members[second]
+        ]
+
+    # The texts left without a match fall back to a comparison with every text
+    # of the other groups: they have no pair within the radius yet, so none is
+    # found twice
+    orphans = ~matched
+    graph, orphan_pairs = block_neighbors_graph(
+        texts,
+        radius,
+        [
+            (np.flatnonzero(orphans & (groups == name)), np.flatnonzero(groups != name))
+            for name in names
+        ],
+        jobs=jobs,
+        prune=prune,
+    )
+    graph = graph.tocoo()
+    upper = graph.row < graph.col
+    rows.append(graph.row[upper])
+    columns.append(graph.col[upper])
+    distances.append(graph.data[upper])
+    # The pairs of an orphan compared at the levels above are compared again
+    compared = np.concatenate(compared) if compared else np.empty(0, dtype=np.int64)
+    compared = (
+        len(compared)
+        + orphan_pairs
+        - int(np.count_nonzero(orphans[compared // size] | orphans[compared % size]))
+    )
+    logger.debug(
+        f"{compared} pairs compared hierarchically, "
+        f"{sum(map(len, distances))} within {radius}"
+    )
+    return _build_graph(zip(rows, columns, distances), size), compared
@@ -0,0 +1,234 @@
+import logging
+import re
+
+from ladar.api.extract import StreamedStructure
+
+logger = logging.getLogger(__name__)
+
+# The types of members compared between API structures
+ELEMENT_TYPES = (
+    "class",
+    "function",
+    "async function",
+    "method",
+    "async method",
+)
+
+# The parameters left out of the arity of a signature
+_IMPLICIT_PARAMETERS = {"self", "cls", "*", "/"}
+
+# Words of the signatures carrying no meaning
+IGNORED_WORDS = frozenset({"self", "cls", "args", "kwargs", "none", "true", "false"})
+
+# The words of identifiers: lowercase runs, capitalized words, acronyms, numbers
+_WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def iter_record_elements(records, types=ELEMENT_TYPES):
+    """
+    Iterate over the elements of a stream of member records.
+
+    Args:
+        records (iterable): Member records, as yielded by
+            `ladar.api.extract.iter_api_records` or read from a JSON Lines file
+            with `ladar.common.io.iter_jsonl`. Records without a path (e.g., the
+            module information) are skipped.
+        types (tuple): The types of the members to yield.
+
+    Yields:
+        tuple: The dotted path of the element and its description, as
+        `iter_elements` does for a whole structure.
+    """
+    for record in records:
+        if "path" in record and record.get("type") in types:
+            yield ".".join(record["path"]), record
+
+
+def iter_elements(structure, types=ELEMENT_TYPES):
+    """
+    Iterate over the elements of an API structure, nested members included.
+
+    Args:
+        structure (dict or StreamedStructure): The API structure (the `structure`
+            of an extracted API), or a structure streamed from a JSON Lines file
+            (see `ladar.api.extract.StreamedStructure`), whose records are read
+            one at a time.
+        types (tuple): The types of the members to yield.
+
+    Yields:
+        tuple: The dotted path of the element in the structure (e.g.,
+        'asyncio.eventloop.stop') and its description.
+    """
+    if isinstance(structure, StreamedStructure):
+        yield from iter_record_elements(structure.iter_records(), types=types)
+        return
+
+    def walk(members, prefix):
+        for name, member in members.items():
+            if not isinstance(member, dict):
+                continue
+            path = f"{prefix}.{name}" if prefix else name
+            if member.get("type") in types:
+                yield path, member
+            yield from walk(member.get("members") or {}, path)
+
+    yield from walk(structure, "")
+
+
+def get_element_name(path):
+    """
+    Return the name of an element, relative to the package it belongs to.
+
+    The package is left out, so that elements of different projects can be
+    compared (e.g., 'asyncio.eventloop.stop' and 'eventlet.eventloop.stop' are both
+    named 'eventloop.stop').
+
+    Args:
+        path (str): The dotted path of the element in its structure.
+
+    Returns:
+        str: The name of the element.
+    """
+    _, _, name = path.partition(".")
+    return name or path
+
+
+def get_element_text(path, member, include_docstrings=False):
+    """
+    Build the text an element is compared on: its name and signature, and
+    optionally its docstring.
+
+    Args:
+        path (str): The dotted path of the element in its structure.
+        member (dict): The description of the element.
+        include_docstrings (bool): Whether to include the docstring.
+
+    Returns:
+        str: The text of the element.
+    """
+    parts = [get_element_name(path), member.get("signature") or ""]
+    if include_docstrings:
+        parts.append(member.get("docstring") or "")
+    return " ".join(part for part in parts if part)
+
+
+def split_words(text):
+    """
+    Split the text of an element into lowercase words.
+
+    Identifiers are split on underscores, dots and case changes (e.g.,
+    'get_event_loop' and 'getEventLoop' both give 'get', 'event' and 'loop'), and
+    the words carrying no meaning in signatures (e.g., 'self') are left out.
+
+    Args:
+        text (str): The text of an element, see `get_element_text`.
+
+    Returns:
+        list: The words, in order.
+    """
+    return [
+        word
+        for word in map(str.lower, _WORD_PATTERN.findall(text))
+        if word not in IGNORED_WORDS
+    ]
+
+
+def get_arity(signature):
+    """
+    Return the number of parameters of a signature.
+
+    The implicit parameters (`self` and `cls`) and the markers of keyword-only
+    and positional-only parameters are not counted.
+
+    Args:
+        signature (str): The signature, e.g. '(self, item, block=True)'.
+
+    Returns:
+        int: The number of parameters, None when there is no signature.
+    """
+    if not signature or "(" not in signature:
+        return None
+    parameters = []
+    current = ""
+    depth = 0
+    quote = None
+    for char in signature[signature.index("(") + 1 :]:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if not depth:
+                break
+            depth -= 1
+        elif char == "," and not depth:
+            parameters.append(current)
+            current = ""
+            continue
+        current += char
+    parameters.append(current)
+    names = [parameter.split("=")[0].split(":")[0].strip() for parameter in parameters]
+    return sum(1 for name in names if name and name not in _IMPLICIT_PARAMETERS)
+
+
+def collect_elements(structures, types=ELEMENT_TYPES, include_docstrings=False):
+    """
+    Collect the elements of several API structures, to be compared together.
+
+    Args:
+        structures (list): The API structures.
+        types (tuple): The types of the members to collect.
+        include_docstrings (bool): Whether the texts include the docstrings.
+
+    Returns:
+        list: The elements, dicts with the index of their `structure`, their `path`
+        in it, their `type`, the `arity` of their signature (see `get_arity`) and
+        the `text` they are compared on, ordered by structure.
+
+    Raises:
+        ValueError: If a structure is empty.
+    """
+    elements = []
+    for index, structure in enumerate(structures):
+        if not structure:
+            raise ValueError(f"Structure {index + 1} is empty or missing.")
+        for path, member in iter_elements(structure, types=types):
+            elements.append(
+                {
+                    "structure": index,
+                    "path": path,
+                    "type": member.get("type"),
+                    "arity": get_arity(member.get("signature")),
+                    "text": get_element_text(path, member, include_docstrings),
+                }
+            )
+    logger.debug(
+        f"{len(elements)} elements collected from {len(structures)} structures"
+    )
+    return elements
+
+
+def get_parents(elements):
+    """
+    Return the parent of each element: the element it is a member of (e.g., the
+    class of a method), in the same structure.
+
+    Args:
+        elements (list): The elements, with the index of their `structure` and
+            their `path`, see `collect_elements`.
+
+    Returns:
+        list: The index of the parent of each element, -1 for the elements at
+        the top level of their structure.
+    """
+    indices = {
+        (element["structure"], element["path"]): index
+        for index, element in enumerate(elements)
+    }
+    return [
+        indices.get((element["structure"], element["path"].rpartition(".")[0]), -1)
+        for element in elements
+    ]
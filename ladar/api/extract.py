@@ -1,17 +1,29 @@
+import collections
+import concurrent.futures
 import importlib
 import inspect
 import json
+import logging
 import pkgutil
 import sys
+import time
 import uuid
 from datetime import datetime
 
 from ladar.api.normalize import normalize_docstring, normalize_value
 
+logger = logging.getLogger(__name__)
+
+# Maximum time to analyze a standard library module in a worker process, in seconds
+MODULE_TIMEOUT = 120
+
 
 def extract_module_info(module_name):
     try:
-        module = importlib.import_module(module_name)
+        # The whole standard library is not an importable module
+        module = (
+            sys if module_name == "stdlib" else importlib.import_module(module_name)
+        )
 
         version = getattr(module, "__version__", None)
 
@@ -40,8 +52,28 @@ def extract_module_info(module_name):
         return None
 
 
-def generate_uid():
-    return str(uuid.uuid4())
+# Namespace of the member UIDs, see `generate_uid`
+UID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/4383/ladar")
+
+
+def generate_uid(qualified_name, kind, signature=None):
+    """
+    Generate a deterministic UID for an API member.
+
+    The UID is a name-based UUID (version 5) derived from the qualified name, the
+    kind and the signature of the member. An unchanged member therefore keeps
+    the same UID across extractions and versions, and two members with the same
+    UID can be considered equal without comparing them further.
+
+    Args:
+        qualified_name (str): The qualified name of the member (e.g., 'asyncio.sleep').
+        kind (str): The type of the member (e.g., 'function', 'class', 'method').
+        signature (str, optional): The signature of the member, if any.
+
+    Returns:
+        str: The UID of the member.
+    """
+    return str(uuid.uuid5(UID_NAMESPACE, f"{kind}:{qualified_name}{signature or ''}"))
 
 
 def is_async_function(member):
@@ -74,7 +106,7 @@ def should_include_member(name):
     return not (name.startswith("__") and name.endswith("__"))
 
 
-def extract_api_from_module(
+def iter_api_members(
     module,
     module_name=None,
     include_private=False,
@@ -82,9 +114,16 @@ def extract_api_from_module(
     disable_normalization=False,
 ):
     """
-    Extract functions, classes, their signatures, and optionally docstrings from a given module.
+    Extract functions, classes, their signatures, and optionally docstrings from a given module,
+    yielding one record per member as soon as it is inspected.
     Apply normalization unless disabled by the user.
 
+    Each record is the dictionary describing the member in the API structure,
+    along with a "path" key giving the location of the member in the structure:
+    `[name]` for the top-level members, `[class name, method name]` for the
+    methods. Class and module records come before the records of their members.
+    See `structure_from_records` to build the API structure back from the records.
+
     Args:
         module (module or class): The Python module or object to analyze.
         module_name (str): A default name to use if the module has no __name__ attribute.
@@ -92,10 +131,9 @@ def extract_api_from_module(
         include_docstrings (bool): Whether to include docstrings in the extracted API.
         disable_normalization (bool): If True, normalization will be disabled.
 
-    Returns:
-        dict: A dictionary representing the structure of the module's API.
+    Yields:
+        dict: A record describing a member of the module's API.
     """
-    api_structure = {}
 
     def explore_members(members, parent_name="", visited=None):
         if visited is None:
@@ -116,8 +154,6 @@ def extract_api_from_module(
                 continue
             visited.add(id(member))
 
-            uid = generate_uid()
-
             docstring = inspect.getdoc(member) if include_docstrings else None
             # Apply normalization if enabled
             if not disable_normalization:
@@ -136,19 +172,27 @@ def extract_api_from_module(
                 function_type = (
                     "async function" if is_async_function(member) else "function"
                 )
-                api_structure[full_name] = {
+                record = {
+                    "path": [full_name],
                     "type": function_type,
-                    "uid": uid,
+                    "uid": generate_uid(full_name, function_type, signature),
                 }
                 if signature:
-                    api_structure[full_name]["signature"] = signature
+                    record["signature"] = signature
                 if docstring:
-                    api_structure[full_name]["docstring"] = docstring
+                    record["docstring"] = docstring
+                yield record
 
             elif inspect.isclass(member):
-                api_structure[full_name] = {"type": "class", "uid": uid, "members": {}}
+                record = {
+                    "path": [full_name],
+                    "type": "class",
+                    "uid": generate_uid(full_name, "class"),
+                    "members": {},
+                }
                 if docstring:
-                    api_structure[full_name]["docstring"] = docstring
+                    record["docstring"] = docstring
+                yield record
 
                 class_members = inspect.getmembers(member)
                 for method_name, method in class_members:
@@ -169,15 +213,18 @@ def extract_api_from_module(
                             if not disable_normalization
                             else method_name
                         )
-                        method_uid = generate_uid()
-                        api_structure[full_name]["members"][normalized_method_name] = {
+                        method_uid = generate_uid(
+                            f"{full_name}.{normalized_method_name}",
+                            method_type,
+                            signature,
+                        )
+                        method_record = {
+                            "path": [full_name, normalized_method_name],
                             "type": method_type,
                             "uid": method_uid,
                         }
                         if signature:
-                            api_structure[full_name]["members"][normalized_method_name][
-                                "signature"
-                            ] = signature
+                            method_record["signature"] = signature
                         method_docstring = (
                             inspect.getdoc(method) if include_docstrings else None
                         )
@@ -185,54 +232,575 @@ def extract_api_from_module(
                             method_docstring = normalize_docstring(method_docstring)
 
                         if method_docstring:
-                            api_structure[full_name]["members"][normalized_method_name][
-                                "docstring"
-                            ] = method_docstring
+                            method_record["docstring"] = method_docstring
+                        yield method_record
 
             elif inspect.ismodule(member):
-                api_structure[full_name] = {"type": "module", "uid": uid, "members": {}}
+                record = {
+                    "path": [full_name],
+                    "type": "module",
+                    "uid": generate_uid(full_name, "module"),
+                    "members": {},
+                }
                 if docstring:
-                    api_structure[full_name]["docstring"] = docstring
+                    record["docstring"] = docstring
+                yield record
 
                 sub_members = inspect.getmembers(member)
-                explore_members(sub_members, parent_name=full_name, visited=visited)
+                yield from explore_members(
+                    sub_members, parent_name=full_name, visited=visited
+                )
 
     # Use the module's name if available, otherwise, use the provided module_name or
     # a default name
     if module_name is None:
         module_name = getattr(module, "__name__", module.__class__.__name__)
 
-    explore_members(inspect.getmembers(module), parent_name=module_name)
+    yield from explore_members(inspect.getmembers(module), parent_name=module_name)
+
+
+def extract_api_from_module(
+    module,
+    module_name=None,
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+):
+    """
+    Extract functions, classes, their signatures, and optionally docstrings from a given module.
+    Apply normalization unless disabled by the user.
+
+    Args:
+        module (module or class): The Python module or object to analyze.
+        module_name (str): A default name to use if the module has no __name__ attribute.
+        include_private (bool): Whether to include private functions and members (those starting with "_").
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+
+    Returns:
+        dict: A dictionary representing the structure of the module's API.
+    """
+    return structure_from_records(
+        iter_api_members(
+            module,
+            module_name=module_name,
+            include_private=include_private,
+            include_docstrings=include_docstrings,
+            disable_normalization=disable_normalization,
+        )
+    )
+
+
+def insert_record(api_structure, record):
+    """
+    Insert a member record, as yielded by `iter_api_members`, in an API structure.
+
+    Args:
+        api_structure (dict): The API structure to update.
+        record (dict): The member record, whose "path" gives its location.
+    """
+    *parents, name = record["path"]
+    container = api_structure
+    for parent in parents:
+        node = container.setdefault(parent, {})
+        container = node["members"] if "members" in node else node
+    container[name] = {key: value for key, value in record.items() if key != "path"}
+
+
+def structure_from_records(records):
+    """
+    Build an API structure from member records.
+
+    Args:
+        records (iterable): Member records, as yielded by `iter_api_members`.
+
+    Returns:
+        dict: The API structure.
+    """
+    api_structure = {}
+    for record in records:
+        insert_record(api_structure, record)
     return api_structure
 
 
-def analyze_stdlib(include_private=False):
+def iter_structure_records(api_structure, prefix=()):
+    """
+    Split an API structure into member records, the reverse of `structure_from_records`.
+
+    Args:
+        api_structure (dict): The API structure.
+        prefix (tuple): A path prepended to the path of every record, such as the
+            module name in a standard library structure.
+
+    Yields:
+        dict: A record describing a member of the API.
+    """
+    for name, entry in api_structure.items():
+        members = entry.get("members") if entry.get("type") == "class" else None
+        record = {"path": [*prefix, name]}
+        record.update(entry)
+        if members:
+            record["members"] = {}
+        yield record
+        for member_name, member in (members or {}).items():
+            yield {"path": [*prefix, name, member_name], **member}
+
+
+def iter_api_records(api, nested=False):
+    """
+    Split an extracted API (module information and structure) into records.
+
+    The first record holds the module information, under the "ladar" key, and is
+    followed by one record per member.
+
+    Args:
+        api (dict): The extracted API, with "ladar" and "structure" keys.
+        nested (bool): Whether the structure holds one structure per module, as
+            for the standard library.
+
+    Yields:
+        dict: The module information record, then the member records.
+    """
+    yield {"ladar": api["ladar"]}
+    if nested:
+        for module_name, structure in api["structure"].items():
+            yield from iter_structure_records(structure, prefix=(module_name,))
+    else:
+        yield from iter_structure_records(api["structure"])
+
+
+def api_from_records(records):
+    """
+    Build an extracted API (module information and structure) from records.
+
+    The records are consumed lazily, so they can be streamed from a JSON Lines
+    file with `ladar.common.io.iter_jsonl`.
+
+    Args:
+        records (iterable): Records, as yielded by `iter_api_records`.
+
+    Returns:
+        dict: The extracted API, with "ladar" and "structure" keys.
+    """
+    api = {"ladar": {}, "structure": {}}
+    for record in records:
+        if "path" in record:
+            insert_record(api["structure"], record)
+        elif "ladar" in record:
+            api["ladar"] = record["ladar"]
+    return api
+
+
+def load_api(file_path):
+    """
+    Load an extracted API (module information and structure) from a file.
+
+    JSON Lines files, as written in streaming mode, are read one record at a time.
+
+    Args:
+        file_path (str): The path to the extraction output file.
+
+    Returns:
+        dict: The extracted API, with "ladar" and "structure" keys.
+
+    Raises:
+        ValueError: If the file format is unsupported or if an error occurs while parsing.
+    """
+    # Imported here, so that this module only depends on the standard library
+    # and can be imported by the workers running in the target environments
+    from ladar.common.io import iter_jsonl, load
+
+    if file_path.lower().endswith(".jsonl"):
+        return api_from_records(iter_jsonl(file_path))
+    return load(file_path)
+
+
+class StreamedStructure:
+    """
+    An API structure read lazily from a JSON Lines file, as written in
+    streaming mode.
+
+    The member records are read again from the file on each iteration, one at a
+    time: the steps only needing the elements of the structure (see
+    `ladar.api.elements.iter_elements`) never hold it whole in memory, and
+    `load` builds the structure for the other ones.
+
+    Args:
+        file_path (str): The path to the JSON Lines file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def __repr__(self):
+        return f"StreamedStructure({self.file_path!r})"
+
+    def __bool__(self):
+        # Empty when no member record is found, as an empty structure
+        for _ in self.iter_records():
+            return True
+        return False
+
+    def iter_records(self):
+        """
+        Read the member records of the structure.
+
+        Yields:
+            dict: The member records, as yielded by `iter_structure_records`.
+        """
+        from ladar.common.io import iter_jsonl
+
+        for record in iter_jsonl(self.file_path):
+            if "path" in record:
+                yield record
+
+    def load(self):
+        """
+        Build the whole API structure.
+
+        Returns:
+            dict: The API structure.
+        """
+        return structure_from_records(self.iter_records())
+
+
+def load_structure(file_path):
+    """
+    Load the API structure of an extracted API from a file.
+
+    JSON Lines files, as written in streaming mode, are not loaded: their
+    structure is streamed on demand, see `StreamedStructure`.
+
+    Args:
+        file_path (str): The path to the extraction output file.
+
+    Returns:
+        dict or StreamedStructure: The API structure.
+
+    Raises:
+        ValueError: If the file format is unsupported or if an error occurs while parsing.
+    """
+    if file_path.lower().endswith(".jsonl"):
+        return StreamedStructure(file_path)
+    return load_api(file_path)["structure"]
+
+
+def list_stdlib_modules():
+    """
+    List the names of the Python standard library modules, in a stable order.
+
+    Returns:
+        list: The sorted names of the standard library modules.
+    """
+    # Get the list of standard library modules for Python 3.10+ or use pkgutil for older versions
+    if hasattr(sys, "stdlib_module_names"):
+        return sorted(sys.stdlib_module_names)
+    return sorted({name for _, name, _ in pkgutil.iter_modules()})
+
+
+def analyze_stdlib_module(
+    module_name,
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+):
+    """
+    Import a single standard library module and extract its API structure.
+
+    This function is the unit of work of `analyze_stdlib`, it is defined at the
+    module level so it can be dispatched to worker processes.
+
+    Args:
+        module_name (str): The name of the standard library module to analyze.
+        include_private (bool): Whether to include private members in the API extraction.
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+
+    Returns:
+        dict or None: The API structure of the module, or None if the module fails to import.
+    """
+    try:
+        module = __import__(module_name)
+    except ImportError:
+        return None  # Skip modules that fail to import
+
+    return extract_api_from_module(
+        module,
+        module_name=module_name,
+        include_private=include_private,
+        include_docstrings=include_docstrings,
+        disable_normalization=disable_normalization,
+    )
+
+
+def _terminate_pool(executor):
+    # A hung worker never returns, so the workers are killed rather than awaited
+    processes = getattr(executor, "_processes", None) or {}
+    for process in list(processes.values()):
+        process.terminate()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_stdlib_in_pool(stdlib_modules, jobs, window, timeout, **options):
+    """
+    Analyze standard library modules in a pool of worker processes, yielding
+    their API structures in order.
+
+    Each module is imported in a worker process, so import side effects stay out
+    of the main process, and a single pool is used for the whole run. A module
+    raising an error is skipped, and so is a module still running after
+    `timeout` seconds: its worker is killed, and the other modules in progress
+    are resubmitted to a new pool. A module killing its worker breaks the pool
+    too, without telling which module did: the pool is recreated for the other
+    modules, and the modules in progress are retried one at a time in a
+    separate worker, where the one crashing it is found and skipped.
+
+    Args:
+        stdlib_modules (list): The names of the modules to analyze.
+        jobs (int): The number of worker processes.
+        window (int): The maximum number of modules analyzed ahead of the next
+            one yielded, which bounds the number of structures held in memory.
+        timeout (float or None): The maximum time to analyze a module, in
+            seconds.
+        **options: Extraction options forwarded to `analyze_stdlib_module`.
+
+    Yields:
+        tuple: The name of a module and its API structure, for the modules that
+        were analyzed, in the order of `stdlib_modules`.
+    """
+    positions = {name: index for index, name in enumerate(stdlib_modules)}
+    queued = collections.deque(stdlib_modules)
+    suspects = collections.deque()
+    results = {}
+    running = {}
+    isolated = {}
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+    isolation = None
+    next_index = 0
+
+    def submit(pool, name):
+        future = pool.submit(analyze_stdlib_module, name, **options)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return future, (name, deadline)
+
+    try:
+        while next_index < len(stdlib_modules):
+            # At most one module per worker, so that each starts when submitted
+            while (
+                queued
+                and len(running) < jobs
+                and positions[queued[0]] < next_index + window
+            ):
+                future, entry = submit(executor, queued.popleft())
+                running[future] = entry
+            if suspects and not isolated:
+                if isolation is None:
+                    isolation = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+                future, entry = submit(isolation, suspects.popleft())
+                isolated[future] = entry
+
+            deadlines = [
+                deadline
+                for _, deadline in [*running.values(), *isolated.values()]
+                if deadline is not None
+            ]
+            concurrent.futures.wait(
+                [*running, *isolated],
+                timeout=(
+                    max(0, min(deadlines) - time.monotonic()) if deadlines else None
+                ),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            now = time.monotonic()
+
+            broken = False
+            for future in [future for future in running if future.done()]:
+                name, _ = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except concurrent.futures.process.BrokenProcessPool:
+                    broken = True
+                    suspects.append(name)
+                except Exception as e:
+                    logger.debug(f"Failed to analyze stdlib module {name}: {e}")
+                    results[name] = None
+            expired = [
+                future
+                for future, (_, deadline) in running.items()
+                if deadline is not None and deadline <= now
+            ]
+            for future in expired:
+                name, _ = running.pop(future)
+                logger.warning(f"Skipping stdlib module {name}: timed out")
+                results[name] = None
+            if broken or expired:
+                # The modules in progress in the pool are lost with it
+                lost = sorted((name for name, _ in running.values()), key=positions.get)
+                if broken:
+                    suspects.extend(lost)
+                else:
+                    queued.extendleft(reversed(lost))
+                running = {}
+                _terminate_pool(executor)
+                executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+
+            for future, (name, deadline) in list(isolated.items()):
+                crashed = False
+                if future.done():
+                    try:
+                        results[name] = future.result()
+                    except concurrent.futures.process.BrokenProcessPool:
+                        logger.warning(f"Skipping stdlib module {name}: it crashed")
+                        results[name] = None
+                        crashed = True
+                    except Exception as e:
+                        logger.debug(f"Failed to analyze stdlib module {name}: {e}")
+                        results[name] = None
+                elif deadline is not None and deadline <= now:
+                    logger.warning(f"Skipping stdlib module {name}: timed out")
+                    results[name] = None
+                    crashed = True
+                else:
+                    continue
+                del isolated[future]
+                if crashed:
+                    _terminate_pool(isolation)
+                    isolation = None
+
+            # Yield in a deterministic order, whatever the completion order
+            while (
+                next_index < len(stdlib_modules)
+                and stdlib_modules[next_index] in results
+            ):
+                structure = results.pop(stdlib_modules[next_index])
+                if structure is not None:
+                    yield stdlib_modules[next_index], structure
+                next_index += 1
+    finally:
+        _terminate_pool(executor)
+        if isolation is not None:
+            _terminate_pool(isolation)
+
+
+def iter_stdlib(
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+    batch_size=None,
+    timeout=MODULE_TIMEOUT,
+):
+    """
+    Analyze the Python standard library, yielding the API structure of each module
+    in a deterministic order.
+
+    Args:
+        include_private (bool): Whether to include private members in the API extraction.
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to analyze the modules.
+            With the default value of 1, modules are analyzed sequentially in the
+            current process.
+        batch_size (int, optional): The maximum number of modules analyzed by the
+            worker processes ahead of the next one yielded, which bounds the
+            number of structures held in memory. Not bounded by default.
+        timeout (float, optional): The maximum time to analyze a module in a
+            worker process, in seconds, after which it is skipped. Not bounded
+            when None.
+
+    Yields:
+        tuple: The name of a standard library module and its API structure.
+    """
+    stdlib_modules = list_stdlib_modules()
+    options = {
+        "include_private": include_private,
+        "include_docstrings": include_docstrings,
+        "disable_normalization": disable_normalization,
+    }
+
+    if jobs <= 1:
+        for module_name in stdlib_modules:
+            structure = analyze_stdlib_module(module_name, **options)
+            if structure is not None:
+                yield module_name, structure
+        return
+
+    yield from _iter_stdlib_in_pool(
+        stdlib_modules,
+        jobs,
+        batch_size or len(stdlib_modules),
+        timeout,
+        **options,
+    )
+
+
+def analyze_stdlib(
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+    timeout=MODULE_TIMEOUT,
+):
     """
     Analyze the Python standard library and extract its API structure.
 
     Args:
         include_private (bool): Whether to include private members in the API extraction.
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to analyze the modules.
+            With the default value of 1, modules are analyzed sequentially in the
+            current process.
+        timeout (float, optional): The maximum time to analyze a module in a
+            worker process, in seconds, see `iter_stdlib`.
 
     Returns:
         dict: A dictionary where keys are standard library module names, and values are the
         extracted API structures of those modules.
     """
-    stdlib_api = {}
-
-    # Get the list of standard library modules for Python 3.10+ or use pkgutil for older versions
-    stdlib_modules = (
-        sys.stdlib_module_names
-        if hasattr(sys, "stdlib_module_names")
-        else [name for _, name, _ in pkgutil.iter_modules()]
+    return dict(
+        iter_stdlib(
+            include_private=include_private,
+            include_docstrings=include_docstrings,
+            disable_normalization=disable_normalization,
+            jobs=jobs,
+            timeout=timeout,
+        )
     )
 
-    # Loop through each standard library module and extract its API
-    for module_name in stdlib_modules:
-        try:
-            module = __import__(module_name)
-        except ImportError:
-            continue  # Skip modules that fail to import
 
-        stdlib_api[module_name] = extract_api_from_module(module, include_private)
+def iter_stdlib_records(
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+    timeout=MODULE_TIMEOUT,
+):
+    """
+    Analyze the Python standard library, yielding one record per member.
+
+    The path of each record starts with the name of the standard library module
+    the member belongs to. Modules are analyzed one at a time, or a few ahead of
+    the one yielded when worker processes are used, so the memory usage doesn't
+    grow with the size of the standard library.
 
-    return stdlib_api
+    Args:
+        include_private (bool): Whether to include private members in the API extraction.
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to analyze the modules.
+        timeout (float, optional): The maximum time to analyze a module in a
+            worker process, in seconds, see `iter_stdlib`.
+
+    Yields:
+        dict: A record describing a member of the standard library API.
+    """
+    for module_name, structure in iter_stdlib(
+        include_private=include_private,
+        include_docstrings=include_docstrings,
+        disable_normalization=disable_normalization,
+        jobs=jobs,
+        batch_size=jobs * 4,
+        timeout=timeout,
+    ):
+        yield from iter_structure_records(structure, prefix=(module_name,))
@@ -0,0 +1,179 @@
+import collections
+import concurrent.futures
+import itertools
+import logging
+
+import numpy as np
+import scipy.sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from ladar.api.elements import get_element_text, split_words
+
+logger = logging.getLogger(__name__)
+
+# Number of hashed features: collisions stay rare for vocabularies of API words
+DEFAULT_FEATURES = 2**18
+
+# Number of documents hashed by a task
+BATCH_SIZE = 1024
+
+
+def get_document(path, member, include_docstrings=True):
+    """
+    Build the document of an element: the words of its name, signature and
+    optionally docstring.
+
+    Args:
+        path (str): The dotted path of the element.
+        member (dict): The description of the element.
+        include_docstrings (bool): Whether to include the docstring.
+
+    Returns:
+        str: The document.
+    """
+    return " ".join(split_words(get_element_text(path, member, include_docstrings)))
+
+
+def hash_documents(documents, n_features=DEFAULT_FEATURES):
+    """
+    Count the hashed words of documents.
+
+    No vocabulary is needed: each word is hashed to a feature, so the documents
+    can be hashed in any order, by batches, in any process, with identical
+    results.
+
+    Args:
+        documents (list): The documents.
+        n_features (int): The number of features.
+
+    Returns:
+        scipy.sparse.csr_matrix: The float32 word counts, one row per document.
+    """
+    vectorizer = HashingVectorizer(
+        n_features=n_features,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+    return vectorizer.transform(documents).tocsr()
+
+
+def _hash_batch(batch, n_features, include_docstrings):
+    paths = [path for path, _ in batch]
+    documents = [
+        get_document(path, member, include_docstrings) for path, member in batch
+    ]
+    return paths, hash_documents(documents, n_features)
+
+
+def _iter_pooled_batches(executor, batches, n_features, include_docstrings, jobs):
+    pending = collections.deque()
+    for batch in batches:
+        pending.append(
+            executor.submit(_hash_batch, batch, n_features, include_docstrings)
+        )
+        if len(pending) >= 2 * jobs:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_hashed_batches(
+    elements,
+    n_features=DEFAULT_FEATURES,
+    include_docstrings=True,
+    jobs=1,
+    batch_size=BATCH_SIZE,
+    executor=None,
+):
+    """
+    Hash the documents of a stream of elements, by batches.
+
+    The elements are consumed lazily, and at most `2 * jobs` batches are hashed
+    at once by the worker processes, so a stream read from disk is never loaded
+    whole.
+
+    Args:
+        elements (iterable): The `(path, member)` elements, see
+            `ladar.api.elements.iter_elements` and
+            `ladar.api.elements.iter_record_elements`.
+        n_features (int): The number of features.
+        include_docstrings (bool): Whether the documents include the docstrings.
+        jobs (int): The number of worker processes.
+        batch_size (int): The number of elements of each batch.
+        executor (concurrent.futures.Executor, optional): The pool of `jobs`
+            worker processes hashing the batches, to share it between several
+            streams. By default, a pool is created for this stream.
+
+    Yields:
+        tuple: The paths of the elements of a batch and their word counts, in the
+        order of the elements.
+    """
+    elements = iter(elements)
+    batches = iter(lambda: list(itertools.islice(elements, batch_size)), [])
+    if jobs <= 1:
+        for batch in batches:
+            yield _hash_batch(batch, n_features, include_docstrings)
+    elif executor is not None:
+        yield from _iter_pooled_batches(
+            executor, batches, n_features, include_docstrings, jobs
+        )
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from _iter_pooled_batches(
+                executor, batches, n_features, include_docstrings, jobs
+            )
+
+
+class DocumentFrequencies:
+    """
+    Document frequencies of hashed features, accumulated online.
+
+    The inverse document frequencies are known once every document is counted,
+    without a vocabulary nor a second pass over the documents: the counts of the
+    documents only need to be weighted at the end.
+
+    Args:
+        n_features (int): The number of features.
+    """
+
+    def __init__(self, n_features=DEFAULT_FEATURES):
+        self.frequencies = np.zeros(n_features, dtype=np.int64)
+        self.documents = 0
+
+    def update(self, counts):
+        """
+        Count the documents in which each feature is found.
+
+        Args:
+            counts (scipy.sparse.csr_matrix): The word counts of documents.
+        """
+        counts = counts.tocsr()
+        self.frequencies += np.bincount(counts.indices, minlength=len(self.frequencies))
+        self.documents += counts.shape[0]
+
+    def idf(self):
+        """
+        Return the smoothed inverse document frequencies, as scikit-learn
+        computes them.
+
+        Returns:
+            numpy.ndarray: The float32 weight of each feature.
+        """
+        return (np.log((1 + self.documents) / (1 + self.frequencies)) + 1).astype(
+            np.float32
+        )
+
+    def transform(self, counts):
+        """
+        Weight word counts by the inverse document frequencies, then normalize
+        them.
+
+        Args:
+            counts (scipy.sparse.csr_matrix): The word counts of documents.
+
+        Returns:
+            scipy.sparse.csr_matrix: The TF-IDF features.
+        """
+        return normalize(counts.tocsr() @ scipy.sparse.diags(self.idf()))
@@ -0,0 +1,158 @@
+import logging
+import os
+
+import ladar
+import ladar.common.cache as cache
+from ladar.api.static import extract_api_from_files, list_source_files
+from ladar.common.helpers import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+def get_fingerprints_path(output):
+    """
+    Return the path of the fingerprints file recorded next to an extraction output.
+
+    Args:
+        output (str): The path to the extraction output file.
+
+    Returns:
+        str: The path to the fingerprints file.
+    """
+    return f"{output}.fingerprints.json"
+
+
+def fingerprint_file(path, previous=None):
+    """
+    Fingerprint a source file by its modification time, size and content hash.
+
+    The content is only hashed when the modification time or the size differ
+    from the previous fingerprint.
+
+    Args:
+        path (str): The path to the source file.
+        previous (dict, optional): The previous fingerprint of the file.
+
+    Returns:
+        dict: The fingerprint of the file (mtime, size and sha256).
+    """
+    stat = os.stat(path)
+    fingerprint = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+    if (
+        previous is not None
+        and previous.get("mtime") == fingerprint["mtime"]
+        and previous.get("size") == fingerprint["size"]
+    ):
+        fingerprint["sha256"] = previous["sha256"]
+    else:
+        fingerprint["sha256"] = file_digest(path)
+    return fingerprint
+
+
+def extract_incrementally(
+    module_name,
+    source_path,
+    previous_structure=None,
+    previous_fingerprints=None,
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+):
+    """
+    Extract the API structure of a local package, re-extracting only the modules
+    whose sources changed since the previous extraction.
+
+    Each source file is fingerprinted (modification time, size and content hash)
+    and the fingerprints record the keys of the structure each module produced.
+    The structure of the unchanged modules is reused from the previous
+    extraction, the changed modules are parsed again, and the removed modules
+    are dropped. Sources are parsed statically, see `extract_api_statically`.
+
+    The fingerprints also record the extraction options, the version of ladar
+    and of the output format (`ladar.common.cache.CACHE_SCHEMA`): when any of
+    them differs, nothing is reused and every module is extracted again.
+
+    Args:
+        module_name (str): The name of the package.
+        source_path (str): The path to the package directory or module file.
+        previous_structure (dict, optional): The previously extracted API structure.
+        previous_fingerprints (dict, optional): The fingerprints recorded along with it.
+        include_private (bool): Whether to include private functions and members (those starting with "_").
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to parse the changed files.
+
+    Returns:
+        tuple: The API structure, the new fingerprints, and the list of the names of
+        the re-extracted modules.
+    """
+    options = {
+        "include_private": include_private,
+        "include_docstrings": include_docstrings,
+        "disable_normalization": disable_normalization,
+    }
+
+    previous_modules = {}
+    if (
+        previous_structure is not None
+        and previous_fingerprints is not None
+        and previous_fingerprints.get("options") == options
+        and previous_fingerprints.get("ladar") == ladar.__version__
+        and previous_fingerprints.get("schema") == cache.CACHE_SCHEMA
+    ):
+        previous_modules = previous_fingerprints.get("modules", {})
+    else:
+        previous_structure = {}
+
+    source_files = list_source_files(module_name, source_path, include_private)
+    modules = {}
+    changed_files = []
+    for name, path in source_files:
+        relative_path = os.path.relpath(path, source_path)
+        previous = previous_modules.get(name)
+        if previous is not None and previous.get("path") != relative_path:
+            previous = None
+
+        fingerprint = fingerprint_file(path, previous)
+        fingerprint["path"] = relative_path
+
+        if previous is not None and previous["sha256"] == fingerprint["sha256"]:
+            fingerprint["keys"] = previous["keys"]
+        else:
+            changed_files.append((name, path))
+        modules[name] = fingerprint
+
+    structures = extract_api_from_files(
+        changed_files, root_modules=[module_name], jobs=jobs, **options
+    )
+    module_structures = {
+        name: {
+            key: previous_structure[key]
+            for key in modules[name]["keys"]
+            if key in previous_structure
+        }
+        for name, _ in source_files
+        if "keys" in modules[name]
+    }
+    for (name, _), structure in zip(changed_files, structures):
+        module_structures[name] = structure
+        modules[name]["keys"] = list(structure)
+
+    # Merge the structures in the order of the source files, so the result is
+    # the same as the one of a full extraction.
+    api_structure = {}
+    for name, _ in source_files:
+        api_structure.update(module_structures[name])
+
+    logger.info(
+        f"Re-extracted {len(changed_files)} of {len(source_files)} modules of {module_name}."
+    )
+    fingerprints = {
+        "ladar": ladar.__version__,
+        "schema": cache.CACHE_SCHEMA,
+        "options": options,
+        "modules": modules,
+    }
+    return api_structure, fingerprints, [name for name, _ in changed_files]
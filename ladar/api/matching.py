@@ -0,0 +1,214 @@
+import collections
+import logging
+import time
+
+import numpy as np
+
+from ladar.api.distance import radius_neighbors_graph
+from ladar.api.elements import get_arity, get_element_name, get_element_text
+from ladar.api.normalize import normalize_value
+
+logger = logging.getLogger(__name__)
+
+# The tiers of the matching, from the cheapest to the most expensive
+TIERS = ("name", "name_arity", "fuzzy")
+
+
+def name_key(path, member):
+    """
+    Return the key of an element at the 'name' tier: its normalized qualified
+    name, without its package (see `ladar.api.elements.get_element_name`).
+
+    Args:
+        path (str): The dotted path of the element.
+        member (dict): The description of the element.
+
+    Returns:
+        str: The key.
+    """
+    return normalize_value(get_element_name(path))
+
+
+def name_arity_key(path, member):
+    """
+    Return the key of an element at the 'name_arity' tier: its normalized own
+    name and the arity of its signature, so that members moved to another
+    module or class are matched.
+
+    Args:
+        path (str): The dotted path of the element.
+        member (dict): The description of the element.
+
+    Returns:
+        tuple: The key.
+    """
+    return normalize_value(path.rpartition(".")[2]), get_arity(member.get("signature"))
+
+
+def hash_join(source_keys, target_keys):
+    """
+    Join two lists of keys on equality.
+
+    Only the keys found once on each side are joined: the ambiguous ones are
+    left to the next tiers.
+
+    Args:
+        source_keys (list): The keys of the source elements.
+        target_keys (list): The keys of the target elements.
+
+    Returns:
+        list: The `(source index, target index)` pairs joined, in source order.
+    """
+    source_counts = collections.Counter(source_keys)
+    targets = {}
+    for index, key in enumerate(target_keys):
+        targets[key] = None if key in targets else index
+    return [
+        (index, targets[key])
+        for index, key in enumerate(source_keys)
+        if source_counts[key] == 1 and targets.get(key) is not None
+    ]
+
+
+def nearest_matches(source_texts, target_texts, max_distance, jobs=1):
+    """
+    Match texts to their nearest other texts, by normalized Levenshtein distance,
+    one to one.
+
+    The pairs within the maximum distance are assigned greedily, from the
+    nearest to the farthest: a text matched is not matched again, so a source
+    text whose nearest target is taken by a nearer source text is matched to its
+    next nearest one, if any.
+
+    Args:
+        source_texts (list): The texts to match.
+        target_texts (list): The texts matched to.
+        max_distance (float): The maximum normalized distance of a match.
+        jobs (int): The number of processes computing the distances.
+
+    Returns:
+        list: The `(source index, target index, distance)` matches, in source
+        order; ties go to the first source, then to the first target.
+    """
+    if not source_texts or not target_texts:
+        return []
+    size = len(source_texts)
+    graph = radius_neighbors_graph(
+        source_texts + target_texts,
+        max_distance,
+        jobs=jobs,
+        groups=[0] * size + [1] * len(target_texts),
+    )
+    # The distances of the source rows to the target columns, zeros included
+    near = graph[:size, size:].tocoo()
+    order = np.lexsort((near.col, near.row, near.data))
+    matches = {}
+    matched_columns = set()
+    for row, column, distance in zip(
+        near.row[order].tolist(),
+        near.col[order].tolist(),
+        near.data[order].tolist(),
+    ):
+        if row not in matches and column not in matched_columns:
+            matches[row] = (row, column, distance)
+            matched_columns.add(column)
+    return [matches[row] for row in sorted(matches)]
+
+
+def match_tiered(
+    source, target, max_distance=0.3, fuzzy=True, jobs=1, include_docstrings=False
+):
+    """
+    Match the elements of a source structure to those of a target structure,
+    tier by tier.
+
+    The elements are first hash-joined on their normalized qualified name, then
+    on their own name and arity: most elements of two versions of a library are
+    matched this way, in linear time. Only the leftovers are compared by
+    normalized Levenshtein distance, and matched one to one, nearest pairs first,
+    within `max_distance` (see `nearest_matches`).
+
+    Args:
+        source (list): The `(path, member)` elements of the source structure.
+        target (list): The `(path, member)` elements of the target structure.
+        max_distance (float): The maximum normalized distance of a fuzzy match.
+        fuzzy (bool): Whether the leftovers are compared at the 'fuzzy' tier.
+        jobs (int): The number of processes computing the distances.
+        include_docstrings (bool): Whether the fuzzy tier compares the
+            docstrings too.
+
+    Returns:
+        tuple: The matches, a dict of the matched source paths to their target
+        `path`, `tier` and `distance` (0 for the hash joins), in source order,
+        and the statistics of each tier run: the number of elements `matched`
+        and the `seconds` taken.
+    """
+    unmatched_source = list(range(len(source)))
+    unmatched_target = list(range(len(target)))
+    matches = {}
+    stats = []
+
+    def resolve(tier, pairs):
+        matched_targets = set()
+        for source_index, target_index, distance in pairs:
+            path = source[source_index][0]
+            matches[path] = {
+                "path": target[target_index][0],
+                "tier": tier,
+                "distance": round(distance, 6),
+            }
+            matched_targets.add(target_index)
+        matched_sources = {pair[0] for pair in pairs}
+        unmatched_source[:] = [i for i in unmatched_source if i not in matched_sources]
+        unmatched_target[:] = [i for i in unmatched_target if i not in matched_targets]
+
+    for tier, key in (("name", name_key), ("name_arity", name_arity_key)):
+        start = time.perf_counter()
+        pairs = hash_join(
+            [key(*source[i]) for i in unmatched_source],
+            [key(*target[i]) for i in unmatched_target],
+        )
+        pairs = [(unmatched_source[i], unmatched_target[j], 0.0) for i, j in pairs]
+        resolve(tier, pairs)
+        stats.append(
+            {
+                "tier": tier,
+                "matched": len(pairs),
+                "seconds": round(time.perf_counter() - start, 6),
+            }
+        )
+
+    if fuzzy:
+        start = time.perf_counter()
+        pairs = nearest_matches(
+            [
+                get_element_text(*source[i], include_docstrings)
+                for i in unmatched_source
+            ],
+            [
+                get_element_text(*target[i], include_docstrings)
+                for i in unmatched_target
+            ],
+            max_distance,
+            jobs=jobs,
+        )
+        pairs = [
+            (unmatched_source[i], unmatched_target[j], distance)
+            for i, j, distance in pairs
+        ]
+        resolve("fuzzy", pairs)
+        stats.append(
+            {
+                "tier": "fuzzy",
+                "matched": len(pairs),
+                "seconds": round(time.perf_counter() - start, 6),
+            }
+        )
+
+    for tier in stats:
+        logger.debug(
+            f"Tier {tier['tier']}: {tier['matched']} elements matched in "
+            f"{tier['seconds']:.3f}s"
+        )
+    # In the order of the source elements, whatever their tier
+    return {path: matches[path] for path, _ in source if path in matches}, stats
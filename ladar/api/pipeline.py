@@ -1,12 +1,14 @@
 import ast
-import importlib
 import logging
 import re
 
-from ladar.api.compare import load_algorithms
+from ladar.api.compare import get_algorithm_class
+from ladar.api.extract import StreamedStructure
 
 logger = logging.getLogger(__name__)
 
+STEP_PATTERN = re.compile(r"^\s*(\w+):(\w+)\s*(?:\((.*)\))?\s*$", re.DOTALL)
+
 
 def parse_step(step_str):
     """
@@ -32,48 +34,126 @@ def parse_step(step_str):
         raise ValueError(f"Invalid step format: {step_str}")
 
 
-def parse(pipeline_str):
+def parse_step_params(step_str):
     """
-    Parse the pipeline string into individual algorithm steps.
+    Parse the parameters given inline to a pipeline step.
 
     Args:
-        pipeline_str (str): The pipeline string provided by the user, e.g., 'normalize:minmaxscaler,cluster:dbscan'.
+        step_str (str): A pipeline step, e.g. 'cluster:dbscan(eps=0.3, min_samples=2)'.
 
     Returns:
-        list: A list of pipeline steps in the correct order.
+        dict: The parameters of the step, empty when none is given.
+
+    Raises:
+        ValueError: If the step format or a parameter value is invalid.
     """
+    match = STEP_PATTERN.match(step_str)
+    if match is None:
+        raise ValueError(f"Invalid step format: {step_str}")
+    if not match.group(3) or not match.group(3).strip():
+        return {}
+
+    try:
+        call = ast.parse(f"f({match.group(3)})", mode="eval").body
+        if call.args or any(keyword.arg is None for keyword in call.keywords):
+            raise ValueError("parameters must be given by name")
+        return {
+            keyword.arg: ast.literal_eval(keyword.value) for keyword in call.keywords
+        }
+    except (SyntaxError, ValueError) as e:
+        raise ValueError(f"Invalid parameters in step {step_str}: {e}")
 
-    available_algorithms = load_algorithms()
-    standardized_algorithms = {
-        name.lower(): module["class"] for name, module in available_algorithms.items()
-    }  # Ensure we are working with the algorithm class itself
 
+def split_steps(pipeline_str):
+    """
+    Split a pipeline string into its steps, ignoring the commas of parameters.
+
+    Args:
+        pipeline_str (str): The pipeline, e.g. 'extract:tfidf,cluster:dbscan(eps=0.3, min_samples=2)'.
+
+    Returns:
+        list: The step strings.
+    """
     steps = []
-    for step_str in pipeline_str.split(","):
-        algorithm_name = parse_step(step_str)
+    depth = 0
+    current = ""
+    for char in pipeline_str:
+        if char == "," and depth == 0:
+            steps.append(current)
+            current = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current += char
+    steps.append(current)
+    return [step.strip() for step in steps if step.strip()]
 
-        algorithm_name = algorithm_name.lower()
-        if algorithm_name not in standardized_algorithms:
-            raise ValueError(
-                f"Algorithm '{algorithm_name}' not found in available algorithms: {', '.join(standardized_algorithms.keys())}"
-            )
 
+def parse(pipeline_str):
+    """
+    Parse the pipeline string into individual algorithm steps.
+
+    Only the algorithms used by the steps are imported, see
+    `ladar.api.compare.get_algorithm_class`.
+
+    Args:
+        pipeline_str (str): The pipeline string provided by the user, e.g., 'normalize:minmaxscaler,cluster:dbscan(eps=0.3)'.
+
+    Returns:
+        list: A list of pipeline steps in the correct order.
+    """
+    steps = []
+    for step_str in split_steps(pipeline_str):
+        algorithm_name = parse_step(step_str)
         steps.append(
             {
-                "algorithm": standardized_algorithms[algorithm_name]
-            }  # Store the class itself
+                "name": algorithm_name,
+                "algorithm": get_algorithm_class(algorithm_name),  # The class itself
+                "params": parse_step_params(step_str),
+            }
         )
 
     return steps
 
 
+def load_streamed(data):
+    """
+    Load the structures streamed from JSON Lines files given to a step.
+
+    Args:
+        data (list or dict): The API structures, some of them possibly
+            `ladar.api.extract.StreamedStructure`, or the results of a blocking
+            step holding them under `structures`.
+
+    Returns:
+        list or dict: The data, with every structure loaded.
+    """
+    if isinstance(data, dict) and isinstance(data.get("structures"), list):
+        return dict(data, structures=load_streamed(data["structures"]))
+    if isinstance(data, list) and any(
+        isinstance(structure, StreamedStructure) for structure in data
+    ):
+        return [
+            (
+                structure.load()
+                if isinstance(structure, StreamedStructure)
+                else structure
+            )
+            for structure in data
+        ]
+    return data
+
+
 def run(pipeline_steps, structures, params):
     """
     Execute the specified pipeline of algorithms on the given structures.
 
+    The structures streamed from JSON Lines files are loaded once a step needs
+    the whole structures, see `ladar.api.algorithms.base.BaseAlgorithm.streaming`.
+
     Args:
         pipeline_steps (list): List of pipeline steps with algorithm names.
-        structures (list): A list of input structures to compare.
+        structures (list): A list of input structures to compare, dicts or
+            `ladar.api.extract.StreamedStructure`.
         params (dict): Parameters for each algorithm.
 
     Returns:
@@ -83,13 +163,16 @@ def run(pipeline_steps, structures, params):
 
     for step in pipeline_steps:
         algorithm_class = step["algorithm"]  # Directly access the class
-        algorithm_name = algorithm_class.__name__.lower()  # Get the class name
-        algorithm_params = params.get(
-            algorithm_name, {}
-        )  # Get the algorithm parameters
+        algorithm_name = step.get("name", algorithm_class.__name__.lower())
+        # Parameters given inline in the pipeline take precedence
+        algorithm_params = dict(
+            params.get(algorithm_name, {}), **step.get("params", {})
+        )
 
         # Instantiate the algorithm with the given parameters
         algorithm = algorithm_class(**algorithm_params)
+        if not getattr(algorithm, "streaming", False):
+            data = load_streamed(data)
 
         # Execute the fit_transform (or transform) method on the data
         try:
@@ -118,8 +201,7 @@ def load_algorithm_by_name(name):
         class: The algorithm class if found, None otherwise.
     """
     try:
-        module = importlib.import_module(f"ladar.algorithms.{name.lower()}")
-        return getattr(module, name)
-    except (ImportError, AttributeError) as e:
+        return get_algorithm_class(name)
+    except ValueError as e:
         logger.error(f"Failed to load algorithm {name}: {e}")
         return None
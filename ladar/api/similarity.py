@@ -0,0 +1,182 @@
+import logging
+
+import numpy as np
+import scipy.sparse
+from sklearn.preprocessing import normalize
+
+from ladar.api.blocking import iter_partition_blocks
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of similarities computed at once, bounding the memory of a block
+BLOCK_ENTRIES = 4 * 1024 * 1024
+
+
+def select_top_k(similarities, k, min_similarity=0.0):
+    """
+    Select the `k` largest values of each row of a matrix.
+
+    Dense matrices are partially sorted row by row. The non-zero values of sparse
+    matrices are sorted at once, which is faster when they are few.
+
+    Args:
+        similarities (numpy.ndarray or scipy.sparse.csr_matrix): The
+            similarities, one row per item.
+        k (int): The number of values selected by row.
+        min_similarity (float): The minimum value selected; zeros are never
+            selected.
+
+    Returns:
+        tuple: The column indices and the values selected, in arrays of shape
+        `(rows, k)`, by decreasing value. Rows with fewer than `k` values
+        selected are padded with the index -1 and the value 0.
+    """
+    rows, columns = similarities.shape
+    indices = np.full((rows, k), -1, dtype=np.int64)
+    values = np.zeros((rows, k), dtype=np.float32)
+    if not columns or not rows:
+        return indices, values
+
+    if scipy.sparse.issparse(similarities):
+        similarities = similarities.tocsr()
+        counts = np.diff(similarities.indptr)
+        row_ids = np.repeat(np.arange(rows), counts)
+        # Sort by row, then by decreasing value: the values are at most 1
+        data = np.minimum(similarities.data, 1.0)
+        order = np.argsort(row_ids + (1.0 - data) * 0.5)
+        ranks = np.arange(len(order)) - np.repeat(similarities.indptr[:-1], counts)
+        selected = (ranks < k) & (data[order] > 0) & (data[order] >= min_similarity)
+        kept = order[selected]
+        indices[row_ids[kept], ranks[selected]] = similarities.indices[kept]
+        values[row_ids[kept], ranks[selected]] = data[kept]
+        return indices, values
+
+    size = min(k, columns)
+    # Partial selection of the best columns of each row, then sort of these only
+    best = np.argpartition(-similarities, size - 1, axis=1)[:, :size]
+    best_values = np.take_along_axis(similarities, best, axis=1)
+    order = np.argsort(-best_values, axis=1, kind="stable")
+    best = np.take_along_axis(best, order, axis=1)
+    best_values = np.take_along_axis(best_values, order, axis=1)
+    selected = (best_values > 0) & (best_values >= min_similarity)
+    indices[:, :size] = np.where(selected, best, -1)
+    values[:, :size] = np.where(selected, best_values, 0)
+    return indices, values
+
+
+def top_k_similar(source, target, k=5, min_similarity=0.0):
+    """
+    Find the `k` rows of a target matrix most similar to each row of a source
+    matrix, by cosine similarity.
+
+    The similarities are computed by blocks of source rows, with sparse matrix
+    products, and only the `k` best of each row are kept: the memory used is
+    bounded by `BLOCK_ENTRIES`, whatever the number of rows. The blocks where
+    most pairs share terms are selected from as dense arrays, see
+    `select_top_k`.
+
+    Args:
+        source (scipy.sparse.spmatrix): The source features, one row per item.
+        target (scipy.sparse.spmatrix): The target features, with the same
+            columns.
+        k (int): The number of matches of each source row.
+        min_similarity (float): The minimum similarity of a match.
+
+    Returns:
+        tuple: The indices of the target rows matched and their similarities, in
+        arrays of shape `(source rows, k)`, best match first. Missing matches
+        have the index -1.
+    """
+    source = normalize(scipy.sparse.csr_matrix(source, dtype=np.float32))
+    target_t = normalize(scipy.sparse.csr_matrix(target, dtype=np.float32)).T.tocsc()
+    block_rows = max(1, BLOCK_ENTRIES // max(1, target_t.shape[1]))
+    logger.debug(
+        f"Matching {source.shape[0]} rows with {target_t.shape[1]} rows, "
+        f"{block_rows} rows at a time"
+    )
+
+    indices = np.full((source.shape[0], k), -1, dtype=np.int64)
+    values = np.zeros((source.shape[0], k), dtype=np.float32)
+    for start in range(0, source.shape[0], block_rows):
+        stop = min(start + block_rows, source.shape[0])
+        block = (source[start:stop] @ target_t).tocsr()
+        if block.nnz * 4 > block.shape[0] * block.shape[1]:
+            block = block.toarray()
+        indices[start:stop], values[start:stop] = select_top_k(block, k, min_similarity)
+    return indices, values
+
+
+def match_elements(
+    features,
+    elements,
+    structures,
+    k=5,
+    min_similarity=0.0,
+    partitions=None,
+    tolerance=1,
+):
+    """
+    Map each element of the first structure to its `k` most similar elements in
+    each of the other structures, see `top_k_similar`.
+
+    Args:
+        features (scipy.sparse.spmatrix): The features of the elements, one row
+            per element.
+        elements (list): The elements, with their `structure` index and `path`.
+        structures (int): The number of structures.
+        k (int): The number of matches of each element.
+        min_similarity (float): The minimum similarity of a match.
+        partitions (tuple, optional): The kinds and arities of the elements, to
+            only match elements of compatible partitions, see
+            `ladar.api.blocking.get_partitions`.
+        tolerance (int): The maximum difference of arities of the elements
+            matched, with partitions.
+
+    Returns:
+        dict: The matches in each structure but the first, by key
+        `struct_<number>`: the matches of each element of the first structure,
+        by path, as lists of `path` and `similarity`, best match first.
+    """
+    features = scipy.sparse.csr_matrix(features)
+    by_structure = [[] for _ in range(structures)]
+    for index, element in enumerate(elements):
+        by_structure[element["structure"]].append(index)
+
+    matches = {}
+    source = np.array(by_structure[0], dtype=np.int64)
+    for structure_index in range(1, structures):
+        target = np.array(by_structure[structure_index], dtype=np.int64)
+        if partitions is None:
+            blocks = [(source, target)]
+        else:
+            blocks = iter_partition_blocks(partitions, tolerance, source, target)
+
+        indices = np.full((len(source), k), -1, dtype=np.int64)
+        values = np.zeros((len(source), k), dtype=np.float32)
+        for rows, columns in blocks:
+            if not len(columns):
+                continue
+            block_indices, block_values = top_k_similar(
+                features[rows], features[columns], k=k, min_similarity=min_similarity
+            )
+            # Back to the indices of the elements
+            at = np.searchsorted(source, rows)
+            indices[at] = np.where(
+                block_indices >= 0, columns[np.maximum(block_indices, 0)], -1
+            )
+            values[at] = block_values
+
+        matches[f"struct_{structure_index + 1}"] = {
+            elements[member]["path"]: [
+                {
+                    "path": elements[match]["path"],
+                    "similarity": round(float(value), 6),
+                }
+                for match, value in zip(row_indices, row_values)
+                if match >= 0
+            ]
+            for member, row_indices, row_values in zip(
+                source.tolist(), indices.tolist(), values.tolist()
+            )
+        }
+    return matches
@@ -0,0 +1,575 @@
+import ast
+import concurrent.futures
+import functools
+import importlib.metadata
+import importlib.util
+import logging
+import os
+from datetime import datetime
+
+from ladar.api.extract import (
+    generate_uid,
+    iter_structure_records,
+    list_stdlib_modules,
+    should_include_member,
+)
+from ladar.api.normalize import normalize_docstring, normalize_value
+
+logger = logging.getLogger(__name__)
+
+
+def find_module_source(module_name):
+    """
+    Locate the sources of a module without importing it.
+
+    Args:
+        module_name (str): The name of a top-level module (e.g., 'asyncio').
+
+    Returns:
+        str or None: The path to the package directory or to the module file, or None
+        if the module has no Python sources (builtin or extension modules).
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None:
+        return None
+    if spec.submodule_search_locations:
+        locations = list(spec.submodule_search_locations)
+        return locations[0] if locations else None
+    if spec.origin and spec.origin.endswith(".py"):
+        return spec.origin
+    return None
+
+
+def find_local_source(path):
+    """
+    Locate the sources of a local module or project.
+
+    A project root (a directory containing a `pyproject.toml`, `setup.py` or
+    `setup.cfg` but no `__init__.py`) is resolved to its package, following
+    either the flat or the `src` layout.
+
+    Args:
+        path (str): The path to a local module, package or project.
+
+    Returns:
+        tuple: The module name and the path to its sources.
+
+    Raises:
+        ImportError: If no Python sources can be found at the given path.
+    """
+    path = os.path.abspath(path)
+    module_name = os.path.splitext(os.path.basename(path))[0]
+
+    if os.path.isfile(path) or os.path.exists(os.path.join(path, "__init__.py")):
+        return module_name, path
+
+    for candidate in (
+        os.path.join(path, module_name),
+        os.path.join(path, "src", module_name),
+    ):
+        if os.path.exists(os.path.join(candidate, "__init__.py")):
+            return module_name, candidate
+
+    raise ImportError(f"No Python sources found in {path}.")
+
+
+def list_source_files(module_name, source_path, include_private=False):
+    """
+    List the source files of a module along with their qualified module names.
+
+    Args:
+        module_name (str): The name of the module.
+        source_path (str): The path to the module file or package directory.
+        include_private (bool): Whether to include private submodules.
+
+    Returns:
+        list: A sorted list of (qualified module name, file path) tuples.
+    """
+    if os.path.isfile(source_path):
+        return [(module_name, source_path)]
+
+    source_files = []
+    for root, dirs, files in os.walk(source_path):
+        relative_root = os.path.relpath(root, source_path)
+        package = module_name
+        if relative_root != os.curdir:
+            package = ".".join([module_name] + relative_root.split(os.sep))
+
+        # Only descend into sub packages, and skip the private ones unless requested
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if d.isidentifier()
+            and os.path.exists(os.path.join(root, d, "__init__.py"))
+            and (include_private or not d.startswith("_"))
+        )
+
+        for filename in sorted(files):
+            name, extension = os.path.splitext(filename)
+            if extension != ".py" or not name.isidentifier():
+                continue
+            if name == "__init__":
+                source_files.append((package, os.path.join(root, filename)))
+            elif include_private or not name.startswith("_"):
+                source_files.append((f"{package}.{name}", os.path.join(root, filename)))
+
+    return sorted(source_files)
+
+
+def format_signature(arguments, returns=None, skip_first=False):
+    """
+    Format the arguments of a function definition like `inspect.signature` does.
+
+    Args:
+        arguments (ast.arguments): The arguments node of the function definition.
+        returns (ast.expr, optional): The return annotation node.
+        skip_first (bool): Whether to drop the first parameter, as for classmethods
+            which are bound to their class.
+
+    Returns:
+        str: The formatted signature (e.g., '(a, b: int = 1, *args, **kwargs) -> str').
+    """
+
+    def format_parameter(arg, default=None, prefix=""):
+        parameter = prefix + arg.arg
+        if arg.annotation is not None:
+            parameter += f": {ast.unparse(arg.annotation)}"
+            if default is not None:
+                parameter += f" = {ast.unparse(default)}"
+        elif default is not None:
+            parameter += f"={ast.unparse(default)}"
+        return parameter
+
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(
+        arguments.defaults
+    )
+    parameters = [
+        format_parameter(arg, default) for arg, default in zip(positional, defaults)
+    ]
+    if arguments.posonlyargs:
+        parameters.insert(len(arguments.posonlyargs), "/")
+
+    if arguments.vararg is not None:
+        parameters.append(format_parameter(arguments.vararg, prefix="*"))
+    elif arguments.kwonlyargs:
+        parameters.append("*")
+    for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        parameters.append(format_parameter(arg, default))
+    if arguments.kwarg is not None:
+        parameters.append(format_parameter(arguments.kwarg, prefix="**"))
+
+    if skip_first and positional:
+        parameters.pop(0)
+        if parameters and parameters[0] == "/":
+            parameters.pop(0)
+
+    signature = f"({', '.join(parameters)})"
+    if returns is not None:
+        signature += f" -> {ast.unparse(returns)}"
+    return signature
+
+
+def _decorator_names(node):
+    names = set()
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if isinstance(decorator, ast.Name):
+            names.add(decorator.id)
+        elif isinstance(decorator, ast.Attribute):
+            names.add(decorator.attr)
+    return names
+
+
+def _iter_definitions(body):
+    """
+    Iterate over the function and class definitions of a module or class body,
+    including the ones nested in top-level `if` and `try` blocks.
+    """
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield node
+        elif isinstance(node, ast.If):
+            yield from _iter_definitions(node.body)
+            yield from _iter_definitions(node.orelse)
+        elif isinstance(node, ast.Try):
+            for block in (node.body, node.orelse, node.finalbody):
+                yield from _iter_definitions(block)
+            for handler in node.handlers:
+                yield from _iter_definitions(handler.body)
+
+
+def extract_api_from_source(
+    source,
+    module_name,
+    is_submodule=False,
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+):
+    """
+    Extract functions, classes, their signatures, and optionally docstrings from
+    Python source code, without executing it.
+
+    The produced structure follows the schema of `extract_api_from_module`. As the
+    code is never executed, only the members defined in the source are reported:
+    inherited methods, re-exported names and dynamically created members are
+    not.
+
+    Args:
+        source (str): The Python source code to analyze.
+        module_name (str): The qualified name of the module the source belongs to.
+        is_submodule (bool): Whether to add an entry describing the module itself,
+            as done for the submodules of a package.
+        include_private (bool): Whether to include private functions and members (those starting with "_").
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+
+    Returns:
+        dict: A dictionary representing the structure of the module's API.
+    """
+    tree = ast.parse(source)
+    api_structure = {}
+
+    def qualify(name):
+        full_name = f"{module_name}.{name}"
+        return full_name if disable_normalization else normalize_value(full_name)
+
+    def get_docstring(node):
+        if not include_docstrings:
+            return None
+        docstring = ast.get_docstring(node)
+        if docstring and not disable_normalization:
+            docstring = normalize_docstring(docstring)
+        return docstring
+
+    def get_signature(node, skip_first=False):
+        signature = format_signature(node.args, node.returns, skip_first=skip_first)
+        return signature if disable_normalization else normalize_value(signature)
+
+    if is_submodule:
+        full_name = (
+            module_name if disable_normalization else normalize_value(module_name)
+        )
+        api_structure[full_name] = {
+            "type": "module",
+            "uid": generate_uid(full_name, "module"),
+            "members": {},
+        }
+        docstring = get_docstring(tree)
+        if docstring:
+            api_structure[full_name]["docstring"] = docstring
+
+    for node in _iter_definitions(tree.body):
+        if not include_private and node.name.startswith("_"):
+            continue
+        if not should_include_member(node.name):
+            continue
+
+        full_name = qualify(node.name)
+        docstring = get_docstring(node)
+
+        if isinstance(node, ast.ClassDef):
+            api_structure[full_name] = {
+                "type": "class",
+                "uid": generate_uid(full_name, "class"),
+                "members": {},
+            }
+            if docstring:
+                api_structure[full_name]["docstring"] = docstring
+
+            for method in _iter_definitions(node.body):
+                if isinstance(method, ast.ClassDef):
+                    continue
+                if not should_include_member(method.name):
+                    continue
+
+                decorators = _decorator_names(method)
+                # Properties are not reported as methods by the dynamic extraction
+                if decorators & {"property", "cached_property", "setter", "deleter"}:
+                    continue
+
+                method_name = (
+                    method.name
+                    if disable_normalization
+                    else normalize_value(method.name)
+                )
+                method_type = (
+                    "async method"
+                    if isinstance(method, ast.AsyncFunctionDef)
+                    else "method"
+                )
+                signature = format_signature(
+                    method.args,
+                    method.returns,
+                    skip_first="classmethod" in decorators,
+                )
+                member = {
+                    "type": method_type,
+                    "uid": generate_uid(
+                        f"{full_name}.{method_name}", method_type, signature
+                    ),
+                    "signature": signature,
+                }
+                method_docstring = get_docstring(method)
+                if method_docstring:
+                    member["docstring"] = method_docstring
+                api_structure[full_name]["members"][method_name] = member
+
+        else:
+            function_type = (
+                "async function"
+                if isinstance(node, ast.AsyncFunctionDef)
+                else "function"
+            )
+            signature = get_signature(node)
+            api_structure[full_name] = {
+                "type": function_type,
+                "uid": generate_uid(full_name, function_type, signature),
+                "signature": signature,
+            }
+            if docstring:
+                api_structure[full_name]["docstring"] = docstring
+
+    return api_structure
+
+
+def extract_api_from_file(path, module_name, is_submodule=False, **options):
+    """
+    Extract the API structure of a single source file.
+
+    This function is the unit of work of `extract_api_statically`, it is defined at
+    the module level so it can be dispatched to worker processes.
+
+    Args:
+        path (str): The path to the source file.
+        module_name (str): The qualified name of the module.
+        is_submodule (bool): Whether the module is a submodule of the analyzed package.
+        **options: Extraction options forwarded to `extract_api_from_source`.
+
+    Returns:
+        dict: The API structure of the file, empty if it can't be parsed.
+    """
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        return extract_api_from_source(
+            source, module_name, is_submodule=is_submodule, **options
+        )
+    except (SyntaxError, ValueError, OSError) as e:
+        logger.warning(f"Skipping {path}: {e}")
+        return {}
+
+
+def extract_api_from_files(source_files, root_modules=(), jobs=1, **options):
+    """
+    Extract the API structures of several source files.
+
+    Args:
+        source_files (list): A list of (qualified module name, file path) tuples.
+        root_modules (iterable): The module names that are analyzed as a whole,
+            whose own source file doesn't produce a module entry.
+        jobs (int): The number of worker processes used to parse the files.
+        **options: Extraction options forwarded to `extract_api_from_source`.
+
+    Yields:
+        dict: The API structure of each file, in the order of `source_files`.
+    """
+    root_modules = set(root_modules)
+    tasks = [
+        (path, module_name, module_name not in root_modules)
+        for module_name, path in source_files
+    ]
+
+    if jobs > 1 and len(tasks) > 1:
+        # Dispatch the files by chunks, most of them are parsed in milliseconds
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(
+                functools.partial(extract_api_from_file, **options),
+                *zip(*tasks),
+                chunksize=chunksize,
+            )
+        return
+
+    for task in tasks:
+        yield extract_api_from_file(*task, **options)
+
+
+def iter_api_statically(
+    module_name,
+    source_path,
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+):
+    """
+    Extract the API of a module or package by parsing its sources, yielding one
+    record per member, one source file at a time.
+
+    Args:
+        module_name (str): The name of the module.
+        source_path (str): The path to the module file or package directory.
+        include_private (bool): Whether to include private functions and members (those starting with "_").
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to parse the files.
+
+    Yields:
+        dict: A record describing a member of the module's API, see
+        `ladar.api.extract.iter_api_members`.
+    """
+    source_files = list_source_files(module_name, source_path, include_private)
+    for structure in extract_api_from_files(
+        source_files,
+        root_modules=[module_name],
+        jobs=jobs,
+        include_private=include_private,
+        include_docstrings=include_docstrings,
+        disable_normalization=disable_normalization,
+    ):
+        yield from iter_structure_records(structure)
+
+
+def extract_api_statically(
+    module_name,
+    source_path,
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+):
+    """
+    Extract the API structure of a module or package by parsing its sources.
+
+    The module is never imported, so no import-time code is executed.
+
+    Args:
+        module_name (str): The name of the module.
+        source_path (str): The path to the module file or package directory.
+        include_private (bool): Whether to include private functions and members (those starting with "_").
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to parse the files.
+
+    Returns:
+        dict: A dictionary representing the structure of the module's API.
+    """
+    source_files = list_source_files(module_name, source_path, include_private)
+    api_structure = {}
+    for structure in extract_api_from_files(
+        source_files,
+        root_modules=[module_name],
+        jobs=jobs,
+        include_private=include_private,
+        include_docstrings=include_docstrings,
+        disable_normalization=disable_normalization,
+    ):
+        api_structure.update(structure)
+    return api_structure
+
+
+def analyze_stdlib_statically(
+    include_private=False,
+    include_docstrings=True,
+    disable_normalization=False,
+    jobs=1,
+):
+    """
+    Analyze the Python standard library sources and extract its API structure.
+
+    Modules without Python sources (builtin and extension modules) are skipped.
+
+    Args:
+        include_private (bool): Whether to include private members in the API extraction.
+        include_docstrings (bool): Whether to include docstrings in the extracted API.
+        disable_normalization (bool): If True, normalization will be disabled.
+        jobs (int): The number of worker processes used to parse the files.
+
+    Returns:
+        dict: A dictionary where keys are standard library module names, and values are the
+        extracted API structures of those modules.
+    """
+    owners = []
+    source_files = []
+    root_modules = []
+    for module_name in list_stdlib_modules():
+        source_path = find_module_source(module_name)
+        if source_path is None:
+            continue
+        module_files = list_source_files(module_name, source_path, include_private)
+        owners.extend([module_name] * len(module_files))
+        source_files.extend(module_files)
+        root_modules.append(module_name)
+
+    stdlib_api = {}
+    structures = extract_api_from_files(
+        source_files,
+        root_modules=root_modules,
+        jobs=jobs,
+        include_private=include_private,
+        include_docstrings=include_docstrings,
+        disable_normalization=disable_normalization,
+    )
+    for module_name, structure in zip(owners, structures):
+        stdlib_api.setdefault(module_name, {}).update(structure)
+    return stdlib_api
+
+
+def extract_static_module_info(module_name, source_path=None, version=None):
+    """
+    Describe a module without importing it.
+
+    The version is read, by order of precedence, from the `version` argument, the
+    installed distribution metadata, or a literal `__version__` assignment in the
+    module sources.
+
+    Args:
+        module_name (str): The name of the module.
+        source_path (str, optional): The path to the module file or package directory.
+        version (str, optional): The version of the module, if already known.
+
+    Returns:
+        dict: The module information, following the format of `extract_module_info`.
+    """
+    if version is None:
+        try:
+            version = importlib.metadata.version(module_name)
+        except (importlib.metadata.PackageNotFoundError, ValueError):
+            version = None
+
+    if version is None and source_path is not None:
+        init_file = (
+            os.path.join(source_path, "__init__.py")
+            if os.path.isdir(source_path)
+            else source_path
+        )
+        try:
+            with open(init_file, "rb") as f:
+                tree = ast.parse(f.read())
+            for node in tree.body:
+                if (
+                    isinstance(node, ast.Assign)
+                    and any(
+                        isinstance(target, ast.Name) and target.id == "__version__"
+                        for target in node.targets
+                    )
+                    and isinstance(node.value, ast.Constant)
+                ):
+                    version = str(node.value.value)
+        except (OSError, SyntaxError, ValueError):
+            pass
+
+    return {
+        "ladar": {
+            "module_name": module_name,
+            "module_version": version or "unknown",
+            "date": datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+    }
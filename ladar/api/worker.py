@@ -0,0 +1,290 @@
+import atexit
+import json
+import logging
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import traceback
+
+# This module only depends on the standard library: it is imported by the
+# workers, in environments where the dependencies of ladar are not installed.
+
+logger = logging.getLogger(__name__)
+
+# Number of member records sent in a single frame
+BATCH_SIZE = 256
+
+HEADER = struct.Struct(">I")
+
+# Started by the interpreter of the environment in isolated mode (no current
+# directory nor PYTHONPATH in `sys.path`), the directory holding the `ladar`
+# package is appended to `sys.path`, after the environment's packages.
+BOOTSTRAP = (
+    "import sys; sys.path.append(sys.argv[1]); "
+    "from ladar.api.worker import serve; serve()"
+)
+
+_shim_dir = None
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker fails, times out or reports an error."""
+
+
+def write_frame(stream, message):
+    """
+    Write a message as a frame.
+
+    Args:
+        stream (io.BufferedIOBase): The binary stream to write to.
+        message (dict): The JSON serializable message.
+    """
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+    stream.write(HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def _read_exactly(stream, size):
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError("Truncated frame.")
+        data += chunk
+    return data
+
+
+def read_frame(stream):
+    """
+    Read a frame.
+
+    Args:
+        stream (io.BufferedIOBase): The binary stream to read from.
+
+    Returns:
+        dict or None: The message, or None at the end of the stream.
+
+    Raises:
+        EOFError: If the stream ends in the middle of a frame.
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        header += _read_exactly(stream, HEADER.size - len(header))
+    (size,) = HEADER.unpack(header)
+    return json.loads(_read_exactly(stream, size))
+
+
+def handle_request(request, output):
+    """
+    Extract the API of a module and send it as frames, in the worker.
+
+    Args:
+        request (dict): The request, with the `module` name and the extraction
+            `options` (see `ladar.api.extract.iter_api_members`).
+        output (io.BufferedIOBase): The stream the frames are written to.
+    """
+    import importlib
+
+    from ladar.api.extract import extract_module_info, iter_api_members
+
+    try:
+        module = importlib.import_module(request["module"])
+        write_frame(output, {"type": "info", **extract_module_info(request["module"])})
+        batch = []
+        count = 0
+        for record in iter_api_members(module, **request.get("options", {})):
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                write_frame(output, {"type": "records", "records": batch})
+                count += len(batch)
+                batch = []
+        if batch:
+            write_frame(output, {"type": "records", "records": batch})
+            count += len(batch)
+        write_frame(output, {"type": "done", "count": count})
+    except Exception as e:
+        write_frame(
+            output,
+            {
+                "type": "error",
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(),
+            },
+        )
+
+
+def serve():
+    """
+    Serve extraction requests read from stdin, in the worker.
+
+    The frames are written to the original stdout; anything printed by the
+    extracted modules, even from C extensions, is redirected to stderr.
+    """
+    output = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    while True:
+        request = read_frame(sys.stdin.buffer)
+        if request is None:
+            break
+        handle_request(request, output)
+    output.close()
+
+
+def get_shim_dir():
+    """
+    Return a directory holding only the `ladar` package, to be added to the
+    `sys.path` of the workers.
+
+    Adding the parent directory of `ladar` instead would expose every package
+    installed next to it (e.g., the site-packages of ladar) to the extracted
+    modules.
+
+    Returns:
+        str: The path to the directory.
+    """
+    global _shim_dir
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _shim_dir is None:
+        shim_dir = tempfile.mkdtemp(prefix="ladar-worker-")
+        try:
+            os.symlink(package_dir, os.path.join(shim_dir, "ladar"))
+        except (OSError, NotImplementedError):
+            # Symbolic links may not be allowed (e.g., on Windows)
+            shutil.rmtree(shim_dir, ignore_errors=True)
+            return os.path.dirname(package_dir)
+        atexit.register(shutil.rmtree, shim_dir, True)
+        _shim_dir = shim_dir
+    return _shim_dir
+
+
+class Worker:
+    """
+    An extraction worker, running in the interpreter of a virtual environment.
+
+    The extracted modules are imported in the worker only, without touching the
+    `sys.path` of the ladar process, so several workers can run concurrently for
+    different environments.
+
+    The worker reads requests on its stdin and answers on its stdout with
+    frames: a 4-byte big-endian length followed by a compact JSON message.
+    Requests are `{"module": ..., "options": {...}}`; the worker answers with an
+    `info` message, `records` messages (see `ladar.api.extract.iter_api_members`)
+    and a `done` message, or with an `error` message.
+
+    Args:
+        python_executable (str): The interpreter of the environment.
+        timeout (float, optional): The number of seconds after which the worker
+            is killed, for its whole lifetime.
+    """
+
+    def __init__(self, python_executable, timeout=None):
+        self.process = subprocess.Popen(
+            [python_executable, "-I", "-c", BOOTSTRAP, get_shim_dir()],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.timed_out = False
+        self.timer = None
+        if timeout is not None:
+            self.timer = threading.Timer(timeout, self._kill)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _kill(self):
+        self.timed_out = True
+        self.process.kill()
+
+    def _read(self):
+        try:
+            message = read_frame(self.process.stdout)
+        except EOFError:
+            message = None
+        if message is None:
+            if self.timed_out:
+                raise WorkerError("The extraction worker timed out.")
+            raise WorkerError(
+                f"The extraction worker exited unexpectedly ({self.process.wait()})."
+            )
+        return message
+
+    def extract(self, module_name, **options):
+        """
+        Extract the API of a module in the worker.
+
+        Args:
+            module_name (str): The name of the module to import and extract.
+            **options: The extraction options, see
+                `ladar.api.extract.iter_api_members`.
+
+        Yields:
+            dict: The module information first, then the records of the members.
+
+        Raises:
+            WorkerError: If the worker fails, times out or reports an error.
+        """
+        try:
+            write_frame(self.process.stdin, {"module": module_name, "options": options})
+        except (BrokenPipeError, OSError):
+            self._read()  # Raises the reason why the worker exited
+        while True:
+            message = self._read()
+            if message["type"] == "info":
+                yield {"ladar": message["ladar"]}
+            elif message["type"] == "records":
+                yield from message["records"]
+            elif message["type"] == "done":
+                return
+            else:
+                logger.debug(message.get("traceback", ""))
+                raise WorkerError(message.get("error", "Unknown worker error."))
+
+    def close(self):
+        """Stop the worker."""
+        if self.timer is not None:
+            self.timer.cancel()
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def extract_in_environment(python_executable, module_name, timeout=None, **options):
+    """
+    Extract the API of a module in a worker, and stream its records.
+
+    Args:
+        python_executable (str): The interpreter of the environment where the
+            module is installed.
+        module_name (str): The name of the module.
+        timeout (float, optional): The number of seconds after which the worker is
+            killed.
+        **options: The extraction options, see `ladar.api.extract.iter_api_members`.
+
+    Yields:
+        dict: The module information first, then the records of the members.
+
+    Raises:
+        WorkerError: If the worker fails, times out or reports an error.
+    """
+    with Worker(python_executable, timeout=timeout) as worker:
+        yield from worker.extract(module_name, **options)
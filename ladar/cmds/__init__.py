@@ -0,0 +1,36 @@
+# Manifest of the commands, read at startup to build the command line parser.
+# The module of a command is only imported when this command runs, so that the
+# dependencies of a command (e.g., scikit-learn for 'compare') do not slow down
+# the others, nor `ladar --help`. The descriptions must match the
+# `command_description` of the modules.
+COMMANDS = {
+    "cache": {
+        "module": "ladar.cmds.cache",
+        "description": "Inspect and prune the ladar extraction cache.",
+    },
+    "compare": {
+        "module": "ladar.cmds.compare",
+        "description": (
+            "Compare multiple API structures using a pipeline of algorithms or a "
+            "single algorithm."
+        ),
+    },
+    "extract": {
+        "module": "ladar.cmds.extract",
+        "description": (
+            "Extract and save the API structure of a Python module, including "
+            "standard library modules."
+        ),
+    },
+    "extract-batch": {
+        "module": "ladar.cmds.extract_batch",
+        "description": "Extract the API of many packages and versions in a single run.",
+    },
+    "normalize": {
+        "module": "ladar.cmds.normalize",
+        "description": (
+            "Normalize the content of a file by transforming names to lowercase and "
+            "removing underscores or camel cases."
+        ),
+    },
+}
@@ -0,0 +1,150 @@
+import argparse
+import logging
+from datetime import datetime
+
+import ladar.common.cache as cache
+import ladar.common.envpool as envpool
+import ladar.common.wheelhouse as wheelhouse
+
+logger = logging.getLogger(__name__)
+
+command_description = """
+Inspect and prune the ladar extraction cache.
+"""
+long_description = """
+The 'cache' command manages the persistent cache where the 'extract' command stores
+the API structures it extracts, the virtual environments it reuses, and the wheels
+they are installed from.
+
+Actions:
+  list   List the cached extractions and environments, least recently used first.
+  prune  Evict the least recently used extractions and environments until they fit
+         in --max-size and --env-max-size.
+  clear  Remove every cached extraction, every environment not in use, and the
+         cached wheels.
+"""
+
+
+def add_arguments(parser):
+    """
+    Adds the argument options to the cache command parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to which arguments are added.
+
+    Arguments:
+        action (str):
+            - The action to perform on the cache: 'list', 'prune' or 'clear'.
+
+        --cache-dir (str, optional):
+            - Base directory of the ladar cache. Defaults to the `LADAR_CACHE_DIR`
+              environment variable, or to `~/.cache/ladar`.
+
+        --max-size (int, optional):
+            - Size budget, in megabytes, used by the 'prune' action.
+
+        --env-max-size (int, optional):
+            - Disk budget of the pooled virtual environments, in megabytes, used by
+              the 'prune' action.
+    """
+    parser.formatter_class = argparse.RawTextHelpFormatter
+    parser.description = long_description
+
+    parser.add_argument(
+        "action",
+        choices=["list", "prune", "clear"],
+        help="The action to perform on the cache.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Base directory of the ladar cache. Defaults to the LADAR_CACHE_DIR "
+            "environment variable, or to ~/.cache/ladar."
+        ),
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help="Size budget, in megabytes, used by the 'prune' action. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--env-max-size",
+        type=int,
+        default=envpool.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help=(
+            "Disk budget of the pooled virtual environments, in megabytes, used by "
+            "the 'prune' action. (Default: %(default)s)"
+        ),
+    )
+
+
+def format_size(size):
+    """
+    Format a size in bytes in a human readable way.
+
+    Args:
+        size (int): The size in bytes.
+
+    Returns:
+        str: The formatted size.
+    """
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def main(args):
+    """
+    Main function for the 'cache' command.
+    """
+    if args.action == "list":
+        entries = cache.list_entries(cache_dir=args.cache_dir)
+        for entry in entries:
+            inputs = cache.describe_entry(entry)
+            last_used = datetime.fromtimestamp(entry["last_used"])
+            module = inputs.get("module", "?")
+            if inputs.get("version"):
+                module = f"{module}=={inputs['version']}"
+            print(
+                f"{entry['key'][:12]}  {last_used:%Y-%m-%d %H:%M:%S}  "
+                f"{format_size(entry['size']):>10}  {module}"
+            )
+        total_size = sum(entry["size"] for entry in entries)
+        print(f"{len(entries)} cached extractions, {format_size(total_size)}")
+
+        environments = envpool.list_entries(cache_dir=args.cache_dir)
+        for entry in environments:
+            last_used = datetime.fromtimestamp(entry["last_used"])
+            print(
+                f"{entry['key'][:12]}  {last_used:%Y-%m-%d %H:%M:%S}  "
+                f"{format_size(entry['size']):>10}  {' '.join(entry['requirements'])}"
+            )
+        total_size = sum(entry["size"] for entry in environments)
+        print(f"{len(environments)} pooled environments, {format_size(total_size)}")
+
+        count, total_size = wheelhouse.wheel_cache_size(cache_dir=args.cache_dir)
+        print(f"{count} cached wheels, {format_size(total_size)}")
+
+    elif args.action == "prune":
+        evicted = cache.prune(
+            max_size=args.max_size * 1024 * 1024, cache_dir=args.cache_dir
+        )
+        freed = sum(entry["size"] for entry in evicted)
+        print(f"Evicted {len(evicted)} cached extractions, {format_size(freed)} freed")
+
+        evicted = envpool.prune(
+            max_size=args.env_max_size * 1024 * 1024, cache_dir=args.cache_dir
+        )
+        freed = sum(entry["size"] for entry in evicted)
+        print(f"Evicted {len(evicted)} pooled environments, {format_size(freed)} freed")
+
+    elif args.action == "clear":
+        cache.clear(cache_dir=args.cache_dir)
+        print("Extraction cache cleared")
+        removed = envpool.clear(cache_dir=args.cache_dir)
+        print(f"Removed {len(removed)} pooled environments (those in use are kept)")
+        wheelhouse.clear_wheels(cache_dir=args.cache_dir)
+        print("Wheel cache cleared")
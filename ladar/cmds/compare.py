@@ -1,11 +1,13 @@
 import argparse
 import logging
+import sys
 import textwrap
 
-from ladar.api.compare import load_algorithms
-from ladar.api.pipeline import parse, run
+from ladar.api.compare import add_algorithm_arguments, discover_algorithms
+from ladar.api.extract import load_structure
+from ladar.api.pipeline import load_streamed, parse, parse_step, run, split_steps
 from ladar.common.helpers import build_algorithm_params
-from ladar.common.io import load, save
+from ladar.common.io import externalize_arrays, save
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,37 @@ The comparison results will be saved in the specified output file.
 """
 
 
-def add_arguments(parser):
+def find_pipeline_algorithms(argv):
+    """
+    Find the algorithms of the pipeline given in the command line, before it is
+    parsed.
+
+    Args:
+        argv (list): The command line arguments, without the program name.
+
+    Returns:
+        list: The names of the algorithms of the steps, in lowercase. The invalid
+        steps are skipped, they are reported when the pipeline is parsed.
+    """
+    pipeline = None
+    for index, arg in enumerate(argv):
+        if arg == "--pipeline" and index + 1 < len(argv):
+            pipeline = argv[index + 1]
+        elif arg.startswith("--pipeline="):
+            pipeline = arg.split("=", 1)[1]
+    if pipeline is None:
+        return []
+
+    names = []
+    for step_str in split_steps(pipeline):
+        try:
+            names.append(parse_step(step_str))
+        except ValueError:
+            continue
+    return names
+
+
+def add_arguments(parser, argv=None):
     """
     Adds argument options to the compare command parser. The parser is updated to handle two modes:
     - Pipeline mode, where a sequence of algorithms is executed in a defined order.
@@ -30,6 +62,8 @@ def add_arguments(parser):
 
     Args:
         parser (argparse.ArgumentParser): The parser to which arguments are added.
+        argv (list, optional): The command line arguments, without the program
+            name, where the pipeline is looked for. Defaults to `sys.argv[1:]`.
 
     Arguments:
         --structures (list):
@@ -38,30 +72,33 @@ def add_arguments(parser):
         --pipeline (str, optional):
             - A string specifying a pipeline of algorithms, formatted as: stage:Algorithm(params).
               Each step is executed sequentially with the output of one step passed as input to the next.
+              The params are optional keyword arguments of the algorithm (e.g., dbscan(eps=0.3)), and
+              take precedence over the algorithm-specific arguments. Third-party algorithms, registered
+              in the `ladar.algorithms` entry point group, are only configured this way.
 
         --output (str, required):
             - The path to the file where comparison results will be saved.
               Supported formats are 'toml', 'yaml', and 'json'.
 
         --<algorithm-specific-args> (optional):
-            - Individual parameters for algorithms, available only when running a single algorithm.
+            - Individual parameters of the algorithms of the pipeline, added by the `add_arguments`
+              of their classes, which are only imported when the pipeline uses them.
 
     """
     parser.formatter_class = argparse.RawTextHelpFormatter
     parser.description = long_description
 
-    available_algorithms = load_algorithms()
-
     algorithm_help = "Specify a pipeline of algorithms.\nAvailable algorithms:\n"
 
     # Ajouter chaque algorithme avec sa catégorie (standardisée via l'enum) dans l'aide
-    for algorithm_name, algorithm_info in available_algorithms.items():
-        algorithm_help += (
-            f"- {algorithm_name} (category: {algorithm_info['category']})\n"
-        )
+    for algorithm_name, algorithm_info in discover_algorithms().items():
+        category = algorithm_info["category"] or "third-party"
+        algorithm_help += f"- {algorithm_name} (category: {category})\n"
 
     algorithm_help += (
-        "Example: --pipeline normalize:minmaxscaler,extract:tfidf,cluster:dbscan"
+        "Example: --pipeline normalize:minmaxscaler,extract:tfidf,cluster:dbscan\n"
+        "Parameters can be given inline, e.g. cluster:dbscan(eps=0.3, min_samples=2)\n"
+        "The options of the algorithms of a pipeline are listed with --help after it."
     )
 
     # Add argument for structures (input files)
@@ -86,9 +123,10 @@ def add_arguments(parser):
         help="Specify the output file where the comparison results will be saved (e.g., 'output.yaml').",
     )
 
-    # Add algorithm-specific arguments dynamically
-    for algorithm_name, algorithm_info in available_algorithms.items():
-        algorithm_info["class"].add_arguments(parser)
+    # Add the arguments of the algorithms of the pipeline, importing only them
+    if argv is None:
+        argv = sys.argv[1:]
+    add_algorithm_arguments(parser, find_pipeline_algorithms(argv))
 
 
 def main(args):
@@ -107,14 +145,19 @@ def main(args):
     structures = []
     for structure_path in args.structures:
         try:
-            structure = load(structure_path)["structure"]
-            structures.append(structure)
+            # JSON Lines files are streamed, and only loaded by the steps
+            # needing the whole structures
+            structures.append(load_structure(structure_path))
         except Exception as e:
             logger.error(f"Failed to load structure {structure_path}: {e}")
             return
 
     if args.pipeline:
-        pipeline_steps = parse(args.pipeline)
+        try:
+            pipeline_steps = parse(args.pipeline)
+        except ValueError as e:
+            logger.error(f"Invalid pipeline: {e}")
+            return
         params = build_algorithm_params(args)
         comparison_results = run(pipeline_steps, structures, params)
     else:
@@ -122,7 +165,10 @@ def main(args):
         return
 
     try:
-        save(args.output, comparison_results)
+        # Sparse matrices (e.g., TF-IDF features) are saved next to the output
+        # A blocking step outputs its structures, streamed ones included
+        comparison_results = load_streamed(comparison_results)
+        save(args.output, externalize_arrays(args.output, comparison_results))
         print(f"Comparison results saved to {args.output}")
     except ValueError as e:
         logger.error(f"Error saving comparison results: {e}")
@@ -1,19 +1,42 @@
 import argparse
+import contextlib
 import importlib
+import itertools
 import logging
 import os
+import subprocess
 import sys
 import textwrap
+from datetime import datetime
 
+import ladar
+import ladar.common.cache as cache
+import ladar.common.envpool as envpool
 import ladar.common.venv as temp_env
 from ladar.api.extract import (
     analyze_stdlib,
+    api_from_records,
     extract_api_from_module,
     extract_module_info,
+    iter_api_members,
+    iter_api_records,
+    iter_stdlib_records,
+    load_api,
 )
-from ladar.common.io import save
+from ladar.api.incremental import extract_incrementally, get_fingerprints_path
+from ladar.api.static import (
+    analyze_stdlib_statically,
+    extract_api_statically,
+    extract_static_module_info,
+    find_local_source,
+    find_module_source,
+    iter_api_statically,
+)
+from ladar.api.worker import WorkerError, extract_in_environment
+from ladar.common.io import load, save
 from ladar.common.package import install_local_dependencies, load_local_module
 from ladar.common.ui import run_with_progress
+from ladar.common.wheelhouse import get_pip_options
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +53,7 @@ Otherwise, you can analyze individual standard library modules (e.g., 'asyncio',
 or third-party packages (e.g., 'requests', 'eventlet', 'flask').
 
 The extracted API includes functions, classes, other members, and optionally docstrings,
-and is saved to a specified output file (in TOML, YAML, or JSON format).
+and is saved to a specified output file (in TOML, YAML, JSON, or JSON Lines format).
 
 By default, only public members are included, but you can opt to include private members.
 Additionally, for older modules that require legacy support, a compatibility mode is available.
@@ -57,9 +80,25 @@ def add_arguments(parser):
             - Specify the version of a third-party module to install and analyze.
               Useful when specific versions are required for compatibility.
 
+        --versions (str, optional):
+            - Extract several versions of a third-party module, each in its own virtual
+              environment, into a single bundle indexed by version. Either comma-separated
+              versions (e.g., '0.30.0,0.31.0'), or an inclusive range 'FIRST..LAST' of
+              the releases available in the wheelhouse (e.g., '0.30..0.36').
+
+        --wheelhouse (str, optional):
+            - Local directory of wheels and source distributions searched by pip
+              (pip --find-links), and used to resolve the ranges of versions.
+
+        --offline (bool, optional):
+            - Never reach the package index (pip --no-index): packages are installed
+              from the wheelhouse and from the wheels cached by previous runs.
+
         --output (str, required):
             - Specify the output file where the extracted API will be saved.
-              Supported formats are 'toml', 'yaml', and 'json'.
+              Supported formats are 'toml', 'yaml', 'json', and 'jsonl'.
+              With 'jsonl', members are streamed to the file one record per line
+              as soon as they are extracted.
 
         --include-private (bool, optional):
             - Include private members (those starting with an underscore '_') in the API analysis.
@@ -72,6 +111,44 @@ def add_arguments(parser):
               of setuptools or distutils for installation.
 
         --disable-normalization (bool, optional): Disable the normalization of the extracted API.
+
+        --jobs (int, optional):
+            - Number of worker processes used to analyze the standard library when 'stdlib'
+              is passed as the module (each module is imported in an isolated worker),
+              or to parse the source files in static mode.
+              Defaults to 1 (sequential analysis in the current process).
+
+        --static (bool, optional):
+            - Parse the module sources instead of importing the module, so no import-time
+              code is executed. Only the members defined in the sources are reported.
+
+        --incremental (bool, optional):
+            - For local projects, only re-extract the modules whose sources changed since
+              the extraction saved in the output file. Source fingerprints are recorded
+              next to the output file. Implies the static mode.
+
+        --isolate (bool, optional):
+            - Import third-party modules in a worker process running the interpreter of
+              their virtual environment, so the packages of the environment never mix
+              with the ones of ladar. The worker streams the extracted members back.
+
+        --worker-timeout (float, optional):
+            - With --isolate, the number of seconds after which the worker is killed.
+
+        --cache-dir (str, optional):
+            - Base directory of the ladar cache. Defaults to the `LADAR_CACHE_DIR`
+              environment variable, or to `~/.cache/ladar`.
+
+        --cache-max-size (int, optional):
+            - Size budget of the extraction cache, in megabytes. The least recently
+              used entries are evicted when the cache grows beyond it.
+
+        --env-cache-max-size (int, optional):
+            - Disk budget of the pool of virtual environments, in megabytes. Third-party
+              modules are installed in pooled environments, keyed by the Python version
+              and the pinned requirements, and reused across runs.
+
+        --no-cache (bool, optional): Always extract the API, bypassing the extraction cache.
     """
     parser.formatter_class = argparse.RawTextHelpFormatter
     parser.description = long_description
@@ -108,13 +185,42 @@ def add_arguments(parser):
         ),
         default=None,
     )
+    parser.add_argument(
+        "--versions",
+        default=None,
+        help=(
+            "Extract several versions of a third-party module, each in its own "
+            "virtual environment, into a single version-indexed bundle. Either "
+            "comma-separated versions (e.g., '0.30.0,0.31.0'), or an inclusive range "
+            "'FIRST..LAST' of the releases available in the --wheelhouse "
+            "(e.g., '0.30..0.36'). Use --jobs to build the environments in parallel."
+        ),
+    )
+    parser.add_argument(
+        "--wheelhouse",
+        default=None,
+        help=(
+            "Local directory of wheels and source distributions, searched by pip "
+            "before the package index (pip --find-links). Used to resolve the "
+            "ranges of --versions."
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help=(
+            "Never reach the package index (pip --no-index): install packages from "
+            "the --wheelhouse and from the wheels cached by previous runs only."
+        ),
+    )
     parser.add_argument(
         "--output",
         required=True,
         help=(
             "Specify the output file where the extracted API will be saved. "
-            "Supported formats include 'toml', 'yaml', and 'json'. "
-            "The file extension should match the desired format."
+            "Supported formats include 'toml', 'yaml', 'json', and 'jsonl'. "
+            "The file extension should match the desired format. "
+            "JSON Lines output is streamed, one member per line."
         ),
     )
     parser.add_argument(
@@ -149,23 +255,109 @@ def add_arguments(parser):
         action="store_true",
         help="Disable normalization of the extracted API structure. By default, normalization is enabled.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes used to analyze the standard library when "
+            "'stdlib' is passed as the module (each module is imported in an isolated "
+            "worker process), to parse the source files in static mode, or to "
+            "extract the versions given with --versions. "
+            "Defaults to 1 (sequential analysis)."
+        ),
+    )
+    parser.add_argument(
+        "--static",
+        action="store_true",
+        help=(
+            "Parse the module sources with 'ast' instead of importing the module, so "
+            "no import-time code is executed. Only the members defined in the sources "
+            "are reported (inherited and re-exported members are not)."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "For local projects, only re-extract the modules whose sources changed "
+            "since the extraction saved in the output file, using the source "
+            "fingerprints recorded next to it. Implies --static."
+        ),
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help=(
+            "Import third-party modules in a worker process running the interpreter "
+            "of their virtual environment, instead of adding the environment to the "
+            "sys.path of ladar."
+        ),
+    )
+    parser.add_argument(
+        "--worker-timeout",
+        type=float,
+        default=None,
+        help=(
+            "With --isolate, kill the worker and fail the extraction after this "
+            "number of seconds. (Default: no timeout)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Base directory of the ladar cache. Defaults to the LADAR_CACHE_DIR "
+            "environment variable, or to ~/.cache/ladar."
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help=(
+            "Size budget of the extraction cache, in megabytes. The least recently "
+            "used entries are evicted beyond it. (Default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--env-cache-max-size",
+        type=int,
+        default=envpool.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help=(
+            "Disk budget of the pool of virtual environments reused across runs, "
+            "in megabytes. The least recently used environments are evicted beyond "
+            "it. (Default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Always extract the API, bypassing the extraction cache. By default, an "
+            "extraction whose inputs are unchanged is returned from the cache."
+        ),
+    )
 
 
-def ensure_legacy_compatibility_enabled(legacy_compatibility=False):
+def get_legacy_requirements(legacy_compatibility=False):
     """
-    Ensure that setuptools and distutils are installed in the virtual environment
-    for older packages that may need them.
+    Return the requirements needed by older packages: setuptools and distutils.
 
     Args:
         legacy_compatibility (bool): If True, enables the installation of older versions
                                      of setuptools and distutils for better retrocompatibility.
+
+    Returns:
+        list: The requirements to install in the virtual environment.
     """
     if not legacy_compatibility:
         logger.info(
             "Legacy compatibility mode is disabled. Skipping setuptools and distutils installation."
         )
-        return
+        return []
 
+    requirements = []
     try:
         import setuptools  # Check if setuptools is already installed
 
@@ -173,7 +365,7 @@ def ensure_legacy_compatibility_enabled(legacy_compatibility=False):
     except ImportError:
         # Install an older version of setuptools that includes distutils
         logger.info("Installing an older version of setuptools with distutils support.")
-        temp_env.install_package_in_virtualenv("setuptools==58.0.4")
+        requirements.append("setuptools==58.0.4")
 
     try:
         import distutils  # Check if distutils is available (for older packages)
@@ -182,19 +374,299 @@ def ensure_legacy_compatibility_enabled(legacy_compatibility=False):
     except ImportError:
         # Install a standalone version of distutils if needed
         logger.info("Installing distutils to support older packages.")
-        temp_env.install_package_in_virtualenv("distlib")
+        requirements.append("distlib")
+    return requirements
+
+
+def is_streaming(args):
+    """
+    Tell whether the extraction is streamed to a JSON Lines output file.
+
+    In streaming mode, members are written one record per line as soon as they
+    are extracted, instead of building the whole API structure in memory first.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+
+    Returns:
+        bool: True if the output file is a JSON Lines file.
+    """
+    return args.output.lower().endswith(".jsonl")
+
+
+def cached_extraction(args, fingerprint, extract):
+    """
+    Run an extraction through the persistent extraction cache.
+
+    The cache key covers the module name and version, the Python version, the
+    extraction flags, a fingerprint of the analyzed files, and the version of
+    ladar and of the cache format (`ladar.common.cache.CACHE_SCHEMA`), so that
+    upgrades changing the output never return older entries. When the cache is
+    disabled, or when no fingerprint is available, the extraction is simply run.
+
+    On a cache hit, the date of the structure is the date of the lookup, and the
+    date of the cached extraction is kept as `cached_date`.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+        fingerprint (str or None): A fingerprint of the analyzed files.
+        extract (callable): A function without arguments returning the API structure,
+            or its records in streaming mode.
+
+    Returns:
+        dict or iterable: The extracted (or cached) API structure, or its records in
+        streaming mode.
+    """
+    if args.no_cache or fingerprint is None:
+        return extract()
+
+    inputs = {
+        "ladar": ladar.__version__,
+        "schema": cache.CACHE_SCHEMA,
+        "module": args.module,
+        "version": args.version,
+        "python": cache.python_fingerprint(),
+        "include_private": args.include_private,
+        "exclude_docstrings": args.exclude_docstrings,
+        "disable_normalization": args.disable_normalization,
+        "static": args.static,
+        "fingerprint": fingerprint,
+    }
+    key = cache.make_key(**inputs)
+
+    api_structure = cache.get(key, cache_dir=args.cache_dir)
+    if api_structure is not None:
+        info = api_structure.get("ladar")
+        if isinstance(info, dict):
+            info["cached_date"] = info.get("date")
+            info["date"] = datetime.today().strftime("%Y-%m-%d %H:%M:%S")
+        return api_structure
+
+    api_structure = extract()
+    # Streamed extractions are never held in memory, so they are not cached
+    if isinstance(api_structure, dict):
+        cache.put(
+            key,
+            api_structure,
+            inputs=inputs,
+            cache_dir=args.cache_dir,
+            max_size=args.cache_max_size * 1024 * 1024,
+        )
+    return api_structure
+
+
+def extract_module(args, module_name, import_name=None, source_path=None):
+    """
+    Extract the module information and API structure of a module.
+
+    The module is imported and inspected, unless the static mode is enabled, in
+    which case its sources are parsed instead. Modules without Python sources
+    (builtin or extension modules) are always imported.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+        module_name (str): The name used to describe the module in the output.
+        import_name (str, optional): The name to import, defaults to `module_name`.
+        source_path (str, optional): The path to the module sources, located from
+            `import_name` when not provided.
+
+    Returns:
+        dict or iterable: The module information along with its API structure, or
+        the records of the extracted API in streaming mode (see `is_streaming`).
+    """
+    import_name = import_name or module_name
+    options = {
+        "include_private": args.include_private,
+        "include_docstrings": not args.exclude_docstrings,
+        "disable_normalization": args.disable_normalization,
+    }
+
+    if args.static:
+        source_path = source_path or find_module_source(import_name)
+        if source_path is not None:
+            version = None
+            if import_name in sys.stdlib_module_names:
+                version = f"Python stdlib - Python {sys.version}"
+            api_structure = extract_static_module_info(
+                module_name, source_path, version=version or args.version
+            )
+            if is_streaming(args):
+                return itertools.chain(
+                    [api_structure],
+                    iter_api_statically(
+                        import_name, source_path, jobs=args.jobs, **options
+                    ),
+                )
+            api_structure["structure"] = extract_api_statically(
+                import_name, source_path, jobs=args.jobs, **options
+            )
+            return api_structure
+        logger.info(f"No Python sources found for {import_name}, importing it.")
+
+    module = importlib.import_module(import_name)
+    api_structure = extract_module_info(module_name)
+    if is_streaming(args):
+        return itertools.chain([api_structure], iter_api_members(module, **options))
+    api_structure["structure"] = extract_api_from_module(
+        module,
+        include_private=args.include_private,
+        include_docstrings=not args.exclude_docstrings,
+        disable_normalization=args.disable_normalization,
+    )
+    return api_structure
+
+
+def incremental_extraction(args):
+    """
+    Extract the API of a local project, re-extracting only the modules whose
+    sources changed since the extraction saved in the output file.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+
+    Returns:
+        tuple: The module information along with its API structure, and the source
+        fingerprints to record next to the output file.
+    """
+    module_name, source_path = find_local_source(args.module)
+    fingerprints_path = get_fingerprints_path(args.output)
+
+    previous_structure = previous_fingerprints = None
+    if os.path.exists(args.output) and os.path.exists(fingerprints_path):
+        try:
+            previous_structure = load_api(args.output)["structure"]
+            previous_fingerprints = load(fingerprints_path)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring the previous extraction {args.output}: {e}")
+            previous_structure = previous_fingerprints = None
+    else:
+        logger.info(f"No previous extraction found in {args.output}.")
+
+    api_structure = extract_static_module_info(
+        args.module, source_path, version=args.version
+    )
+    api_structure["structure"], fingerprints, _ = extract_incrementally(
+        module_name,
+        source_path,
+        previous_structure=previous_structure,
+        previous_fingerprints=previous_fingerprints,
+        include_private=args.include_private,
+        include_docstrings=not args.exclude_docstrings,
+        disable_normalization=args.disable_normalization,
+        jobs=args.jobs,
+    )
+    return api_structure, fingerprints
+
+
+def extract_installed_module(args, env_dir):
+    """
+    Extract the API of a third-party module installed in a virtual environment.
+
+    With `args.isolate`, the module is imported in a worker running the
+    interpreter of the environment (see `ladar.api.worker`). Otherwise, the
+    environment's site-packages are added to `sys.path` and the module is
+    imported in the current process.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+        env_dir (str): The virtual environment where the module is installed.
+
+    Returns:
+        dict or iterable: The module information along with its API structure, or
+        the records of the extracted API in streaming mode (see `is_streaming`).
+    """
+    # Static extractions never import the module
+    if not args.isolate or args.static:
+        temp_env.add_venv_to_syspath(env_dir)
+        return cached_extraction(
+            args,
+            cache.distribution_fingerprint(args.module),
+            lambda: extract_module(args, args.module),
+        )
+
+    def extract():
+        records = extract_in_environment(
+            temp_env.get_python_executable(env_dir),
+            args.module,
+            timeout=args.worker_timeout,
+            include_private=args.include_private,
+            include_docstrings=not args.exclude_docstrings,
+            disable_normalization=args.disable_normalization,
+        )
+        return records if is_streaming(args) else api_from_records(records)
+
+    site_packages = temp_env.get_site_packages(env_dir)
+    return cached_extraction(
+        args, cache.distribution_fingerprint(args.module, path=[site_packages]), extract
+    )
+
+
+def save_extraction(args, api_structure, fingerprints=None):
+    """
+    Save an extracted API to the output file.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+        api_structure (dict or iterable): The extracted API, or its records.
+        fingerprints (dict, optional): The source fingerprints to record next to
+            the output file.
+
+    Returns:
+        bool: True if the API was saved.
+    """
+    if is_streaming(args) and isinstance(api_structure, dict):
+        api_structure = iter_api_records(api_structure, nested=args.module == "stdlib")
+
+    try:
+        save(args.output, api_structure)
+        if fingerprints is not None:
+            save(get_fingerprints_path(args.output), fingerprints)
+        print(f"API saved to {args.output}")
+        return True
+    except ValueError as e:
+        logger.error(f"Error saving file: {e}")
+        return False
 
 
 def main(args):
+    if args.versions:
+        # Imported here, the batch runner is only needed for version matrices
+        from ladar.cmds.extract_batch import extract_versions
+
+        return extract_versions(args)
+
+    fingerprints = None
+    if args.incremental and not os.path.exists(args.module):
+        logger.warning("--incremental only applies to local projects, ignoring it.")
+        args.incremental = False
+
     if args.module == "stdlib":
         logger.info("Analyzing the entire standard library (stdlib).")
-        api_structure = extract_module_info(args.module)
-        api_structure["structure"] = run_with_progress(
-            analyze_stdlib,
-            include_private=args.include_private,
-            description="Analyzing all standard library modules",
-            total_steps=100,
-        )
+
+        def extract():
+            api_structure = extract_module_info(args.module)
+            if is_streaming(args) and not args.static:
+                return itertools.chain(
+                    [api_structure],
+                    iter_stdlib_records(
+                        include_private=args.include_private,
+                        include_docstrings=not args.exclude_docstrings,
+                        disable_normalization=args.disable_normalization,
+                        jobs=args.jobs,
+                    ),
+                )
+            api_structure["structure"] = run_with_progress(
+                analyze_stdlib_statically if args.static else analyze_stdlib,
+                include_private=args.include_private,
+                include_docstrings=not args.exclude_docstrings,
+                disable_normalization=args.disable_normalization,
+                jobs=args.jobs,
+                description="Analyzing all standard library modules",
+                total_steps=100,
+            )
+            return api_structure
+
+        api_structure = cached_extraction(args, "stdlib", extract)
     else:
         try:
             if (
@@ -202,62 +674,69 @@ def main(args):
                 or args.module in sys.stdlib_module_names
             ):
                 logger.info(f"Analyzing stdlib module: {args.module}")
-                module = __import__(args.module)
-                api_structure = extract_module_info(args.module)
-                api_structure["structure"] = extract_api_from_module(
-                    module,
-                    include_private=args.include_private,
-                    include_docstrings=not args.exclude_docstrings,
-                    disable_normalization=args.disable_normalization,
+                api_structure = cached_extraction(
+                    args, "stdlib", lambda: extract_module(args, args.module)
                 )
             elif os.path.exists(args.module):
-                temp_env.create_persistent_virtual_env()
-                install_local_dependencies(os.path.dirname(args.module))
-                try:
+
+                def extract():
+                    if args.static:
+                        module_name, source_path = find_local_source(args.module)
+                        return extract_module(
+                            args,
+                            args.module,
+                            import_name=module_name,
+                            source_path=source_path,
+                        )
+
+                    temp_env.create_persistent_virtual_env()
+                    install_local_dependencies(os.path.dirname(args.module))
                     module_name = load_local_module(args.module)
-                    module = importlib.import_module(module_name)
-                    api_structure = extract_module_info(args.module)
-                    api_structure["structure"] = extract_api_from_module(
-                        module,
-                        include_private=args.include_private,
-                        include_docstrings=not args.exclude_docstrings,
-                        disable_normalization=args.disable_normalization,
-                    )
+                    return extract_module(args, args.module, import_name=module_name)
+
+                try:
+                    if args.incremental:
+                        api_structure, fingerprints = incremental_extraction(args)
+                    else:
+                        api_structure = cached_extraction(
+                            args, cache.source_fingerprint(args.module), extract
+                        )
                 except ImportError as e:
                     logger.error(f"Error loading local module from {args.module}: {e}")
                     return
             else:
-                temp_env.create_persistent_virtual_env()
-
-                ensure_legacy_compatibility_enabled(
-                    legacy_compatibility=args.enable_legacy_compatibility
-                )
-
                 if args.version:
                     module_with_version = f"{args.module}=={args.version}"
                 else:
                     module_with_version = args.module
-
-                run_with_progress(
-                    temp_env.install_package_in_virtualenv,
+                requirements = [
                     module_with_version,
-                    description=f"Installing {module_with_version}",
-                )
+                    *get_legacy_requirements(args.enable_legacy_compatibility),
+                ]
 
-                module = __import__(args.module)
-                api_structure = extract_module_info(args.module)
-                api_structure["structure"] = extract_api_from_module(
-                    module,
-                    include_private=args.include_private,
-                    include_docstrings=not args.exclude_docstrings,
-                    disable_normalization=args.disable_normalization,
-                )
-        except ImportError as e:
+                with contextlib.ExitStack() as stack:
+                    env_dir = run_with_progress(
+                        stack.enter_context,
+                        envpool.acquire(
+                            requirements,
+                            options=get_pip_options(args.wheelhouse, args.offline),
+                            cache_dir=args.cache_dir,
+                            max_size=args.env_cache_max_size * 1024 * 1024,
+                        ),
+                        description=f"Installing {module_with_version}",
+                    )
+                    api_structure = extract_installed_module(args, env_dir)
+                    # Streamed records are extracted while saving, so the
+                    # environment must still be held
+                    return save_extraction(args, api_structure)
+        except (ImportError, WorkerError) as e:
             logger.error(f"Error importing module {args.module}: {e}")
             return
+        except subprocess.CalledProcessError:
+            hint = " (not found in the wheelhouse nor in the wheel cache)"
+            logger.error(
+                f"Error installing {args.module}{hint if args.offline else ''}."
+            )
+            return
 
-    try:
-        save(args.output, api_structure)
-        print(f"API saved to {args.output}")
-    except ValueError as e:
-        logger.error(f"Error saving file: {e}")
+    return save_extraction(args, api_structure, fingerprints)
@@ -0,0 +1,451 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import ladar.cmds.extract as extract
+import ladar.common.envpool as envpool
+from ladar.api.batch import run_batch
+from ladar.api.worker import WorkerError
+from ladar.common.io import load, save
+from ladar.common.wheelhouse import get_pip_options, resolve_versions
+
+logger = logging.getLogger(__name__)
+
+command_name = "extract-batch"
+
+command_description = """
+Extract the API of many packages and versions in a single run.
+"""
+long_description = """
+The 'extract-batch' command extracts the API of every target listed in a spec file
+(in TOML, YAML, or JSON format), in a single invocation.
+
+Targets are extracted concurrently by a bounded pool of workers: environments are
+built and packages installed while other targets are extracted. Targets with the
+same requirements share a virtual environment, and environments are pooled to be
+reused by the next runs; with merge_environments, targets whose requirements are
+compatible share one too, so each package is installed once. Each
+target is extracted in a fresh process, and saved to its own output file. A
+summary with the status and the timings of each target is written at the end.
+
+Example of spec file:
+
+  jobs: 4
+  output_dir: apis
+  format: json
+  wheelhouse: /path/to/wheels  # optional, searched by pip before the index
+  offline: false  # optional, never reach the index, only the wheelhouse and cache
+  merge_environments: false  # optional, share environments between compatible targets
+  defaults:
+    exclude_docstrings: true
+  targets:
+    - requests==2.25.1
+    - module: eventlet
+      version: 0.36.0
+      requirements: ["dnspython<2.3"]
+      output: eventlet-0.36.0.yaml
+    - module: asyncio
+
+The keys of a target, and of the defaults, are the options of the 'extract'
+command (e.g. include_private, static, disable_normalization).
+"""
+
+
+def add_arguments(parser):
+    """
+    Adds the argument options to the extract-batch command parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to which arguments are added.
+
+    Arguments:
+        --spec (str, required):
+            - The spec file listing the targets to extract.
+
+        --jobs (int, optional):
+            - The number of concurrent workers. Overrides the `jobs` of the spec file.
+
+        --output-dir (str, optional):
+            - The directory of the output files. Overrides the `output_dir` of the
+              spec file.
+
+        --cache-dir (str, optional):
+            - Base directory of the ladar cache.
+
+        --env-cache-max-size (int, optional):
+            - Disk budget of the pool of virtual environments, in megabytes.
+
+        --offline (bool, optional):
+            - Never reach the package index. Overrides the `offline` of the spec file.
+
+        --merge-environments (bool, optional):
+            - Install targets with compatible requirements in a shared environment.
+              Overrides the `merge_environments` of the spec file.
+
+        --summary (str, optional):
+            - The file where the summary is saved. Defaults to `summary.json` in the
+              output directory.
+    """
+    parser.formatter_class = argparse.RawTextHelpFormatter
+    parser.description = long_description
+
+    parser.add_argument(
+        "--spec",
+        required=True,
+        help="The spec file (TOML, YAML, or JSON) listing the targets to extract.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help=(
+            "Number of concurrent workers, each building an environment or "
+            "extracting a target. Overrides the 'jobs' of the spec file. (Default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help=(
+            "Directory of the output files. Overrides the 'output_dir' of the spec "
+            "file. (Default: the current directory)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Base directory of the ladar cache, where extractions and virtual "
+            "environments are reused across runs. Defaults to the LADAR_CACHE_DIR "
+            "environment variable, or to ~/.cache/ladar."
+        ),
+    )
+    parser.add_argument(
+        "--env-cache-max-size",
+        type=int,
+        default=envpool.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help=(
+            "Disk budget of the pool of virtual environments, in megabytes. "
+            "(Default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help=(
+            "Never reach the package index (pip --no-index): install packages from "
+            "the wheelhouse and from the wheels cached by previous runs only."
+        ),
+    )
+    parser.add_argument(
+        "--merge-environments",
+        action="store_true",
+        help=(
+            "Install targets with compatible requirements in a shared environment, "
+            "with fewer pip commands. The environments then depend on the order of "
+            "the targets and on --jobs, so they are less often reused by the next "
+            "runs."
+        ),
+    )
+    parser.add_argument(
+        "--summary",
+        default=None,
+        help="File where the summary is saved. (Default: summary.json in the output directory)",
+    )
+
+
+def get_extract_parser():
+    """
+    Build the parser of the 'extract' command, used to validate the targets.
+
+    Returns:
+        argparse.ArgumentParser: The parser of the 'extract' command.
+    """
+    parser = argparse.ArgumentParser(prog="ladar extract")
+    extract.add_arguments(parser)
+    return parser
+
+
+def build_target(entry, defaults, output_dir, output_format):
+    """
+    Build a batch target from an entry of the spec file.
+
+    Args:
+        entry (str or dict): A requirement (e.g., 'requests==2.25.1') or a dict of
+            'extract' options with at least a `module`.
+        defaults (dict): The options applied to every target.
+        output_dir (str): The directory of the output files.
+        output_format (str): The extension of the output files.
+
+    Returns:
+        dict: The target, with its `name`, the `requirements` to install, its
+        `output` file and the `args` of the 'extract' command.
+
+    Raises:
+        ValueError: If the entry is invalid.
+    """
+    if isinstance(entry, str):
+        module, _, version = entry.partition("==")
+        entry = {"module": module.strip(), "version": version.strip() or None}
+    if not isinstance(entry, dict) or not entry.get("module"):
+        raise ValueError(f"Invalid target {entry!r}: a module is required.")
+
+    options = dict(defaults, **entry)
+    module = str(options.pop("module"))
+    version = options.pop("version", None)
+    version = str(version) if version is not None else None
+    extra_requirements = [str(r) for r in options.pop("requirements", None) or []]
+
+    name = f"{module}=={version}" if version else module
+    output = options.pop("output", None)
+    if output is None:
+        stem = os.path.basename(os.path.normpath(module))
+        output = f"{stem}-{version}" if version else stem
+        output = f"{output}.{output_format}"
+    output = os.path.join(output_dir, output)
+
+    argv = ["--module", module, "--output", output]
+    if version:
+        argv += ["--version", version]
+    for key, value in options.items():
+        flag = f"--{key.replace('_', '-')}"
+        if value is True:
+            argv.append(flag)
+        elif value not in (False, None):
+            argv += [flag, str(value)]
+
+    # Validate the options as the 'extract' command would
+    try:
+        args = get_extract_parser().parse_args(argv)
+    except SystemExit:
+        raise ValueError(f"Invalid options for target {name}: {entry!r}")
+
+    requirements = []
+    if (
+        module != "stdlib"
+        and module not in sys.builtin_module_names
+        and module not in sys.stdlib_module_names
+        and not os.path.exists(module)
+    ):
+        requirements = [
+            name,
+            *extra_requirements,
+            *extract.get_legacy_requirements(args.enable_legacy_compatibility),
+        ]
+
+    return {
+        "name": name,
+        "requirements": requirements,
+        "output": output,
+        "args": vars(args),
+    }
+
+
+def load_targets(spec, output_dir=None, cache_dir=None):
+    """
+    Load the targets of a spec file.
+
+    Args:
+        spec (dict): The content of the spec file.
+        output_dir (str, optional): Overrides the `output_dir` of the spec file.
+        cache_dir (str, optional): The base cache directory, unless the defaults of
+            the spec file set one.
+
+    Returns:
+        list: The targets, see `build_target`.
+
+    Raises:
+        ValueError: If the spec file is invalid.
+    """
+    entries = spec.get("targets")
+    if not entries:
+        raise ValueError("The spec file does not list any target.")
+
+    output_dir = output_dir or spec.get("output_dir", ".")
+    defaults = dict(spec.get("defaults", {}))
+    if cache_dir is not None:
+        defaults.setdefault("cache_dir", cache_dir)
+    targets = [
+        build_target(entry, defaults, output_dir, spec.get("format", "json"))
+        for entry in entries
+    ]
+
+    names = [target["name"] for target in targets]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicated targets: {', '.join(duplicates)}")
+    return targets
+
+
+def extract_target(target, env_dir):
+    """
+    Extract a target, in the process spawned for it by the batch runner.
+
+    Args:
+        target (dict): The target, see `build_target`.
+        env_dir (str or None): The environment where the requirements of the target
+            are installed, None when the target does not need one.
+
+    Returns:
+        bool: True if the API of the target was saved.
+    """
+    args = argparse.Namespace(**target["args"])
+    if env_dir is None:
+        return bool(extract.main(args))
+
+    try:
+        api_structure = extract.extract_installed_module(args, env_dir)
+    except (ImportError, WorkerError) as e:
+        logger.error(f"Error importing module {args.module}: {e}")
+        return False
+    return extract.save_extraction(args, api_structure)
+
+
+def main(args):
+    """
+    Main function for the 'extract-batch' command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments from the command line.
+    """
+    try:
+        spec = load(args.spec)
+        targets = load_targets(
+            spec, output_dir=args.output_dir, cache_dir=args.cache_dir
+        )
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading spec file {args.spec}: {e}")
+        return
+
+    jobs = args.jobs or spec.get("jobs", 1)
+    output_dir = args.output_dir or spec.get("output_dir", ".")
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = run_batch(
+        targets,
+        extract_target,
+        jobs=jobs,
+        pip_options=get_pip_options(
+            spec.get("wheelhouse"), args.offline or spec.get("offline", False)
+        ),
+        cache_dir=args.cache_dir,
+        max_size=args.env_cache_max_size * 1024 * 1024,
+        merge=args.merge_environments or spec.get("merge_environments", False),
+    )
+    total_time = time.perf_counter() - start
+
+    summary = {
+        "ladar": {
+            "spec": args.spec,
+            "jobs": jobs,
+            "date": datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_time": round(total_time, 3),
+        },
+        "targets": results,
+    }
+    summary_path = args.summary or os.path.join(output_dir, "summary.json")
+    save(summary_path, summary)
+
+    for result in results:
+        print(
+            f"{result['status']:<6} {result['name']:<40} "
+            f"{result['total_time']:>8.2f}s  {result['output']}"
+        )
+    failures = [result for result in results if result["status"] != "ok"]
+    print(
+        f"{len(results) - len(failures)}/{len(results)} targets extracted in "
+        f"{total_time:.2f}s, summary saved to {summary_path}"
+    )
+
+
+def extract_versions(args):
+    """
+    Extract several versions of a third-party module into a version-indexed bundle.
+
+    Each version is installed in its own virtual environment and extracted in its
+    own process, `args.jobs` versions at a time, see `ladar.api.batch.run_batch`.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments of the 'extract' command.
+
+    Returns:
+        bool: True if the bundle was saved.
+    """
+    if args.version:
+        logger.error("--version and --versions cannot be used together.")
+        return False
+    if extract.is_streaming(args):
+        logger.error("Version bundles cannot be saved in JSON Lines format.")
+        return False
+    if (
+        args.module == "stdlib"
+        or args.module in sys.builtin_module_names
+        or args.module in sys.stdlib_module_names
+        or os.path.exists(args.module)
+    ):
+        logger.error("--versions only applies to third-party modules.")
+        return False
+
+    try:
+        versions = resolve_versions(args.versions, args.module, args.wheelhouse)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error resolving the versions of {args.module}: {e}")
+        return False
+
+    with tempfile.TemporaryDirectory(prefix="ladar-versions-") as output_dir:
+        targets = []
+        for version in versions:
+            output = os.path.join(output_dir, f"{version}.json")
+            targets.append(
+                {
+                    "name": f"{args.module}=={version}",
+                    "requirements": [f"{args.module}=={version}"],
+                    "output": output,
+                    "args": dict(
+                        vars(args),
+                        version=version,
+                        versions=None,
+                        output=output,
+                        jobs=1,
+                    ),
+                }
+            )
+
+        results = run_batch(
+            targets,
+            extract_target,
+            jobs=args.jobs,
+            pip_options=get_pip_options(args.wheelhouse, args.offline),
+            cache_dir=args.cache_dir,
+            max_size=args.env_cache_max_size * 1024 * 1024,
+        )
+
+        bundle = {
+            "ladar": {
+                "module_name": args.module,
+                "versions": [],
+                "date": datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            "versions": {},
+        }
+        for version, result in zip(versions, results):
+            if result["status"] != "ok":
+                logger.error(f"Failed to extract {result['name']}.")
+                continue
+            bundle["ladar"]["versions"].append(version)
+            bundle["versions"][version] = load(result["output"])
+
+    try:
+        save(args.output, bundle)
+    except ValueError as e:
+        logger.error(f"Error saving file: {e}")
+        return False
+    print(
+        f"API of {len(bundle['versions'])}/{len(versions)} versions saved to {args.output}"
+    )
+    return True
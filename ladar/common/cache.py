@@ -0,0 +1,301 @@
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+from ladar.common.helpers import file_digest, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Default size budget of the extraction cache, in bytes
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+# Version of the format of the cached extractions: bump it whenever the
+# extraction output changes (e.g., new fields, new member UIDs), so that the
+# entries of the previous format are no longer returned
+CACHE_SCHEMA = 1
+
+
+def get_extraction_cache_dir(cache_dir=None):
+    """
+    Return the directory where extracted API structures are cached.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        str: The path to the extraction cache directory.
+    """
+    return get_cache_dir("extract", cache_dir=cache_dir)
+
+
+def make_key(**inputs):
+    """
+    Build a content-addressed cache key from the given inputs.
+
+    Args:
+        **inputs: JSON serializable values identifying an extraction.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the inputs.
+    """
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _provides(distribution, module_name):
+    top_level = distribution.read_text("top_level.txt")
+    if top_level:
+        return module_name in top_level.split()
+    return any(
+        file.parts[0] in (module_name, f"{module_name}.py")
+        for file in distribution.files or []
+    )
+
+
+def distribution_fingerprint(module_name, path=None):
+    """
+    Compute a fingerprint of the installed distribution providing a module.
+
+    The fingerprint is built from the file hashes recorded by the installer in the
+    distribution's RECORD metadata, so the module is never imported. Files
+    without a recorded hash are hashed from disk.
+
+    Args:
+        module_name (str): The top-level module name (e.g., 'yaml').
+        path (list, optional): The directories where distributions are searched,
+            instead of `sys.path` (e.g., the site-packages of a virtual environment).
+
+    Returns:
+        str or None: The fingerprint, or None if no installed distribution provides
+        the module.
+    """
+    if path is not None:
+        distributions = [
+            distribution
+            for distribution in importlib.metadata.distributions(path=path)
+            if _provides(distribution, module_name)
+        ]
+    else:
+        distribution_names = [module_name]
+        if hasattr(importlib.metadata, "packages_distributions"):
+            distribution_names = (
+                importlib.metadata.packages_distributions().get(module_name, [])
+                + distribution_names
+            )
+        distributions = []
+        for distribution_name in distribution_names:
+            try:
+                distributions.append(importlib.metadata.distribution(distribution_name))
+            except importlib.metadata.PackageNotFoundError:
+                continue
+
+    for distribution in distributions:
+        digest = hashlib.sha256()
+        digest.update(distribution.metadata["Name"].encode("utf-8"))
+        digest.update(distribution.version.encode("utf-8"))
+        for file in sorted(distribution.files or [], key=str):
+            if file.hash is not None:
+                file_hash = file.hash.value
+            else:
+                file_path = file.locate()
+                if not os.path.isfile(file_path):
+                    continue
+                file_hash = file_digest(file_path)
+            digest.update(f"{file}:{file_hash}".encode("utf-8"))
+        return digest.hexdigest()
+
+    return None
+
+
+def source_fingerprint(path):
+    """
+    Compute a fingerprint of the Python sources of a local module or project.
+
+    Args:
+        path (str): Path to a Python file or to a directory.
+
+    Returns:
+        str: The fingerprint of the sources.
+    """
+    if os.path.isfile(path):
+        return file_digest(path)
+
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for filename in sorted(files):
+            if filename.endswith(".py") or filename in (
+                "pyproject.toml",
+                "setup.py",
+                "setup.cfg",
+                "requirements.txt",
+            ):
+                file_path = os.path.join(root, filename)
+                relative_path = os.path.relpath(file_path, path)
+                digest.update(f"{relative_path}:{file_digest(file_path)}".encode())
+    return digest.hexdigest()
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(get_extraction_cache_dir(cache_dir), f"{key}.json")
+
+
+def get(key, cache_dir=None):
+    """
+    Retrieve a cached API structure.
+
+    A cache hit refreshes the entry's last use time, which drives the LRU
+    eviction done by `prune`.
+
+    Args:
+        key (str): The cache key (see `make_key`).
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        dict or None: The cached content, or None on a cache miss.
+    """
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring corrupted cache entry {path}: {e}")
+        return None
+
+    os.utime(path)
+    logger.info(f"Extraction cache hit: {key}")
+    return entry["content"]
+
+
+def put(key, content, inputs=None, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """
+    Store an API structure in the cache, then prune the cache to its size budget.
+
+    Args:
+        key (str): The cache key (see `make_key`).
+        content (dict): The API structure to store.
+        inputs (dict, optional): The inputs the key was built from, stored for
+            inspection purposes.
+        cache_dir (str, optional): An explicit base cache directory.
+        max_size (int): The size budget of the cache, in bytes.
+    """
+    path = _entry_path(key, cache_dir)
+    entry = {"inputs": inputs or {}, "content": content}
+
+    # Write to a temporary file first, so concurrent readers never see a
+    # partially written entry.
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    logger.info(f"Extraction stored in cache: {key}")
+    prune(max_size=max_size, cache_dir=cache_dir)
+
+
+def list_entries(cache_dir=None):
+    """
+    List the entries of the extraction cache, least recently used first.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        list: A list of dictionaries describing each entry (key, path, size, last_used).
+    """
+    directory = get_extraction_cache_dir(cache_dir)
+    entries = []
+    for filename in os.listdir(directory):
+        if not filename.endswith(".json"):
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue  # Removed by a concurrent prune
+        entries.append(
+            {
+                "key": filename[: -len(".json")],
+                "path": path,
+                "size": stat.st_size,
+                "last_used": stat.st_mtime,
+            }
+        )
+    return sorted(entries, key=lambda entry: entry["last_used"])
+
+
+def describe_entry(entry):
+    """
+    Read the inputs an entry was built from.
+
+    Args:
+        entry (dict): An entry returned by `list_entries`.
+
+    Returns:
+        dict: The inputs of the entry, empty if they can't be read.
+    """
+    try:
+        with open(entry["path"], "r", encoding="utf-8") as f:
+            return json.load(f).get("inputs", {})
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def prune(max_size=DEFAULT_MAX_SIZE, cache_dir=None):
+    """
+    Evict the least recently used entries until the cache fits its size budget.
+
+    Args:
+        max_size (int): The size budget of the cache, in bytes.
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        list: The evicted entries.
+    """
+    entries = list_entries(cache_dir)
+    total_size = sum(entry["size"] for entry in entries)
+    evicted = []
+
+    for entry in entries:
+        if total_size <= max_size:
+            break
+        try:
+            os.unlink(entry["path"])
+        except FileNotFoundError:
+            pass
+        total_size -= entry["size"]
+        evicted.append(entry)
+        logger.debug(f"Evicted cache entry {entry['key']}")
+
+    return evicted
+
+
+def clear(cache_dir=None):
+    """
+    Remove every entry of the extraction cache.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+    """
+    shutil.rmtree(get_extraction_cache_dir(cache_dir), ignore_errors=True)
+
+
+def python_fingerprint():
+    """
+    Identify the running interpreter, whose version shapes stdlib extractions.
+
+    Returns:
+        str: A string identifying the Python implementation and version.
+    """
+    return f"{sys.implementation.name}-{sys.version}"
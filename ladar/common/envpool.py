@@ -0,0 +1,295 @@
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+
+import ladar.common.venv as temp_env
+from ladar.common.cache import make_key, python_fingerprint
+from ladar.common.helpers import get_cache_dir
+from ladar.common.wheelhouse import get_key_options, pin_wheels, prepare_wheels
+
+try:
+    import fcntl
+except ImportError:  # Windows, environments are not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Default disk budget of the environment pool, in bytes
+DEFAULT_MAX_SIZE = 2 * 1024 * 1024 * 1024
+
+# Written in an environment once its requirements are installed
+READY_MARKER = "ladar-ready.json"
+
+
+def get_env_pool_dir(cache_dir=None):
+    """
+    Return the directory of the pooled virtual environments.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        str: The path to the environment pool directory.
+    """
+    return get_cache_dir("envs", cache_dir=cache_dir)
+
+
+def make_env_key(requirements, options=None):
+    """
+    Build the key of the environment providing a requirement set.
+
+    Args:
+        requirements (list): The requirements installed in the environment.
+        options (list, optional): The extra `pip install` options.
+
+    Returns:
+        str: The key of the environment.
+    """
+    return make_key(
+        python=python_fingerprint(),
+        executable=sys.executable,
+        requirements=sorted(requirements),
+        options=get_key_options(options),
+    )[:32]
+
+
+def is_pinned(requirements):
+    """
+    Tell whether a requirement set always resolves to the same packages.
+
+    Args:
+        requirements (list): The requirements.
+
+    Returns:
+        bool: True if every requirement is pinned to an exact version.
+    """
+    return all("==" in r and "*" not in r for r in requirements)
+
+
+def _lock(lock_file, *operations):
+    if fcntl is None:
+        return
+    flags = 0
+    for operation in operations:
+        flags |= getattr(fcntl, operation)
+    fcntl.flock(lock_file.fileno(), flags)
+
+
+def _read_marker(env_dir):
+    try:
+        with open(os.path.join(env_dir, READY_MARKER), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _directory_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                size += os.lstat(os.path.join(root, filename)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def _build(env_dir, requirements, options, cache_dir=None, wheels=None):
+    """Build an environment from scratch, then mark it as ready."""
+    shutil.rmtree(env_dir, ignore_errors=True)
+    timings = {}
+    start = time.perf_counter()
+    try:
+        temp_env.create_virtual_env(env_dir)
+        timings["create"] = time.perf_counter() - start
+        if wheels is None:
+            wheels = prepare_wheels(requirements, options=options, cache_dir=cache_dir)
+        timings["resolve"] = time.perf_counter() - start - timings["create"]
+        # The wheels are the complete resolved set: nothing to look up
+        temp_env.install_packages_in_virtualenv(
+            wheels, env_dir=env_dir, options=["--no-index", "--no-deps"]
+        )
+        timings["install"] = time.perf_counter() - start - sum(timings.values())
+    except BaseException:
+        shutil.rmtree(env_dir, ignore_errors=True)
+        raise
+
+    logger.info(
+        f"Built environment for {requirements} in {sum(timings.values()):.2f}s "
+        + "("
+        + ", ".join(f"{phase} {duration:.2f}s" for phase, duration in timings.items())
+        + ")."
+    )
+    marker = {
+        "requirements": list(requirements),
+        "options": options or [],
+        "python": python_fingerprint(),
+        "created": time.time(),
+        "timings": {phase: round(duration, 3) for phase, duration in timings.items()},
+    }
+    marker["size"] = _directory_size(env_dir)
+    with open(os.path.join(env_dir, READY_MARKER), "w", encoding="utf-8") as f:
+        json.dump(marker, f)
+
+
+@contextmanager
+def acquire(requirements, options=None, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """
+    Provide a pooled virtual environment where the requirements are installed.
+
+    Environments are keyed by the Python interpreter and the requirement set,
+    and reused across runs. The environment is built under an exclusive file
+    lock the first time, then held under a shared lock while in use, so that
+    concurrent processes can share it and it is never evicted while in use.
+    After an environment is built, the pool is pruned to its disk budget.
+
+    The requirements are installed from the wheel cache of
+    `ladar.common.wheelhouse`, where they are resolved once, so rebuilding an
+    evicted environment does not need the package index.
+
+    Requirement sets that are not pinned (e.g., 'requests') resolve to newer
+    versions over time: they are resolved on every run, without recording the
+    result (see `ladar.common.wheelhouse.prepare_wheels`), which also feeds the
+    wheel cache for the offline runs, and their environment is the one of the
+    pinned set of the resolved wheels.
+
+    Args:
+        requirements (list): The requirements to install (e.g., ['requests==2.25.1']).
+        options (list, optional): Extra `pip` options, see
+            `ladar.common.wheelhouse.get_pip_options`.
+        cache_dir (str, optional): An explicit base cache directory.
+        max_size (int): The disk budget of the pool, in bytes.
+
+    Yields:
+        str: The path to the virtual environment directory.
+
+    Raises:
+        subprocess.CalledProcessError: If the requirements cannot be installed.
+    """
+    wheels = None
+    if not is_pinned(requirements):
+        wheels = prepare_wheels(
+            requirements, options=options, cache_dir=cache_dir, record=False
+        )
+        requirements = pin_wheels(wheels)
+        logger.debug(f"Requirements resolved to {requirements}")
+
+    pool_dir = get_env_pool_dir(cache_dir)
+    key = make_env_key(requirements, options)
+    env_dir = os.path.join(pool_dir, key)
+
+    with open(os.path.join(pool_dir, f"{key}.lock"), "a+") as lock_file:
+        _lock(lock_file, "LOCK_SH")
+        built = False
+        if _read_marker(env_dir) is None:
+            # Upgrading the lock is not atomic: check again once it is exclusive
+            _lock(lock_file, "LOCK_EX")
+            if _read_marker(env_dir) is None:
+                logger.info(f"Building pooled environment {key} for {requirements}.")
+                _build(
+                    env_dir, requirements, options, cache_dir=cache_dir, wheels=wheels
+                )
+                built = True
+            _lock(lock_file, "LOCK_SH")
+        else:
+            logger.info(f"Reusing pooled environment {key} for {requirements}.")
+
+        # The marker's modification time records the last use of the environment
+        os.utime(os.path.join(env_dir, READY_MARKER))
+        try:
+            if built:
+                prune(max_size=max_size, cache_dir=cache_dir)
+            yield env_dir
+        finally:
+            _lock(lock_file, "LOCK_UN")
+
+
+def list_entries(cache_dir=None):
+    """
+    List the environments of the pool, least recently used first.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        list: A list of dictionaries describing each environment (key, path, size,
+        last_used, requirements, and the timings of the phases of its build).
+    """
+    pool_dir = get_env_pool_dir(cache_dir)
+    entries = []
+    for key in os.listdir(pool_dir):
+        path = os.path.join(pool_dir, key)
+        marker = _read_marker(path) if os.path.isdir(path) else None
+        if marker is None:
+            continue
+        try:
+            last_used = os.stat(os.path.join(path, READY_MARKER)).st_mtime
+        except FileNotFoundError:
+            continue  # Evicted by a concurrent prune
+        entries.append(
+            {
+                "key": key,
+                "path": path,
+                "size": marker.get("size", 0),
+                "last_used": last_used,
+                "requirements": marker.get("requirements", []),
+                "timings": marker.get("timings", {}),
+            }
+        )
+    return sorted(entries, key=lambda entry: entry["last_used"])
+
+
+def prune(max_size=DEFAULT_MAX_SIZE, cache_dir=None):
+    """
+    Evict the least recently used environments until the pool fits its budget.
+
+    Environments in use by any process are skipped.
+
+    Args:
+        max_size (int): The disk budget of the pool, in bytes.
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        list: The evicted environments.
+    """
+    entries = list_entries(cache_dir)
+    total_size = sum(entry["size"] for entry in entries)
+    evicted = []
+
+    for entry in entries:
+        if total_size <= max_size:
+            break
+        with open(f"{entry['path']}.lock", "a+") as lock_file:
+            try:
+                _lock(lock_file, "LOCK_EX", "LOCK_NB")
+            except BlockingIOError:
+                logger.debug(f"Pooled environment {entry['key']} in use, not evicted")
+                continue
+            # Remove the marker first, so a half-removed environment is rebuilt
+            try:
+                os.unlink(os.path.join(entry["path"], READY_MARKER))
+            except FileNotFoundError:
+                continue
+            shutil.rmtree(entry["path"], ignore_errors=True)
+        total_size -= entry["size"]
+        evicted.append(entry)
+        logger.debug(f"Evicted pooled environment {entry['key']}")
+
+    return evicted
+
+
+def clear(cache_dir=None):
+    """
+    Remove every environment of the pool that is not in use.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        list: The removed environments.
+    """
+    return prune(max_size=-1, cache_dir=cache_dir)
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import os
 
@@ -13,6 +14,52 @@ def is_verbose(level="INFO"):
     return logger.isEnabledFor(level_value)
 
 
+def get_cache_dir(*parts, cache_dir=None):
+    """
+    Return the path of a ladar cache directory, creating it if needed.
+
+    The base directory is, by order of precedence, the `cache_dir` argument,
+    the `LADAR_CACHE_DIR` environment variable, `$XDG_CACHE_HOME/ladar` and
+    finally `~/.cache/ladar`.
+
+    Args:
+        *parts (str): Sub directories to append to the base cache directory.
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        str: The path to the cache directory.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get("LADAR_CACHE_DIR")
+    if cache_dir is None:
+        xdg_cache_home = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        )
+        cache_dir = os.path.join(xdg_cache_home, "ladar")
+
+    path = os.path.join(cache_dir, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_digest(path, algorithm="sha256"):
+    """
+    Compute the hexadecimal digest of a file content.
+
+    Args:
+        path (str): Path to the file to hash.
+        algorithm (str): Name of the hashlib algorithm to use.
+
+    Returns:
+        str: The hexadecimal digest of the file.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def discover_modules(directory):
     """
     Discover all Python modules in the given directory.
@@ -1,5 +1,6 @@
 import json
 import logging
+import os
 import xml.etree.ElementTree as ET
 
 import toml
@@ -37,6 +38,30 @@ def save_json(filename, content):
         json.dump(content, f, indent=4)
 
 
+def save_jsonl(filename, content):
+    """
+    Save an iterable of records in the JSON Lines format, one record per line.
+
+    Records are written as they are produced, so `content` can be a generator
+    and the records never need to be held in memory all at once.
+    """
+    with open(filename, "w", encoding="utf-8") as f:
+        for record in content:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+
+
+def save_npz(filename, content):
+    """
+    Save a sparse matrix in the compressed NumPy format of SciPy.
+
+    Only the non-zero values are stored, with their indices.
+    """
+    import scipy.sparse
+
+    scipy.sparse.save_npz(filename, scipy.sparse.csr_matrix(content), compressed=True)
+
+
 def save_xml(filename, content):
     tree = ET.ElementTree(content)
     tree.write(filename, encoding="utf-8", xml_declaration=True)
@@ -55,6 +80,8 @@ def save_file(filename, content):
         "yaml": save_yaml,
         "yml": save_yaml,  # Alias for yaml
         "json": save_json,
+        "jsonl": save_jsonl,
+        "npz": save_npz,
         "xml": save_xml,
     }
 
@@ -70,15 +97,101 @@ def save(filename, content):
     save_file(filename, content)
 
 
+def is_sparse(value):
+    """
+    Tell whether a value is a SciPy sparse matrix, without importing SciPy.
+
+    Args:
+        value: Any value.
+
+    Returns:
+        bool: True for sparse matrices and arrays.
+    """
+    return hasattr(value, "tocsr") and hasattr(value, "nnz")
+
+
+def externalize_arrays(filename, content):
+    """
+    Prepare results holding arrays to be saved in a text format.
+
+    Sparse matrices are saved next to the file, in the compact `.npz` format (see
+    `save_npz`), and replaced by a reference to their file: a dense copy could be
+    many times larger than the matrix itself. The other arrays (e.g., NumPy
+    arrays) are converted to lists.
+
+    Args:
+        filename (str): The file where the results are going to be saved. A matrix
+            found under the key `features` is saved to `<filename stem>.features.npz`.
+        content (dict or list): The results.
+
+    Returns:
+        dict or list: A copy of the results, without arrays.
+    """
+    root = os.path.splitext(filename)[0]
+
+    def convert(value, key):
+        if is_sparse(value):
+            path = f"{root}.{key}.npz"
+            save_npz(path, value)
+            return {
+                "format": "npz",
+                "path": os.path.basename(path),
+                "shape": list(value.shape),
+                "nnz": int(value.nnz),
+            }
+        if isinstance(value, dict):
+            return {
+                name: convert(item, f"{key}.{name}" if key else str(name))
+                for name, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [
+                convert(item, f"{key}.{index}" if key else str(index))
+                for index, item in enumerate(value)
+            ]
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        return value
+
+    return convert(content, "")
+
+
+def iter_jsonl(file_path):
+    """
+    Lazily load the records of a JSON Lines file, one line at a time.
+
+    Args:
+        file_path (str): The path to the input file.
+
+    Yields:
+        dict or list: The record parsed from each non-empty line.
+
+    Raises:
+        ValueError: If a line can't be parsed.
+    """
+    logger.info(f"Streaming JSON Lines file: {file_path}")
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"Error parsing {file_path}:{line_number}: {e}")
+                raise ValueError(f"Error parsing {file_path}:{line_number}: {e}")
+
+
 def load(file_path):
     """
-    Load content from a file (YAML, TOML, or JSON) based on its extension.
+    Load content from a file (YAML, TOML, JSON, JSON Lines or NPZ) based on its
+    extension.
 
     Args:
         file_path (str): The path to the input file.
 
     Returns:
-        dict or list: Parsed content from the file.
+        dict or list: Parsed content from the file, or a CSR sparse matrix for NPZ
+        files.
 
     Raises:
         ValueError: If the file format is unsupported or if an error occurs while parsing.
@@ -101,6 +214,15 @@ def load(file_path):
                 logger.info(f"Loading JSON file: {file_path}")
                 return json.load(file)
 
+        elif extension == "jsonl":
+            return list(iter_jsonl(file_path))
+
+        elif extension == "npz":
+            import scipy.sparse
+
+            logger.info(f"Loading NPZ file: {file_path}")
+            return scipy.sparse.load_npz(file_path).tocsr()
+
         else:
             raise ValueError(f"Unsupported file format: {extension}")
 
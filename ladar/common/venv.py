@@ -1,3 +1,5 @@
+import functools
+import importlib.metadata
 import logging
 import os
 import shutil
@@ -13,6 +15,35 @@ logger = logging.getLogger(__name__)
 # Global variable to store the temporary virtual environment directory path
 _temp_dir = None
 
+# First pip version able to install packages in another environment (--python)
+MIN_SHARED_PIP_VERSION = (22, 3)
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_pip():
+    """
+    Returns the `pip` command of ladar's interpreter, if it can drive other
+    environments.
+
+    Bootstrapping pip in each new virtual environment (ensurepip) takes several
+    seconds, whereas an environment without pip is created in milliseconds. When
+    the pip of ladar's interpreter supports the `--python` option, environments
+    are created without pip, and this single pip installs packages in all of them.
+
+    Returns:
+        list or None: The command running the shared pip, or None if environments
+        need their own pip.
+    """
+    try:
+        version = importlib.metadata.version("pip")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+    release = tuple(int(part) for part in version.split(".")[:2] if part.isdigit())
+    if release < MIN_SHARED_PIP_VERSION:
+        logger.debug(f"pip {version} cannot drive other environments.")
+        return None
+    return [sys.executable, "-m", "pip"]
+
 
 def create_persistent_virtual_env():
     """
@@ -35,13 +66,72 @@ def create_persistent_virtual_env():
     global _temp_dir
     if _temp_dir is None:
         _temp_dir = tempfile.mkdtemp()  # Create a temporary directory for the venv
-        venv.create(_temp_dir, with_pip=True)  # Create the virtual environment
+        # Create the virtual environment, with its own pip only when needed
+        venv.create(_temp_dir, with_pip=get_shared_pip() is None)
         logger.info(f"Persistent virtual environment created in {_temp_dir}.")
         # Add the venv's site-packages to sys.path
         add_venv_to_syspath(_temp_dir)
     return _temp_dir
 
 
+def create_virtual_env(env_dir=None):
+    """
+    Creates a virtual environment, independently of the persistent one.
+
+    Several environments can be created this way, for instance to install
+    different versions of a package side by side. The environments do not have
+    their own pip when the shared one can be used, see `get_shared_pip`.
+
+    Args:
+        env_dir (str, optional): The directory of the virtual environment. A
+            temporary directory is created when not provided.
+
+    Returns:
+        str: The path to the virtual environment directory.
+    """
+    env_dir = env_dir or tempfile.mkdtemp(prefix="ladar-env-")
+    venv.create(env_dir, with_pip=get_shared_pip() is None)
+    logger.info(f"Virtual environment created in {env_dir}.")
+    return env_dir
+
+
+def get_python_executable(env_dir):
+    """
+    Returns the path to the Python executable of a virtual environment.
+
+    Args:
+        env_dir (str): The path to the virtual environment directory.
+
+    Returns:
+        str: The path to the Python executable.
+    """
+    if os.name != "nt":
+        return os.path.join(env_dir, "bin", "python")
+    return os.path.join(env_dir, "Scripts", "python.exe")
+
+
+def get_site_packages(env_dir):
+    """
+    Returns the path to the site-packages directory of a virtual environment.
+
+    Args:
+        env_dir (str): The path to the virtual environment directory.
+
+    Returns:
+        str: The path to the site-packages directory.
+    """
+    if os.name == "nt":
+        # Windows case
+        return os.path.join(env_dir, "Lib", "site-packages")
+    # Linux/macOS case
+    return os.path.join(
+        env_dir,
+        "lib",
+        f"python{sys.version_info.major}.{sys.version_info.minor}",
+        "site-packages",
+    )
+
+
 def add_venv_to_syspath(env_dir):
     """
     Adds the virtual environment's site-packages to `sys.path`.
@@ -60,24 +150,14 @@ def add_venv_to_syspath(env_dir):
     Raises:
         RuntimeError: If the path to site-packages cannot be determined.
     """
-    if os.name == "nt":
-        # Windows case
-        site_packages = os.path.join(env_dir, "Lib", "site-packages")
-    else:
-        # Linux/macOS case
-        site_packages = os.path.join(
-            env_dir,
-            "lib",
-            f"python{sys.version_info.major}.{sys.version_info.minor}",
-            "site-packages",
-        )
+    site_packages = get_site_packages(env_dir)
 
     # Insert site-packages at the beginning of sys.path
     sys.path.insert(0, site_packages)
     logger.info(f"Added {site_packages} to sys.path")
 
 
-def install_package_in_virtualenv(package):
+def install_package_in_virtualenv(package, env_dir=None, options=None):
     """
     Installs a package in the persistent virtual environment using `pip`.
 
@@ -89,46 +169,79 @@ def install_package_in_virtualenv(package):
 
     Args:
         package (str): The name of the package to install (e.g., 'requests').
+        env_dir (str, optional): The virtual environment to install the package in.
+            Defaults to the persistent virtual environment.
+        options (list, optional): Extra options passed to `pip install`.
+
+    Raises:
+        RuntimeError: If the virtual environment has not been created yet.
+        subprocess.CalledProcessError: If the pip installation command fails.
+    """
+    install_packages_in_virtualenv([package], env_dir=env_dir, options=options)
+
+
+def install_packages_in_virtualenv(packages, env_dir=None, options=None):
+    """
+    Installs several packages in a virtual environment with a single `pip` command.
+
+    Installing the packages together lets pip resolve their dependencies at once,
+    which is faster than installing them one after the other.
+
+    Args:
+        packages (list): The requirements to install (e.g., ['requests==2.25.1']).
+        env_dir (str, optional): The virtual environment to install the packages in.
+            Defaults to the persistent virtual environment.
+        options (list, optional): Extra options passed to `pip install`
+            (e.g., ['--find-links', '/path/to/wheelhouse']).
 
     Raises:
         RuntimeError: If the virtual environment has not been created yet.
         subprocess.CalledProcessError: If the pip installation command fails.
     """
     global _temp_dir
-    if _temp_dir is None:
+    env_dir = env_dir or _temp_dir
+    if env_dir is None:
         raise RuntimeError("The virtual environment has not been created yet.")
 
     # Determine the path to the Python executable inside the virtual environment
-    if os.name != "nt":
-        python_executable = os.path.join(_temp_dir, "bin", "python")
+    python_executable = get_python_executable(env_dir)
+    shared_pip = get_shared_pip()
+    if shared_pip is not None:
+        pip = [*shared_pip, "--python", python_executable]
     else:
-        python_executable = os.path.join(_temp_dir, "Scripts", "python.exe")
+        pip = [python_executable, "-m", "pip"]
+    command = [*pip, "install", *(options or []), *packages]
+    run_pip(command, ", ".join(packages))
 
-    try:
-        # Run pip install command
-        command = [python_executable, "-m", "pip", "install", package]
-
-        if is_verbose("DEBUG"):
-            # Show detailed pip logs if debug mode is enabled
-            subprocess.check_call(command)
-        else:
-            # Capture the output if not in debug mode
-            process = subprocess.Popen(
-                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-            )
-            stdout, stderr = process.communicate()
-
-            if process.returncode == 0:
-                logger.info(
-                    f"{package} successfully installed in the virtual environment."
-                )
-            else:
-                logger.error(f"Failed to install {package} in the virtual environment.")
-                logger.error(stderr)
-                raise subprocess.CalledProcessError(process.returncode, command)
-
-    except subprocess.CalledProcessError:
-        raise
+
+def run_pip(command, description):
+    """
+    Runs a `pip` command, showing its output in debug mode only.
+
+    Args:
+        command (list): The command to run (e.g., [python, '-m', 'pip', 'install', ...]).
+        description (str): The packages handled by the command, used in the logs.
+
+    Raises:
+        subprocess.CalledProcessError: If the pip command fails.
+    """
+    if is_verbose("DEBUG"):
+        # Show detailed pip logs if debug mode is enabled
+        subprocess.check_call(command)
+        return
+
+    # Capture the output if not in debug mode
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    stdout, stderr = process.communicate()
+
+    if process.returncode == 0:
+        logger.info(f"{description} successfully handled by pip.")
+    else:
+        logger.error(f"pip failed to handle {description}.")
+        logger.error(stderr)
+        raise subprocess.CalledProcessError(process.returncode, command)
 
 
 def get_virtual_env_dir():
@@ -0,0 +1,365 @@
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+from ladar.common.cache import make_key, python_fingerprint
+from ladar.common.helpers import get_cache_dir
+from ladar.common.venv import run_pip
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTION_PATTERN = re.compile(
+    r"^(?P<name>.+?)-(?P<version>\d[^-]*?)(-[^-]+)*\.(whl|tar\.gz|zip)$"
+)
+
+# The version numbers of PEP 440, with their optional pre-release, post-release,
+# development release and local label suffixes
+VERSION_PATTERN = re.compile(
+    r"""
+    ^v?(?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre>alpha|a|beta|b|preview|pre|rc|c)[-_.]?(?P<pre_n>\d*))?
+    (?:-(?P<implicit_post_n>\d+)|[-_.]?(?P<post>post|rev|r)[-_.]?(?P<post_n>\d*))?
+    (?:[-_.]?(?P<dev>dev)[-_.]?(?P<dev_n>\d*))?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# The rank of each pre-release phase
+PRE_RELEASE_PHASES = {
+    "a": 0,
+    "alpha": 0,
+    "b": 1,
+    "beta": 1,
+    "c": 2,
+    "rc": 2,
+    "pre": 2,
+    "preview": 2,
+}
+
+
+def normalize_name(name):
+    """
+    Normalize a project name, as pip does (e.g., 'Flask_Login' -> 'flask-login').
+
+    Args:
+        name (str): The project name.
+
+    Returns:
+        str: The normalized project name.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def version_key(version):
+    """
+    Build a sort key for a version number.
+
+    Release segments are compared numerically, development releases sort before
+    pre-releases, which sort before the final release, and post-releases after
+    it, as PEP 440 orders them (e.g., '0.31.dev1' < '0.31rc1' < '0.31' <
+    '0.31.post1' < '0.31.1'). Local version labels ('+...') are ignored.
+
+    Args:
+        version (str): The version number.
+
+    Returns:
+        tuple: The sort key of the version.
+    """
+    match = VERSION_PATTERN.match(version.strip())
+    if match is None:
+        return ((), version)
+    release = tuple(int(part) for part in match.group("release").split("."))
+    # Trailing zeros do not matter: 1.0 == 1.0.0
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+
+    pre, post, dev = match.group("pre"), match.group("post"), match.group("dev")
+    post_n = match.group("post_n")
+    if match.group("implicit_post_n") is not None:
+        # 1.0-1 is the implicit form of 1.0.post1
+        post, post_n = "post", match.group("implicit_post_n")
+    if pre is not None:
+        pre_key = (PRE_RELEASE_PHASES[pre.lower()], int(match.group("pre_n") or 0))
+    elif post is None and dev is not None:
+        # 1.0.dev1 < 1.0a1
+        pre_key = (-1, 0)
+    else:
+        pre_key = (max(PRE_RELEASE_PHASES.values()) + 1, 0)
+    post_key = -1 if post is None else int(post_n or 0)
+    dev_key = (1, 0) if dev is None else (0, int(match.group("dev_n") or 0))
+    return (release, pre_key, post_key, dev_key)
+
+
+def is_prerelease(version):
+    """
+    Tell whether a version number is a pre-release or a development release.
+
+    Only the suffix following the release segment counts, so local version
+    labels (e.g., '1.0+abc') are not mistaken for pre-releases.
+
+    Args:
+        version (str): The version number.
+
+    Returns:
+        bool: True for versions like '1.0rc1', '1.0a2' or '1.0.dev3'.
+    """
+    match = VERSION_PATTERN.match(version.strip())
+    return match is not None and (
+        match.group("pre") is not None or match.group("dev") is not None
+    )
+
+
+def list_versions(wheelhouse, project):
+    """
+    List the versions of a project available in a wheelhouse.
+
+    The wheelhouse is a directory of wheels and source distributions, as used by
+    `pip install --find-links`.
+
+    Args:
+        wheelhouse (str): The path to the wheelhouse.
+        project (str): The name of the project.
+
+    Returns:
+        list: The available versions, sorted from the oldest to the newest.
+    """
+    project = normalize_name(project)
+    versions = set()
+    for filename in os.listdir(wheelhouse):
+        match = DISTRIBUTION_PATTERN.match(filename)
+        if match and normalize_name(match.group("name")) == project:
+            versions.add(match.group("version"))
+    return sorted(versions, key=version_key)
+
+
+def resolve_versions(versions, project, wheelhouse=None):
+    """
+    Resolve a list or a range of versions.
+
+    Args:
+        versions (str): Comma-separated versions (e.g., '0.30.0,0.31.0'), or an
+            inclusive range 'FIRST..LAST' (either bound can be omitted) of the
+            final releases available in the wheelhouse.
+        project (str): The name of the project.
+        wheelhouse (str, optional): The path to the wheelhouse, required to
+            resolve a range.
+
+    Returns:
+        list: The versions, without duplicates.
+
+    Raises:
+        ValueError: If the versions cannot be resolved.
+    """
+    if ".." not in versions:
+        resolved = [v.strip() for v in versions.split(",") if v.strip()]
+        if not resolved:
+            raise ValueError("No version given.")
+        return list(dict.fromkeys(resolved))
+
+    if wheelhouse is None:
+        raise ValueError(f"A wheelhouse is required to resolve the range {versions}.")
+
+    first, _, last = (bound.strip() for bound in versions.partition(".."))
+    resolved = [
+        version
+        for version in list_versions(wheelhouse, project)
+        if not is_prerelease(version)
+        and (not first or version_key(version) >= version_key(first))
+        and (not last or version_key(version) <= version_key(last))
+    ]
+    if not resolved:
+        raise ValueError(
+            f"No version of {project} in the range {versions} found in {wheelhouse}."
+        )
+    logger.info(f"Resolved {versions} to {', '.join(resolved)}.")
+    return resolved
+
+
+def get_pip_options(wheelhouse=None, offline=False):
+    """
+    Build the `pip install` options to install packages from a wheelhouse.
+
+    Args:
+        wheelhouse (str, optional): The path to the wheelhouse.
+        offline (bool): Never reach the package index (pip --no-index): packages
+            are only found in the wheelhouse and in the wheel cache.
+
+    Returns:
+        list: The options, empty when no wheelhouse is used.
+    """
+    options = []
+    if offline:
+        options.append("--no-index")
+    if wheelhouse is not None:
+        options += ["--find-links", os.path.abspath(wheelhouse)]
+    return options
+
+
+def pin_wheels(wheels):
+    """
+    Build the pinned requirements of a resolved set of wheels.
+
+    Args:
+        wheels (list): The paths to the wheels, see `prepare_wheels`.
+
+    Returns:
+        list: The sorted requirements pinning each project to the version of its
+        wheel (e.g., ['requests==2.32.3', 'urllib3==2.2.3']).
+    """
+    requirements = []
+    for wheel in wheels:
+        match = DISTRIBUTION_PATTERN.match(os.path.basename(wheel))
+        if match is None:
+            raise ValueError(f"Not a distribution file name: {wheel}")
+        requirements.append(
+            f"{normalize_name(match.group('name'))}=={match.group('version')}"
+        )
+    return sorted(requirements)
+
+
+def get_wheel_cache_dir(cache_dir=None):
+    """
+    Return the directory of the wheels shared by every virtual environment.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        str: The path to the wheel cache directory.
+    """
+    return get_cache_dir("wheels", cache_dir=cache_dir)
+
+
+def get_key_options(options):
+    """
+    Return the `pip` options that change the packages a requirement set resolves to.
+
+    Whether the package index is reached or not (--no-index) does not change the
+    packages of a pinned requirement set, so environments and wheels prepared
+    online are reused offline.
+
+    Args:
+        options (list): The `pip` options, see `get_pip_options`.
+
+    Returns:
+        list: The options to include in the cache keys.
+    """
+    return [option for option in options or [] if option != "--no-index"]
+
+
+def _wheel_set_path(requirements, options, cache_dir):
+    key = make_key(
+        python=python_fingerprint(),
+        requirements=sorted(requirements),
+        options=get_key_options(options),
+    )[:32]
+    return os.path.join(
+        get_cache_dir("wheels", "sets", cache_dir=cache_dir), f"{key}.json"
+    )
+
+
+def _read_wheel_set(path, wheel_dir):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            wheels = json.load(f)["wheels"]
+    except (OSError, KeyError, TypeError, json.JSONDecodeError):
+        return None
+    paths = [os.path.join(wheel_dir, wheel) for wheel in wheels]
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    return paths
+
+
+def prepare_wheels(requirements, options=None, cache_dir=None, record=True):
+    """
+    Resolve a requirement set to wheels of the wheel cache.
+
+    The requirements and all their dependencies are resolved once with
+    `pip wheel`: wheels already in the cache are reused, and source distributions
+    are built once. The resolved wheels are recorded, so the next environments
+    with the same requirements are installed from the cache without running the
+    resolver, nor reaching the package index.
+
+    Args:
+        requirements (list): The requirements (e.g., ['requests==2.25.1']).
+        options (list, optional): Extra `pip` options, see `get_pip_options`.
+        cache_dir (str, optional): An explicit base cache directory.
+        record (bool): Record the resolved wheels. Requirement sets that are not
+            pinned should not be recorded, as they resolve to newer versions over
+            time.
+
+    Returns:
+        list: The paths to the wheels to install.
+
+    Raises:
+        subprocess.CalledProcessError: If the requirements cannot be resolved.
+    """
+    wheel_dir = get_wheel_cache_dir(cache_dir)
+    set_path = _wheel_set_path(requirements, options, cache_dir)
+    if record:
+        wheels = _read_wheel_set(set_path, wheel_dir)
+        if wheels is not None:
+            logger.info(f"Installing {requirements} from cached wheels.")
+            return wheels
+
+    # pip copies every wheel of the resolved set in the (empty) wheel directory,
+    # including those found in the cache, which records the resolved set
+    build_dir = tempfile.mkdtemp(prefix=".build-", dir=wheel_dir)
+    try:
+        command = [
+            sys.executable,
+            "-m",
+            "pip",
+            "wheel",
+            "--wheel-dir",
+            build_dir,
+            "--find-links",
+            wheel_dir,
+            *(options or []),
+            *requirements,
+        ]
+        run_pip(command, ", ".join(requirements))
+        wheels = sorted(os.listdir(build_dir))
+        for wheel in wheels:
+            os.replace(os.path.join(build_dir, wheel), os.path.join(wheel_dir, wheel))
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    if record:
+        with open(set_path, "w", encoding="utf-8") as f:
+            json.dump({"requirements": list(requirements), "wheels": wheels}, f)
+    return [os.path.join(wheel_dir, wheel) for wheel in wheels]
+
+
+def wheel_cache_size(cache_dir=None):
+    """
+    Compute the size of the wheel cache.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+
+    Returns:
+        tuple: The number of cached wheels and their total size, in bytes.
+    """
+    wheel_dir = get_wheel_cache_dir(cache_dir)
+    sizes = [
+        entry.stat().st_size
+        for entry in os.scandir(wheel_dir)
+        if entry.is_file() and entry.name.endswith(".whl")
+    ]
+    return len(sizes), sum(sizes)
+
+
+def clear_wheels(cache_dir=None):
+    """
+    Remove every wheel of the wheel cache, and the recorded requirement sets.
+
+    Args:
+        cache_dir (str, optional): An explicit base cache directory.
+    """
+    shutil.rmtree(get_wheel_cache_dir(cache_dir), ignore_errors=True)
@@ -1,8 +1,9 @@
 import argparse
 import importlib
 import logging
-import pkgutil
-from pathlib import Path
+import sys
+
+from ladar.cmds import COMMANDS
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +24,30 @@ def configure_logging(verbosity_level):
 
 
 def discover_commands():
-    commands = {}
-    cmds_path = Path(__file__).parent / "cmds"
-    for loader, module_name, is_pkg in pkgutil.iter_modules([str(cmds_path)]):
-        module = importlib.import_module(f"ladar.cmds.{module_name}")
-        if hasattr(module, "add_arguments") and hasattr(module, "main"):
-            commands[module_name] = module
-    return commands
+    """
+    Return the manifest of the available commands, without importing them.
+
+    Returns:
+        dict: The commands, by name, with their `module` and `description`.
+    """
+    return COMMANDS
+
+
+def find_command(argv, commands):
+    """
+    Find the command selected in the command line, before it is parsed.
+
+    Args:
+        argv (list): The command line arguments, without the program name.
+        commands (dict): The available commands.
+
+    Returns:
+        str or None: The name of the selected command, if any.
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg if arg in commands else None
+    return None
 
 
 def main():
@@ -46,20 +64,26 @@ def main():
     )
 
     commands = discover_commands()
+    selected = find_command(sys.argv[1:], commands)
+    module = None
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    for command_name, module in commands.items():
-        command_help = getattr(module, "command_description", f"{command_name} command")
-        command_parser = subparsers.add_parser(command_name, help=command_help)
-        module.add_arguments(command_parser)
+    for command_name, command in commands.items():
+        command_parser = subparsers.add_parser(
+            command_name, help=command["description"]
+        )
+        # Only the selected command is imported, and its arguments added
+        if command_name == selected:
+            module = importlib.import_module(command["module"])
+            module.add_arguments(command_parser)
 
     args = parser.parse_args()
 
     configure_logging(args.verbose)
 
-    if args.command in commands:
-        commands[args.command].main(args)
+    if module is not None and args.command == selected:
+        module.main(args)
     else:
         parser.print_help()
 
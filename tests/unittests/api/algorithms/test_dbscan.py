@@ -0,0 +1,161 @@
+import pytest
+
+from ladar.api.algorithms.dbscan import DBSCAN
+
+OLD = {
+    "lib.queue": {
+        "type": "class",
+        "members": {
+            "put": {"type": "method", "signature": "(self, item, block=True)"},
+            "get": {"type": "method", "signature": "(self, block=True)"},
+        },
+    },
+    "lib.spawn_thread": {"type": "function", "signature": "(function, *args)"},
+}
+NEW = {
+    "lib.queue": {
+        "type": "class",
+        "members": {
+            "put": {
+                "type": "method",
+                "signature": "(self, item, block=True, timeout=None)",
+            },
+            "get": {"type": "method", "signature": "(self, block=True, timeout=None)"},
+        },
+    },
+    "lib.spawn": {"type": "function", "signature": "(function, *args, **kwargs)"},
+    "lib.unrelated_helper": {"type": "function", "signature": "()"},
+}
+
+
+def test_dbscan_clusters_equivalent_elements():
+    """Test that the equivalent elements of two structures are clustered."""
+    results = DBSCAN(eps=0.35, min_samples=2).fit_transform([OLD, NEW])
+    detailed = results["detailed_mapping"]
+
+    for path in ["lib.queue.put", "lib.queue.get"]:
+        assert detailed["struct_1"][path] == detailed["struct_2"][path] != -1
+    assert detailed["struct_2"]["lib.unrelated_helper"] == -1
+    assert results["additional_info"]["elements"] == 9
+    cluster = results["cluster_mapping"][str(detailed["struct_1"]["lib.queue.put"])]
+    assert {"struct_1": "lib.queue.put"} in cluster
+    assert {"struct_2": "lib.queue.put"} in cluster
+
+
+def test_dbscan_without_elements():
+    """Test that structures without elements cannot be compared."""
+    with pytest.raises(ValueError):
+        DBSCAN().fit_transform([{"lib.x": {"type": "attribute"}}])
+
+
+def test_dbscan_bounded_distances_give_the_same_clusters():
+    """Test that pruning the pairs farther than eps does not change the clusters."""
+    for eps in [0.2, 0.35, 0.5]:
+        bounded = DBSCAN(eps=eps).fit_transform([OLD, NEW])
+        exact = DBSCAN(eps=eps, exact=True).fit_transform([OLD, NEW])
+        assert bounded["mapping"] == exact["mapping"]
+
+
+def test_dbscan_compares_the_candidates_of_a_blocking_step():
+    """Test that only the candidate pairs of a blocking step are compared."""
+    results = DBSCAN(eps=0.35).fit_transform([OLD, NEW])
+    # Only the queue methods are compared with their counterparts: put and get
+    # are too far from each other to be clustered together
+    blocked = DBSCAN(eps=0.35).fit_transform(
+        {"structures": [OLD, NEW], "candidates": [[1, 5], [2, 6]]}
+    )
+    detailed = blocked["detailed_mapping"]
+
+    assert (
+        detailed["struct_1"]["lib.queue.put"] == detailed["struct_2"]["lib.queue.put"]
+    )
+    assert (
+        detailed["struct_1"]["lib.queue.get"] == detailed["struct_2"]["lib.queue.get"]
+    )
+    assert (
+        detailed["struct_1"]["lib.queue.put"] != detailed["struct_1"]["lib.queue.get"]
+    )
+    assert detailed["struct_2"]["lib.spawn"] == -1
+    assert (
+        blocked["additional_info"]["elements"] == results["additional_info"]["elements"]
+    )
+
+
+def test_dbscan_bipartite_mode():
+    """Test that elements are only clustered with those of other structures."""
+    structure = {
+        "lib.read": {"type": "function", "signature": "(path)"},
+        "lib.reads": {"type": "function", "signature": "(path)"},
+    }
+    results = DBSCAN(eps=0.3).fit_transform([structure, {"lib.x": {"type": "class"}}])
+    assert results["detailed_mapping"]["struct_1"]["lib.read"] != -1
+
+    results = DBSCAN(eps=0.3, mode="bipartite").fit_transform(
+        [structure, {"lib.x": {"type": "class"}}]
+    )
+    assert set(results["detailed_mapping"]["struct_1"].values()) == {-1}
+
+    results = DBSCAN(eps=0.35, mode="bipartite").fit_transform([OLD, NEW])
+    detailed = results["detailed_mapping"]
+    assert (
+        detailed["struct_1"]["lib.queue.put"] == detailed["struct_2"]["lib.queue.put"]
+    )
+    assert results["additional_info"]["mode"] == "bipartite"
+
+
+def test_dbscan_hierarchical_mode():
+    """Test that the members of matched classes are clustered together."""
+    results = DBSCAN(eps=0.35, mode="hierarchical").fit_transform([OLD, NEW])
+    detailed = results["detailed_mapping"]
+    expected = DBSCAN(eps=0.35, mode="bipartite").fit_transform([OLD, NEW])
+
+    assert detailed == expected["detailed_mapping"]
+    assert results["additional_info"]["mode"] == "hierarchical"
+    # Fewer comparisons than the 4 * 5 pairs of elements of different structures
+    assert results["additional_info"]["comparisons"] < 20
+
+    with pytest.raises(ValueError, match="blocking"):
+        DBSCAN(mode="hierarchical").fit(
+            {"structures": [OLD, NEW], "candidates": [[0, 4]]}
+        )
+
+
+def test_dbscan_partition():
+    """Test that only the elements of compatible partitions are compared."""
+    structures = [
+        {"lib.queue": {"type": "class"}},
+        {
+            "lib.queues": {"type": "function"},
+            "lib.Queue": {"type": "class"},
+        },
+    ]
+    results = DBSCAN(eps=0.2, mode="bipartite").fit_transform(structures)
+    detailed = results["detailed_mapping"]
+    assert detailed["struct_1"]["lib.queue"] == detailed["struct_2"]["lib.queues"]
+
+    results = DBSCAN(eps=0.2, mode="bipartite", partition=True).fit_transform(
+        structures
+    )
+    detailed = results["detailed_mapping"]
+    assert detailed["struct_2"]["lib.queues"] == -1
+    assert results["additional_info"]["comparisons"] == 1
+
+    # The methods differ by one parameter, within the tolerance
+    results = DBSCAN(eps=0.35, partition=True).fit_transform([OLD, NEW])
+    detailed = results["detailed_mapping"]
+    assert (
+        detailed["struct_1"]["lib.queue.put"] == detailed["struct_2"]["lib.queue.put"]
+    )
+    strict = DBSCAN(eps=0.35, partition=True, arity_tolerance=0).fit_transform(
+        [OLD, NEW]
+    )
+    assert strict["detailed_mapping"]["struct_1"]["lib.queue.put"] == -1
+
+    with pytest.raises(ValueError):
+        DBSCAN(mode="hierarchical", partition=True)
+
+
+def test_dbscan_unknown_mode():
+    """Test that unknown modes are rejected."""
+    with pytest.raises(ValueError):
+        DBSCAN(mode="tripartite")
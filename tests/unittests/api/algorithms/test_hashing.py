@@ -0,0 +1,129 @@
+import concurrent.futures
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from ladar.api.algorithms.hashing import Hashing
+from ladar.api.extract import StreamedStructure, iter_api_records
+from ladar.common.io import save
+
+STRUCTURES = [
+    {
+        "Queue": {
+            "type": "class",
+            "members": {
+                "put": {"type": "method", "signature": "(self, item)"},
+                "get_nowait": {"type": "method", "signature": "(self)"},
+            },
+        },
+    },
+    {
+        "LightQueue": {
+            "type": "class",
+            "members": {
+                "put": {"type": "method", "signature": "(self, item, block=True)"},
+                "getNowait": {"type": "method", "signature": "(self)"},
+            },
+        },
+        "spawn": {"type": "function", "signature": "(func, *args)"},
+    },
+]
+
+
+def test_hashing_matches_members():
+    """Test that the members are matched to their counterparts."""
+    results = Hashing(n_features=1024).fit_transform(STRUCTURES)
+    features = results["hashing_features"]
+
+    assert results["algorithm_used"] == "hashing"
+    assert scipy.sparse.isspmatrix_csr(features)
+    assert features.shape == (7, 1024)
+    assert [element["path"] for element in results["elements"]] == [
+        "Queue",
+        "Queue.put",
+        "Queue.get_nowait",
+        "LightQueue",
+        "LightQueue.put",
+        "LightQueue.getNowait",
+        "spawn",
+    ]
+    matches = results["matches"]["struct_2"]
+    assert matches["Queue.put"][0]["path"] == "LightQueue.put"
+    assert matches["Queue.get_nowait"][0]["path"] == "LightQueue.getNowait"
+    assert results["additional_info"]["elements"] == 7
+
+
+def test_hashing_is_fit_free_without_idf():
+    """Test that, without IDF, transform needs no fit and gives the same features."""
+    fitted = Hashing(n_features=256, idf=0).fit_transform(STRUCTURES)
+    unfitted = Hashing(n_features=256, idf=0).transform(STRUCTURES)
+
+    np.testing.assert_array_equal(
+        fitted["hashing_features"].toarray(), unfitted["hashing_features"].toarray()
+    )
+    assert fitted["matches"] == unfitted["matches"]
+
+
+def test_hashing_with_idf_needs_fit():
+    """Test that the IDF weights are fitted before transform."""
+    with pytest.raises(ValueError, match="fitted"):
+        Hashing().transform(STRUCTURES)
+
+    algorithm = Hashing(n_features=256)
+    algorithm.fit(STRUCTURES)
+    results = algorithm.transform(STRUCTURES)
+    expected = Hashing(n_features=256).fit_transform(STRUCTURES)
+    np.testing.assert_allclose(
+        results["hashing_features"].toarray(), expected["hashing_features"].toarray()
+    )
+
+
+def test_hashing_is_identical_across_batches_and_jobs():
+    """Test that the batches and processes do not change the results."""
+    expected = Hashing(n_features=512).fit_transform(STRUCTURES)
+    results = Hashing(n_features=512, jobs=2, batch_size=2).fit_transform(STRUCTURES)
+
+    np.testing.assert_allclose(
+        results["hashing_features"].toarray(), expected["hashing_features"].toarray()
+    )
+    assert results["elements"] == expected["elements"]
+    assert results["matches"] == expected["matches"]
+
+
+def test_hashing_shares_one_pool_between_structures():
+    """Test that a single pool of processes hashes all the structures."""
+    with patch.object(
+        concurrent.futures,
+        "ProcessPoolExecutor",
+        wraps=concurrent.futures.ProcessPoolExecutor,
+    ) as pool:
+        Hashing(n_features=512, jobs=2, batch_size=1).fit_transform(STRUCTURES)
+
+    assert pool.call_count == 1
+
+
+def test_hashing_streams_json_lines(tmp_path):
+    """Test that structures streamed from JSON Lines files hash as loaded ones."""
+    streamed = []
+    for index, structure in enumerate(STRUCTURES):
+        path = str(tmp_path / f"structure{index}.jsonl")
+        save(path, iter_api_records({"ladar": {}, "structure": structure}))
+        streamed.append(StreamedStructure(path))
+    expected = Hashing(n_features=512).fit_transform(STRUCTURES)
+
+    with patch.object(StreamedStructure, "load", side_effect=AssertionError):
+        results = Hashing(n_features=512).fit_transform(streamed)
+
+    np.testing.assert_allclose(
+        results["hashing_features"].toarray(), expected["hashing_features"].toarray()
+    )
+    assert results["elements"] == expected["elements"]
+    assert results["matches"] == expected["matches"]
+
+
+def test_hashing_rejects_empty_structures():
+    """Test that empty structures are reported."""
+    with pytest.raises(ValueError, match="Structure 2"):
+        Hashing().fit_transform([STRUCTURES[0], {}])
@@ -0,0 +1,73 @@
+import pytest
+
+from ladar.api.algorithms.dbscan import DBSCAN
+from ladar.api.algorithms.minhash import MinHash
+
+OLD = {
+    "lib.queue": {
+        "type": "class",
+        "members": {
+            "put": {"type": "method", "signature": "(self, item, block=True)"},
+            "get": {"type": "method", "signature": "(self, block=True)"},
+        },
+    },
+    "lib.spawn_thread": {"type": "function", "signature": "(function, *args)"},
+}
+NEW = {
+    "lib.queue": {
+        "type": "class",
+        "members": {
+            "put": {"type": "method", "signature": "(self, item, block=True)"},
+            "get": {"type": "method", "signature": "(self, block=True, timeout=None)"},
+        },
+    },
+    "lib.spawn_thread": {"type": "function", "signature": "(function, *args)"},
+    "lib.unrelated_helper": {"type": "function", "signature": "()"},
+}
+
+
+def test_minhash_pairs_similar_elements_of_different_structures():
+    """Test that similar elements of different structures are candidates."""
+    results = MinHash().fit_transform([OLD, NEW])
+    elements = results["elements"]
+    pairs = {
+        (elements[i]["path"], elements[j]["path"]) for i, j in results["candidates"]
+    }
+
+    assert ("lib.queue.put", "lib.queue.put") in pairs
+    assert ("lib.spawn_thread", "lib.spawn_thread") in pairs
+    for i, j in results["candidates"]:
+        assert elements[i]["structure"] != elements[j]["structure"]
+    assert not any("lib.unrelated_helper" in pair for pair in pairs)
+
+    info = results["additional_info"]
+    assert info["comparisons"] == 4 * 5
+    assert info["candidates"] == len(results["candidates"]) < info["comparisons"]
+    assert info["recall"] == 1.0
+    assert info["threshold"] == pytest.approx(0.5)
+
+
+def test_minhash_within_structures():
+    """Test that elements of the same structure can be paired on demand."""
+    results = MinHash(within_structures=True, bands=32, rows=1).fit_transform(
+        [OLD, NEW]
+    )
+    elements = results["elements"]
+
+    assert any(
+        elements[i]["structure"] == elements[j]["structure"]
+        for i, j in results["candidates"]
+    )
+    assert results["additional_info"]["comparisons"] == 9 * 8 // 2
+
+
+def test_minhash_then_dbscan():
+    """Test that the candidates are clustered by the next step."""
+    blocked = MinHash().fit_transform([OLD, NEW])
+    results = DBSCAN(eps=0.3).fit_transform(blocked)
+    detailed = results["detailed_mapping"]
+
+    assert (
+        detailed["struct_1"]["lib.queue.put"] == detailed["struct_2"]["lib.queue.put"]
+    )
+    assert detailed["struct_2"]["lib.unrelated_helper"] == -1
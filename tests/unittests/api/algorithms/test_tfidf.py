@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+import scipy.sparse
+
+from ladar.api.algorithms.tfidf import TFIDF
+
+STRUCTURES = [
+    {"queue": {"type": "class", "docstring": "A thread safe queue of items."}},
+    {"queue": {"type": "class", "docstring": "A green thread safe queue."}},
+    {"spawn": {"type": "function", "docstring": "Spawn a function in a pool."}},
+]
+
+
+def test_tfidf_features_are_sparse():
+    """Test that the features stay sparse, and the similarities match them."""
+    results = TFIDF(stop_words=None).fit_transform(STRUCTURES)
+    features = results["tfidf_features"]
+
+    assert scipy.sparse.isspmatrix_csr(features)
+    assert features.shape == (3, len(results["feature_names"]))
+    assert "queue" in results["feature_names"]
+
+    dense = features.toarray()
+    dense /= np.linalg.norm(dense, axis=1, keepdims=True)
+    np.testing.assert_allclose(results["similarity"], dense @ dense.T)
+    similarity = results["similarity"]
+    assert similarity[0][1] > similarity[0][2]
+
+
+def test_tfidf_transform_after_fit():
+    """Test that transform uses the vocabulary of fit."""
+    algorithm = TFIDF(stop_words=None)
+    algorithm.fit(STRUCTURES[:2])
+    results = algorithm.transform(STRUCTURES)
+
+    assert "spawn" not in results["feature_names"]
+    assert results["tfidf_features"].shape[0] == 3
+    # No term of the last structure is in the vocabulary
+    assert results["tfidf_features"][2].nnz == 0
+    assert results["similarity"][2] == [0.0, 0.0, 0.0]
+
+
+MEMBERS = [
+    {
+        "lib.queue": {
+            "type": "class",
+            "members": {
+                "put_item": {"type": "method", "signature": "(self, item, block)"},
+                "get_item": {"type": "method", "signature": "(self, block)"},
+            },
+        },
+        "lib.spawn_thread": {"type": "function", "signature": "(function)"},
+    },
+    {
+        "lib.Queue": {
+            "type": "class",
+            "members": {
+                "putItem": {"type": "method", "signature": "(self, item, timeout)"},
+                "getItem": {"type": "method", "signature": "(self, timeout)"},
+            },
+        },
+        "lib.spawn": {"type": "function", "signature": "(function, *args)"},
+    },
+]
+
+
+def test_tfidf_member_level_matches():
+    """Test that each member of the first structure is mapped to its top-k."""
+    results = TFIDF(level="member", top_k=2, stop_words=None).fit_transform(MEMBERS)
+    matches = results["matches"]["struct_2"]
+
+    assert results["tfidf_features"].shape[0] == len(results["elements"]) == 8
+    assert set(matches) == {
+        "lib.queue",
+        "lib.queue.put_item",
+        "lib.queue.get_item",
+        "lib.spawn_thread",
+    }
+    assert matches["lib.queue.put_item"][0]["path"] == "lib.Queue.putItem"
+    assert matches["lib.queue.get_item"][0]["path"] == "lib.Queue.getItem"
+    assert matches["lib.spawn_thread"][0]["path"] == "lib.spawn"
+    for candidates in matches.values():
+        assert len(candidates) <= 2
+        similarities = [candidate["similarity"] for candidate in candidates]
+        assert similarities == sorted(similarities, reverse=True)
+
+
+def test_tfidf_member_level_partition():
+    """Test that members are only matched to members of compatible partitions."""
+    results = TFIDF(
+        level="member", top_k=5, stop_words=None, partition=True
+    ).fit_transform(MEMBERS)
+    matches = results["matches"]["struct_2"]
+
+    assert [match["path"] for match in matches["lib.queue"]] == ["lib.Queue"]
+    assert [match["path"] for match in matches["lib.spawn_thread"]] == ["lib.spawn"]
+    assert {match["path"] for match in matches["lib.queue.put_item"]} <= {
+        "lib.Queue.putItem",
+        "lib.Queue.getItem",
+    }
+    assert matches["lib.queue.put_item"][0]["path"] == "lib.Queue.putItem"
+
+    strict = TFIDF(
+        level="member", stop_words=None, partition=True, arity_tolerance=0
+    ).fit_transform(MEMBERS)
+    # The methods keep their arity, the function gains a parameter
+    assert strict["matches"]["struct_2"]["lib.queue.get_item"][0]["path"] == (
+        "lib.Queue.getItem"
+    )
+    assert strict["matches"]["struct_2"]["lib.spawn_thread"] == []
+
+
+def test_tfidf_unknown_level():
+    """Test that unknown levels are rejected."""
+    with pytest.raises(ValueError):
+        TFIDF(level="package")
@@ -0,0 +1,52 @@
+import pytest
+
+from ladar.api.algorithms.tiered import Tiered
+
+STRUCTURES = [
+    {
+        "Queue": {
+            "type": "class",
+            "members": {"put": {"type": "method", "signature": "(self, item)"}},
+        },
+        "spawn": {"type": "function", "signature": "(func, *args)"},
+        "sleep": {"type": "function", "signature": "(seconds)"},
+    },
+    {
+        "Queue": {
+            "type": "class",
+            "members": {"put": {"type": "method", "signature": "(self, item)"}},
+        },
+        "spawn_n": {"type": "function", "signature": "(func, *args)"},
+    },
+    {"queue": {"type": "class"}},
+]
+
+
+def test_tiered_reports_each_tier():
+    """Test that the matches, leftovers and tiers are reported by structure."""
+    results = Tiered().fit_transform(STRUCTURES)
+
+    assert results["algorithm_used"] == "tiered"
+    assert set(results["matches"]) == {"struct_2", "struct_3"}
+    assert results["matches"]["struct_2"]["spawn"]["path"] == "spawn_n"
+    assert results["matches"]["struct_3"] == {
+        "Queue": {"path": "queue", "tier": "name", "distance": 0.0}
+    }
+    assert results["unmatched"]["struct_2"] == ["sleep"]
+    assert results["unmatched"]["struct_3"] == ["Queue.put", "spawn", "sleep"]
+    tiers = results["additional_info"]["tiers"]["struct_2"]
+    assert [tier["matched"] for tier in tiers] == [2, 0, 1]
+
+
+def test_tiered_without_fuzzy():
+    """Test that the fuzzy tier is skipped with fuzzy=0."""
+    results = Tiered(fuzzy=0).fit_transform(STRUCTURES[:2])
+
+    assert results["unmatched"]["struct_2"] == ["spawn", "sleep"]
+    assert len(results["additional_info"]["tiers"]["struct_2"]) == 2
+
+
+def test_tiered_rejects_empty_structures():
+    """Test that empty structures are reported."""
+    with pytest.raises(ValueError, match="Structure 2"):
+        Tiered().fit_transform([STRUCTURES[0], {}])
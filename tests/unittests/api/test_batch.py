@@ -0,0 +1,142 @@
+import contextlib
+import os
+
+import ladar.common.envpool as envpool
+from ladar.api.batch import (
+    are_compatible,
+    plan_environments,
+    requirement_name,
+    run_batch,
+    run_environment,
+)
+
+
+def write_name(target, env_dir):
+    """Worker used by the tests, run in a spawned process."""
+    with open(target["output"], "w") as file:
+        file.write(f"{target['name']} {os.getpid()}")
+    return not target["name"].startswith("fail")
+
+
+def test_requirement_name():
+    """Test that project names are normalized."""
+    assert requirement_name("Flask_Login>=0.6") == "flask-login"
+    assert requirement_name("requests==2.25.1") == "requests"
+    assert requirement_name("zope.interface") == "zope-interface"
+
+
+def test_are_compatible():
+    """Test that requirement sets pinning a project differently are incompatible."""
+    assert are_compatible(["requests==2.25.1"], ["flask==2.0.0"])
+    assert are_compatible(["requests==2.25.1"], ["requests==2.25.1", "six"])
+    assert not are_compatible(["requests==2.25.1"], ["requests==2.31.0"])
+
+
+TARGETS = [
+    {"name": "a", "requirements": ["requests==2.25.1"]},
+    {"name": "b", "requirements": ["requests==2.31.0"]},
+    {"name": "c", "requirements": ["flask==2.0.0"]},
+    {"name": "d", "requirements": ["requests==2.25.1"]},
+    {"name": "e", "requirements": []},
+]
+
+
+def test_plan_environments():
+    """Test that only targets with the same requirements share an environment."""
+    for jobs in [1, 2, 4]:
+        environments = plan_environments(TARGETS, jobs=jobs)
+        assert [[t["name"] for t in env["targets"]] for env in environments] == [
+            ["a", "d"],
+            ["b"],
+            ["c"],
+            ["e"],
+        ]
+    assert environments[0]["requirements"] == ["requests==2.25.1"]
+    assert environments[3]["requirements"] is None
+
+
+def test_plan_environments_merged():
+    """Test that environments are shared between compatible targets on demand."""
+    environments = plan_environments(TARGETS, jobs=2, merge=True)
+    assert [[t["name"] for t in env["targets"]] for env in environments] == [
+        ["a", "c", "d"],
+        ["b"],
+        ["e"],
+    ]
+    assert environments[0]["requirements"] == ["requests==2.25.1", "flask==2.0.0"]
+    assert environments[2]["requirements"] is None
+
+    # With enough workers, only identical requirement sets share an environment
+    environments = plan_environments(TARGETS, jobs=4, merge=True)
+    assert [[t["name"] for t in env["targets"]] for env in environments] == [
+        ["a", "d"],
+        ["b"],
+        ["c"],
+        ["e"],
+    ]
+
+
+def test_run_batch(tmp_path):
+    """Test that each target is run in its own process and reported in order."""
+    targets = [
+        {"name": name, "requirements": [], "output": str(tmp_path / name)}
+        for name in ["first", "fail", "last"]
+    ]
+
+    results = run_batch(targets, write_name, jobs=2)
+
+    assert [result["name"] for result in results] == ["first", "fail", "last"]
+    assert [result["status"] for result in results] == ["ok", "failed", "ok"]
+    pids = {(tmp_path / name).read_text().split()[1] for name in ["first", "last"]}
+    assert len(pids) == 2
+    assert str(os.getpid()) not in pids
+
+
+def test_run_batch_reuses_environments(tmp_path, monkeypatch):
+    """
+    Test that a second run of the same targets, in another order and with another
+    number of workers, acquires the environments of the first run.
+    """
+    acquired = []
+
+    @contextlib.contextmanager
+    def acquire(requirements, **kwargs):
+        acquired.append(frozenset(requirements))
+        yield None
+
+    monkeypatch.setattr(envpool, "acquire", acquire)
+    targets = [
+        dict(target, output=str(tmp_path / target["name"]))
+        for target in TARGETS
+        if target["requirements"]
+    ]
+
+    run_batch(targets, write_name, jobs=2)
+    first = set(acquired)
+    acquired.clear()
+    run_batch(targets[::-1], write_name, jobs=1)
+
+    assert set(acquired) == first
+    assert len(first) == 3
+
+
+def test_run_environment_reports_environment_errors(tmp_path, monkeypatch):
+    """Test that an environment failing to build fails its targets only."""
+
+    def acquire(requirements, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(envpool, "acquire", acquire)
+    targets = [
+        {"name": name, "requirements": ["pkg"], "output": str(tmp_path / name)}
+        for name in ["first", "second"]
+    ]
+
+    results = run_environment(
+        {"requirements": ["pkg"], "targets": targets}, write_name, 3
+    )
+
+    assert [result["name"] for result in results] == ["first", "second"]
+    assert {result["status"] for result in results} == {"failed"}
+    assert {result["environment"] for result in results} == {3}
+    assert "No space left on device" in results[0]["error"]
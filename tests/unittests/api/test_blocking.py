@@ -0,0 +1,162 @@
+import random
+import string
+
+import numpy as np
+import pytest
+
+from ladar.api.blocking import (
+    are_compatible,
+    candidate_probability,
+    estimate_recall,
+    get_partitions,
+    iter_ngrams,
+    iter_partition_blocks,
+    lsh_candidates,
+    lsh_threshold,
+    minhash_signatures,
+    normalize_text,
+    unpack_blocking,
+)
+from ladar.api.distance import block_neighbors_graph
+
+
+@pytest.fixture
+def texts():
+    generator = random.Random(0)
+    texts = [
+        "".join(generator.choices(string.ascii_lowercase, k=generator.randint(8, 30)))
+        for _ in range(200)
+    ]
+    # Near duplicates of the first texts
+    return texts + [text[:-1] + "!" for text in texts[:50]]
+
+
+def test_normalize_text():
+    """Test that the case, the underscores and the spaces are normalized."""
+    assert normalize_text("Loop.get_event_loop  (self)") == "loop.geteventloop (self)"
+
+
+def test_iter_ngrams():
+    """Test the n-grams of long and short texts."""
+    assert sorted(iter_ngrams("abcab", 3)) == ["abc", "bca", "cab"]
+    assert list(iter_ngrams("ab", 3)) == ["ab"]
+    assert list(iter_ngrams("", 3)) == [""]
+
+
+def test_minhash_signatures_estimate_jaccard(texts):
+    """Test that the signatures agree as often as the n-gram sets are similar."""
+    signatures = minhash_signatures(["abcdefghij", "abcdefgxyz"], 1000)
+    a, b = set(iter_ngrams("abcdefghij")), set(iter_ngrams("abcdefgxyz"))
+
+    agreement = (signatures[0] == signatures[1]).mean()
+    assert agreement == pytest.approx(len(a & b) / len(a | b), abs=0.05)
+    assert np.array_equal(minhash_signatures(texts, 8), minhash_signatures(texts, 8))
+
+
+def test_lsh_candidates(texts):
+    """Test that near duplicates are candidates, and random texts rarely are."""
+    signatures = minhash_signatures(texts, 64)
+    candidates = lsh_candidates(signatures, 16, 4)
+    pairs = set(map(tuple, candidates.tolist()))
+
+    assert all(i < j for i, j in pairs)
+    assert sum((i, 200 + i) in pairs for i in range(50)) >= 45
+    assert len(pairs) < 100
+
+    groups = np.array([0] * 200 + [0] * 50)
+    assert len(lsh_candidates(signatures, 16, 4, groups)) == 0
+    with pytest.raises(ValueError):
+        lsh_candidates(signatures, 16, 8)
+
+
+def test_candidate_probability():
+    """Test the S-curve of the candidate probability."""
+    assert candidate_probability(0.0, 16, 4) == 0.0
+    assert candidate_probability(1.0, 16, 4) == 1.0
+    assert candidate_probability(0.3, 16, 4) < candidate_probability(0.8, 16, 4)
+    assert lsh_threshold(16, 4) == pytest.approx(0.5)
+
+
+def test_estimate_recall(texts):
+    """Test the recall measured on a sample."""
+    duplicates = np.array([[i, 200 + i] for i in range(50)])
+
+    recall, pairs = estimate_recall(texts, duplicates, 0.7, sample=250)
+    assert (recall, pairs) == (1.0, 50)
+    recall, pairs = estimate_recall(texts, duplicates[:25], 0.7, sample=250)
+    assert (recall, pairs) == (0.5, 50)
+    assert estimate_recall(texts, duplicates, 1.1) == (None, 0)
+
+
+def test_unpack_blocking():
+    """Test that blocking results and structures are both accepted."""
+    assert unpack_blocking([{}]) == ([{}], None)
+    assert unpack_blocking({"structures": [{}], "candidates": [[0, 1]]}) == (
+        [{}],
+        [[0, 1]],
+    )
+
+
+PARTITIONED = [
+    {"structure": 0, "type": "class", "arity": None},
+    {"structure": 0, "type": "method", "arity": 0},
+    {"structure": 0, "type": "method", "arity": 2},
+    {"structure": 1, "type": "class", "arity": 1},
+    {"structure": 1, "type": "async method", "arity": 1},
+    {"structure": 1, "type": "method", "arity": 4},
+    {"structure": 1, "type": "function", "arity": 1},
+]
+
+
+def test_get_partitions():
+    """Test that the kinds leave out 'async', and missing arities are -1."""
+    kinds, arities = get_partitions(PARTITIONED)
+
+    assert kinds[1] == kinds[2] == kinds[4] == kinds[5]
+    assert kinds[0] == kinds[3] != kinds[1]
+    assert kinds[6] not in (kinds[0], kinds[1])
+    assert arities.tolist() == [-1, 0, 2, 1, 1, 4, 1]
+
+
+@pytest.mark.parametrize("tolerance", [0, 1, 2])
+def test_iter_partition_blocks(tolerance):
+    """Test that the blocks compare the pairs of compatible partitions, once."""
+    partitions = get_partitions(PARTITIONED)
+    size = len(PARTITIONED)
+    every = np.array([(i, j) for i in range(size) for j in range(i + 1, size)])
+    expected = every[are_compatible(partitions, every, tolerance)]
+    texts = ["same"] * size
+
+    graph, compared = block_neighbors_graph(
+        texts, 0.0, iter_partition_blocks(partitions, tolerance)
+    )
+    graph = graph.tocoo()
+    upper = graph.row < graph.col
+    assert compared == len(expected)
+    assert sorted(zip(graph.row[upper].tolist(), graph.col[upper].tolist())) == [
+        tuple(pair) for pair in expected.tolist()
+    ]
+
+    groups = np.array([element["structure"] for element in PARTITIONED])
+    _, compared = block_neighbors_graph(
+        texts, 0.0, iter_partition_blocks(partitions, tolerance), groups=groups
+    )
+    assert compared == np.count_nonzero(
+        groups[expected[:, 0]] != groups[expected[:, 1]]
+    )
+
+
+def test_are_compatible():
+    """Test the kinds and arity tolerance of compatible pairs."""
+    partitions = get_partitions(PARTITIONED)
+    pairs = np.array([[0, 3], [1, 4], [2, 4], [2, 5], [4, 6], [1, 2]])
+
+    assert are_compatible(partitions, pairs, 1).tolist() == [
+        True,
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert are_compatible(partitions, pairs, 2).tolist()[3] is True
@@ -0,0 +1,81 @@
+import argparse
+import importlib
+import importlib.metadata
+from unittest import mock
+
+import pytest
+
+import ladar.api.compare as compare
+from ladar.api.algorithms import ALGORITHMS
+from ladar.api.compare import add_algorithm_arguments
+
+
+@pytest.mark.parametrize("algorithm_name", sorted(ALGORITHMS))
+def test_manifest_matches_algorithms(algorithm_name):
+    """Test that the manifest of the algorithms matches their classes."""
+    algorithm = ALGORITHMS[algorithm_name]
+    module = importlib.import_module(algorithm["module"])
+    algorithm_class = getattr(module, algorithm["class"])
+
+    assert algorithm_class.category.value == algorithm["category"]
+
+
+def test_add_algorithm_arguments():
+    """Test that only the arguments of the given algorithms are added."""
+    parser = argparse.ArgumentParser()
+    add_algorithm_arguments(parser, ["DBSCAN", "tfidf", "dbscan", "unknown"])
+
+    args = parser.parse_args(["--dbscan-eps", "0.3"])
+    assert args.dbscan_eps == 0.3
+    assert args.dbscan_min_samples == 2
+    assert args.tfidf_max_features == 500
+    assert not hasattr(args, "hashing_top_k")
+
+
+def fake_entry_points(*entry_points):
+    return mock.patch.object(
+        compare,
+        "_iter_entry_points",
+        return_value=[
+            importlib.metadata.EntryPoint(name, value, compare.ENTRY_POINT_GROUP)
+            for name, value in entry_points
+        ],
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    compare.discover_algorithms.cache_clear()
+    compare.get_algorithm_class.cache_clear()
+    yield
+    compare.discover_algorithms.cache_clear()
+    compare.get_algorithm_class.cache_clear()
+
+
+def test_discover_algorithms():
+    """Test that built-in and third-party algorithms are discovered."""
+    with fake_entry_points(
+        ("dbscan", "ladar.api.algorithms.dbscan:DBSCAN"),
+        ("Scaler", "ladar.api.algorithms.minmaxscaler:MinMaxScaler"),
+    ) as iter_entry_points:
+        algorithms = compare.discover_algorithms()
+        assert compare.discover_algorithms() is algorithms
+        assert iter_entry_points.call_count == 1
+
+    assert set(algorithms) == set(ALGORITHMS) | {"scaler"}
+    assert algorithms["dbscan"]["module"] == "ladar.api.algorithms.dbscan"
+    assert algorithms["scaler"]["category"] is None
+
+
+def test_get_algorithm_class():
+    """Test that algorithm classes are loaded by name and validated."""
+    with fake_entry_points(
+        ("scaler", "ladar.api.algorithms.minmaxscaler:MinMaxScaler"),
+        ("invalid", "ladar.api.algorithms.base:AlgorithmCategory"),
+        ("missing", "ladar.api.algorithms.not_a_module:Algorithm"),
+    ):
+        assert compare.get_algorithm_class("TFIDF").__name__ == "TFIDF"
+        assert compare.get_algorithm_class("scaler").__name__ == "MinMaxScaler"
+        for name in ["invalid", "missing", "unknown"]:
+            with pytest.raises(ValueError):
+                compare.get_algorithm_class(name)
@@ -0,0 +1,250 @@
+import random
+import string
+
+import numpy as np
+import pytest
+
+from ladar.api.distance import (
+    block_neighbors_graph,
+    character_histograms,
+    get_first_columns,
+    hierarchical_neighbors_graph,
+    normalized_distance,
+    plan_row_blocks,
+    radius_neighbors_graph,
+)
+
+
+@pytest.fixture
+def texts():
+    generator = random.Random(0)
+    return [
+        "".join(
+            generator.choices(string.ascii_lowercase[:6], k=generator.randint(0, 12))
+        )
+        for _ in range(60)
+    ]
+
+
+def exact_distances(texts):
+    return np.array(
+        [[normalized_distance(text, other) for other in texts] for text in texts],
+        dtype=np.float32,
+    )
+
+
+def test_normalized_distance():
+    """Test that distances are normalized by the longest text."""
+    assert normalized_distance("stop", "stop") == 0.0
+    assert normalized_distance("stop", "spot") == 0.5
+    assert normalized_distance("", "") == 0.0
+    assert normalized_distance("", "run") == 1.0
+
+
+def test_plan_row_blocks():
+    """Test that the rows are split into contiguous blocks with balanced pairs."""
+    ranges = plan_row_blocks(100, 4)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == 100
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+    pairs = [sum(100 - i - 1 for i in range(start, stop)) for start, stop in ranges]
+    # Blocks differ by less than the pairs of two rows
+    assert max(pairs) - min(pairs) < 2 * 100
+    assert plan_row_blocks(0, 4) == []
+    assert plan_row_blocks(1, 4) == [(0, 1)]
+
+
+def test_plan_row_blocks_of_groups():
+    """Test that the rows of the last group, without pairs, are not a block."""
+    firsts = get_first_columns([0] * 30 + [1] * 50 + [2] * 20)
+    ranges = plan_row_blocks(100, 4, firsts)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == 100
+    assert len(ranges) == 4
+    pairs = [sum(100 - firsts[i] for i in range(start, stop)) for start, stop in ranges]
+    assert max(pairs) - min(pairs) < 2 * 70
+
+
+def test_get_first_columns():
+    """Test that the rows start at the next group."""
+    assert get_first_columns([0, 0, 1, 2, 2]).tolist() == [2, 2, 3, 5, 5]
+    assert get_first_columns([]).tolist() == []
+    with pytest.raises(ValueError):
+        get_first_columns([0, 1, 0])
+
+
+@pytest.mark.parametrize("radius", [0.1, 0.3, 0.5])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_radius_neighbors_graph_pruned(texts, radius, jobs):
+    """
+    Test that pruning keeps every pair within the radius, with its exact distance,
+    and never reports a farther pair.
+    """
+    texts = texts + [text + "x" for text in texts[:20]] + ["éé" + texts[0]]
+    exact = exact_distances(texts)
+    pruned = radius_neighbors_graph(texts, radius, jobs=jobs).toarray()
+    full = radius_neighbors_graph(texts, radius, jobs=jobs, prune=False).toarray()
+
+    near = exact <= radius
+    np.fill_diagonal(near, False)
+    np.testing.assert_array_equal(pruned[near], exact[near])
+    assert not pruned[~near].any()
+    np.testing.assert_array_equal(pruned, full)
+
+
+def test_character_histograms():
+    """Test that the rare characters share a class."""
+    histograms = character_histograms(["aab", "abc", "d"], size=3)
+
+    np.testing.assert_array_equal(histograms, [[2, 1, 0], [1, 1, 1], [0, 0, 1]])
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_radius_neighbors_graph(texts, prune, jobs):
+    """
+    Test that the graph holds exactly the pairs within the radius, with their
+    distance, zero distances included.
+    """
+    texts = texts + texts[:5]
+    exact = exact_distances(texts)
+    graph = radius_neighbors_graph(texts, 0.4, jobs=jobs, prune=prune).tocoo()
+
+    near = exact <= 0.4
+    np.fill_diagonal(near, False)
+    stored = np.zeros_like(near)
+    stored[graph.row, graph.col] = True
+    np.testing.assert_array_equal(stored, near)
+    np.testing.assert_array_equal(graph.data, exact[graph.row, graph.col])
+    assert (graph.data == 0).any()
+
+
+def test_radius_neighbors_graph_empty():
+    """Test the graph of texts without near pairs."""
+    graph = radius_neighbors_graph(["abc", "xyz", "0123"], 0.1)
+
+    assert graph.shape == (3, 3)
+    assert graph.nnz == 0
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_radius_neighbors_graph_of_pairs(texts, jobs):
+    """Test that only the given pairs are compared."""
+    exact = exact_distances(texts)
+    pairs = np.array([[j, i] for i in range(len(texts)) for j in range(i % 7)])
+    graph = radius_neighbors_graph(texts, 0.6, jobs=jobs, pairs=pairs).tocoo()
+
+    stored = set(zip(graph.row.tolist(), graph.col.tolist()))
+    expected = {(i, j) for j, i in pairs.tolist() if i != j and exact[i, j] <= 0.6}
+    assert stored == expected | {(j, i) for i, j in expected}
+    np.testing.assert_array_equal(graph.data, exact[graph.row, graph.col])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_radius_neighbors_graph_of_groups(texts, jobs):
+    """Test that only the pairs of texts of different groups are compared."""
+    groups = np.repeat([0, 1, 2], [15, 30, 15])
+    graph = radius_neighbors_graph(texts, 0.5, jobs=jobs).tocoo()
+    cross = groups[graph.row] != groups[graph.col]
+    bipartite = radius_neighbors_graph(texts, 0.5, jobs=jobs, groups=groups).tocoo()
+
+    assert set(zip(bipartite.row.tolist(), bipartite.col.tolist())) == set(
+        zip(graph.row[cross].tolist(), graph.col[cross].tolist())
+    )
+    pairs = np.array([[0, 1], [0, 20], [20, 50]])
+    blocked = radius_neighbors_graph(texts, 1.0, pairs=pairs, groups=groups).tocoo()
+    assert set(zip(blocked.row.tolist(), blocked.col.tolist())) == {
+        (0, 20),
+        (20, 0),
+        (20, 50),
+        (50, 20),
+    }
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("groups", [None, np.repeat([0, 1], [30, 30])])
+def test_block_neighbors_graph(texts, jobs, groups):
+    """Test that the pairs of the texts of each block are compared once."""
+    # Three partitions, each compatible with itself and the next ones: the
+    # first and the last are not compatible
+    first, middle, last = np.arange(0, 20), np.arange(20, 40), np.arange(40, 60)
+    blocks = [
+        (first, np.concatenate([first, middle])),
+        (middle, np.arange(60)),
+        (last, np.concatenate([middle, last])),
+    ]
+    graph, compared = block_neighbors_graph(
+        texts, 0.5, blocks, jobs=jobs, groups=groups
+    )
+    pairs = np.array(
+        [
+            (i, j)
+            for i in range(60)
+            for j in range(i + 1, 60)
+            if (i >= 20 or j < 40) and (groups is None or groups[i] != groups[j])
+        ]
+    )
+    expected = radius_neighbors_graph(texts, 0.5, pairs=pairs)
+
+    assert compared == len(pairs)
+    np.testing.assert_array_equal(graph.toarray(), expected.toarray())
+
+
+def test_hierarchical_neighbors_graph_without_members(texts):
+    """Test that, without members, every pair of different groups is compared."""
+    groups = np.repeat([0, 1], [25, 35])
+    graph, compared = hierarchical_neighbors_graph(
+        texts, 0.5, [-1] * len(texts), groups
+    )
+    expected = radius_neighbors_graph(texts, 0.5, groups=groups)
+
+    assert compared >= 25 * 35
+    np.testing.assert_array_equal(graph.toarray(), expected.toarray())
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_hierarchical_neighbors_graph(jobs):
+    """Test that members are compared within matched parents, orphans globally."""
+    texts = [
+        # Group 0: a class with two methods, and a function
+        "queue",
+        "put item",
+        "get block",
+        "spawn function",
+        # Group 1: the same class, and a class matched with no other
+        "queues",
+        "put items",
+        "get blocks",
+        "zzzzzz",
+        "spawn function args",
+    ]
+    parents = [-1, 0, 0, -1, -1, 4, 4, -1, 7]
+    groups = [0, 0, 0, 0, 1, 1, 1, 1, 1]
+    graph, compared = hierarchical_neighbors_graph(
+        texts, 0.4, parents, groups, jobs=jobs
+    )
+    graph = graph.tocoo()
+    pairs = {(i, j) for i, j in zip(graph.row.tolist(), graph.col.tolist()) if i < j}
+
+    # The methods of the matched classes, and the orphan method of the class
+    # matched with no other
+    assert pairs == {(0, 4), (1, 5), (2, 6), (3, 8)}
+    exact = exact_distances(texts)
+    np.testing.assert_allclose(graph.data, exact[graph.row, graph.col])
+    # 2 * 3 top-level pairs, 2 * 2 pairs of members, fewer than 4 * 5 pairs
+    assert compared < 20
+
+
+def test_hierarchical_neighbors_graph_without_matches(texts):
+    """Test that, when no parent is matched, every text is compared as an orphan."""
+    groups = np.repeat([0, 1], [30, 30])
+    # Each group is a single class holding the other texts, far from each other
+    parents = np.repeat([0, 30], [30, 30])
+    parents[[0, 30]] = -1
+    texts = ["aaaaaaaaaaaa", *texts[1:30], "zzzzzzzzzzzz", *texts[31:]]
+    graph, compared = hierarchical_neighbors_graph(texts, 0.5, parents, groups)
+    expected = radius_neighbors_graph(texts, 0.5, groups=groups)
+
+    # The pair of classes is compared once, with the other orphans
+    assert compared == 30 * 30
+    np.testing.assert_array_equal(graph.toarray(), expected.toarray())
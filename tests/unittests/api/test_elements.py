@@ -0,0 +1,149 @@
+import pytest
+
+from ladar.api.elements import (
+    collect_elements,
+    get_arity,
+    get_element_name,
+    get_parents,
+    iter_elements,
+    iter_record_elements,
+    split_words,
+)
+from ladar.api.extract import StreamedStructure, iter_api_records
+from ladar.common.io import save
+
+STRUCTURE = {
+    "asyncio.eventloop": {
+        "type": "class",
+        "docstring": "The event loop.",
+        "members": {
+            "stop": {"type": "method", "signature": "(self)"},
+            "loop": {"type": "attribute"},
+        },
+    },
+    "asyncio.run": {"type": "function", "signature": "(main, *, debug=None)"},
+    "asyncio.events": {"type": "module", "members": {}},
+}
+
+
+def test_iter_elements():
+    """Test that nested classes, functions and methods are iterated."""
+    assert [path for path, _ in iter_elements(STRUCTURE)] == [
+        "asyncio.eventloop",
+        "asyncio.eventloop.stop",
+        "asyncio.run",
+    ]
+
+
+def test_get_element_name():
+    """Test that the package is left out of the names."""
+    assert get_element_name("asyncio.eventloop.stop") == "eventloop.stop"
+    assert get_element_name("asyncio") == "asyncio"
+
+
+def test_collect_elements():
+    """Test that the elements of several structures are collected in order."""
+    elements = collect_elements([STRUCTURE, {"other.run": {"type": "function"}}])
+
+    assert [(element["structure"], element["path"]) for element in elements] == [
+        (0, "asyncio.eventloop"),
+        (0, "asyncio.eventloop.stop"),
+        (0, "asyncio.run"),
+        (1, "other.run"),
+    ]
+    assert elements[2]["text"] == "run (main, *, debug=None)"
+    assert elements[3]["text"] == "run"
+
+    with_docstrings = collect_elements([STRUCTURE], include_docstrings=True)
+    assert with_docstrings[0]["text"] == "eventloop The event loop."
+
+    with pytest.raises(ValueError):
+        collect_elements([STRUCTURE, {}])
+
+
+def test_split_words():
+    """Test that identifiers are split into words, without meaningless ones."""
+    assert split_words("eventloop.run_until_complete (self, future)") == [
+        "eventloop",
+        "run",
+        "until",
+        "complete",
+        "future",
+    ]
+    assert split_words("HTTPServer.getEventLoop(*args, **kwargs)") == [
+        "http",
+        "server",
+        "get",
+        "event",
+        "loop",
+    ]
+
+
+def test_collect_elements_partitions():
+    """Test that the elements hold their type and arity."""
+    elements = collect_elements([STRUCTURE])
+
+    assert [(element["type"], element["arity"]) for element in elements] == [
+        ("class", None),
+        ("method", 0),
+        ("function", 2),
+    ]
+
+
+def test_get_parents():
+    """Test that members point to their parent, in their own structure."""
+    elements = collect_elements([STRUCTURE, STRUCTURE])
+
+    assert get_parents(elements) == [-1, 0, -1, -1, 3, -1]
+
+
+@pytest.mark.parametrize(
+    "signature, arity",
+    [
+        (None, None),
+        ("", None),
+        ("()", 0),
+        ("(self)", 0),
+        ("(self, item, block=True)", 2),
+        ("(cls, *args, **kwargs)", 2),
+        ("(a, /, b, *, c=(1, 2), d=',')", 4),
+        ("(x: Dict[str, int]) -> Tuple[int, int]", 1),
+    ],
+)
+def test_get_arity(signature, arity):
+    """Test that the parameters are counted, the implicit ones left out."""
+    assert get_arity(signature) == arity
+
+
+def test_iter_record_elements_skips_other_records():
+    """Test that the records without a path or of other types are skipped."""
+    records = [
+        {"name": "module"},
+        {"path": ["queue"], "type": "class"},
+        {"path": ["queue", "put"], "type": "method"},
+        {"path": ["VERSION"], "type": "constant"},
+    ]
+    assert [path for path, _ in iter_record_elements(records)] == [
+        "queue",
+        "queue.put",
+    ]
+
+
+def test_iter_elements_of_streamed_structure(tmp_path):
+    """Test that a streamed structure has the elements of the loaded one."""
+    path = str(tmp_path / "api.jsonl")
+    save(path, iter_api_records({"ladar": {}, "structure": STRUCTURE}))
+    streamed = StreamedStructure(path)
+
+    assert streamed
+    assert streamed.load() == STRUCTURE
+    streamed_elements = list(iter_elements(streamed))
+    elements = list(iter_elements(STRUCTURE))
+    assert [path for path, _ in streamed_elements] == [path for path, _ in elements]
+    for (_, streamed_member), (_, member) in zip(streamed_elements, elements):
+        assert streamed_member["type"] == member["type"]
+        assert streamed_member.get("signature") == member.get("signature")
+
+    empty = str(tmp_path / "empty.jsonl")
+    save(empty, [{"ladar": {}}])
+    assert not StreamedStructure(empty)
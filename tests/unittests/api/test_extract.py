@@ -1,10 +1,21 @@
 import inspect
+import os
 import sys
+import time
 from unittest.mock import Mock, patch
 
 import pytest
 
-from ladar.api.extract import analyze_stdlib, extract_api_from_module, is_async_function
+from ladar.api.extract import (
+    analyze_stdlib,
+    api_from_records,
+    extract_api_from_module,
+    generate_uid,
+    is_async_function,
+    iter_api_members,
+    iter_api_records,
+    iter_stdlib,
+)
 
 
 # Mock module for testing
@@ -127,6 +138,44 @@ def test_analyze_stdlib_module_import_error():
         assert api == {}, "The result should be an empty dictionary if all imports fail"
 
 
+def test_analyze_stdlib_parallel_matches_sequential():
+    """Test that the process pool mode merges the same structures as the sequential mode."""
+    modules = ["json", "colorsys", "not_a_stdlib_module", "abc"]
+    with patch("ladar.api.extract.list_stdlib_modules", return_value=modules):
+        sequential = analyze_stdlib(include_private=False)
+        parallel = analyze_stdlib(include_private=False, jobs=2)
+
+    assert list(parallel) == ["json", "colorsys", "abc"], "Order should be stable"
+    assert parallel.keys() == sequential.keys()
+    for module_name in parallel:
+        assert parallel[module_name].keys() == sequential[module_name].keys()
+
+
+def misbehaving_analysis(module_name, **options):
+    """Analysis run in the worker processes, crashing or hanging on some modules."""
+    if module_name == "crashing":
+        os._exit(1)
+    if module_name == "hanging":
+        time.sleep(60)
+    if module_name == "failing":
+        raise RuntimeError("broken module")
+    return {f"{module_name}.function": {"type": "function"}}
+
+
+@pytest.mark.parametrize("batch_size", [None, 2])
+def test_iter_stdlib_skips_misbehaving_modules(batch_size):
+    """Test that a crashing or hanging module is skipped, not the other ones."""
+    modules = ["a", "crashing", "b", "hanging", "c", "failing", "d", "e", "f"]
+    start = time.monotonic()
+    with patch("ladar.api.extract.list_stdlib_modules", return_value=modules), patch(
+        "ladar.api.extract.analyze_stdlib_module", misbehaving_analysis
+    ):
+        results = list(iter_stdlib(jobs=3, batch_size=batch_size, timeout=2))
+
+    assert [name for name, _ in results] == ["a", "b", "c", "d", "e", "f"]
+    assert time.monotonic() - start < 20
+
+
 def test_extract_api_from_module_with_docstrings(mock_module):
     """Test that docstrings are included when include_docstrings is True."""
     api = extract_api_from_module(
@@ -309,3 +358,62 @@ def test_extract_api_from_module_with_uids(mock_module):
     assert (
         "uid" in api["MockModule.NestedClass"]["members"]["__init__"]
     ), "UID should be present for __init__"
+
+
+def test_extract_api_from_module_uids_are_deterministic(mock_module):
+    """
+    Test that UIDs are stable across extractions and unique per member.
+
+    Args:
+        mock_module (MockModule): The mock module for testing purposes.
+    """
+    api = extract_api_from_module(mock_module, include_private=True)
+    same_api = extract_api_from_module(mock_module, include_private=True)
+
+    assert api == same_api, "Two extractions of the same API should be identical"
+
+    members = api["mockmodule.nestedclass"]["members"]
+    uids = [api["mockmodule.nestedclass"]["uid"]]
+    uids.extend(member["uid"] for member in members.values())
+    assert len(set(uids)) == len(uids), "Each member should have its own UID"
+
+
+def test_generate_uid():
+    """Test that UIDs depend on the qualified name, the kind and the signature."""
+    uid = generate_uid("asyncio.sleep", "async function", "(delay, result=none)")
+
+    assert uid == generate_uid(
+        "asyncio.sleep", "async function", "(delay, result=none)"
+    )
+    assert uid != generate_uid("asyncio.sleep", "function", "(delay, result=none)")
+    assert uid != generate_uid("asyncio.sleep", "async function", "(delay)")
+    assert uid != generate_uid(
+        "eventlet.sleep", "async function", "(delay, result=none)"
+    )
+
+
+def test_iter_api_members(mock_module):
+    """Test that members are streamed as records locating them in the structure."""
+    records = list(iter_api_members(mock_module, disable_normalization=True))
+    paths = [record["path"] for record in records]
+
+    assert ["MockModule.NestedClass"] in paths
+    assert ["MockModule.NestedClass", "method"] in paths
+    assert paths.index(["MockModule.NestedClass"]) < paths.index(
+        ["MockModule.NestedClass", "method"]
+    ), "Class records should come before their methods"
+
+
+def test_api_records_roundtrip(mock_module):
+    """Test that an extracted API can be split into records and built back."""
+    api = {
+        "ladar": {"module_name": "mock"},
+        "structure": extract_api_from_module(mock_module, include_private=True),
+    }
+    assert api_from_records(iter_api_records(api)) == api
+
+    stdlib_api = {
+        "ladar": {"module_name": "stdlib"},
+        "structure": {"mock": api["structure"]},
+    }
+    assert api_from_records(iter_api_records(stdlib_api, nested=True)) == stdlib_api
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from ladar.api.elements import iter_elements
+from ladar.api.hashing import (
+    DocumentFrequencies,
+    get_document,
+    hash_documents,
+    iter_hashed_batches,
+)
+
+STRUCTURE = {
+    "queue": {
+        "type": "class",
+        "docstring": "A thread safe queue.",
+        "members": {
+            "put": {"type": "method", "signature": "(self, item)"},
+            "get": {"type": "method", "signature": "(self, block=True)"},
+        },
+    },
+    "spawn": {"type": "function", "signature": "(func, *args)"},
+    "VERSION": {"type": "constant"},
+}
+
+
+def test_get_document_splits_words():
+    """Test that the documents are the words of the elements."""
+    member = {"type": "function", "signature": "(loop)"}
+    assert get_document("getEventLoop", member) == "get event loop loop"
+
+
+def test_hash_documents_counts_words():
+    """Test that the hashed counts do not depend on the other documents."""
+    counts = hash_documents(["queue put item", "queue queue"], n_features=64)
+    alone = hash_documents(["queue queue"], n_features=64)
+
+    assert counts.shape == (2, 64)
+    assert counts.dtype == np.float32
+    assert counts[1].sum() == 2
+    np.testing.assert_array_equal(counts[1].toarray(), alone.toarray())
+
+
+@pytest.mark.parametrize("jobs, batch_size", [(1, 1), (1, 2), (2, 1)])
+def test_iter_hashed_batches_is_identical(jobs, batch_size):
+    """Test that the batches and processes give the features of a single pass."""
+    elements = list(iter_elements(STRUCTURE))
+    expected = hash_documents(
+        [get_document(path, member) for path, member in elements], n_features=128
+    )
+
+    batches = list(
+        iter_hashed_batches(
+            iter(elements), n_features=128, jobs=jobs, batch_size=batch_size
+        )
+    )
+
+    assert len(batches) == -(-len(elements) // batch_size)
+    assert [path for paths, _ in batches for path in paths] == [
+        path for path, _ in elements
+    ]
+    counts = np.vstack([batch.toarray() for _, batch in batches])
+    np.testing.assert_array_equal(counts, expected.toarray())
+
+
+def test_document_frequencies_match_scikit_learn():
+    """Test that the online IDF weights are those of scikit-learn."""
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    counts = hash_documents(["queue put", "queue get", "spawn"], n_features=32)
+    frequencies = DocumentFrequencies(32)
+    frequencies.update(counts[:2])
+    frequencies.update(counts[2:])
+
+    assert frequencies.documents == 3
+    expected = TfidfTransformer().fit_transform(counts)
+    np.testing.assert_allclose(
+        frequencies.transform(counts).toarray(), expected.toarray(), rtol=1e-6
+    )
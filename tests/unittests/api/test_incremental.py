@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+
+from ladar.api.incremental import extract_incrementally, fingerprint_file
+from ladar.api.static import extract_api_statically
+
+
+@pytest.fixture
+def package(tmp_path):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("def root():\n    pass\n")
+    (package / "first.py").write_text("def first():\n    pass\n")
+    (package / "second.py").write_text(
+        "class Second:\n    def run(self):\n        pass\n"
+    )
+    return package
+
+
+def test_fingerprint_file_skips_hash_when_unchanged(tmp_path):
+    """Test that the content is only hashed when the mtime or the size changed."""
+    path = tmp_path / "module.py"
+    path.write_text("x = 1\n")
+
+    fingerprint = fingerprint_file(str(path))
+    previous = dict(fingerprint, sha256="previous")
+    assert fingerprint_file(str(path), previous)["sha256"] == "previous"
+
+    path.write_text("x = 12\n")
+    assert fingerprint_file(str(path), previous)["sha256"] != "previous"
+
+
+def test_extract_incrementally(package):
+    """Test that only the changed modules are re-extracted."""
+    structure, fingerprints, changed = extract_incrementally("pkg", str(package))
+    assert changed == ["pkg", "pkg.first", "pkg.second"]
+    assert structure == extract_api_statically("pkg", str(package))
+
+    structure, fingerprints, changed = extract_incrementally(
+        "pkg", str(package), structure, fingerprints
+    )
+    assert changed == []
+    assert structure == extract_api_statically("pkg", str(package))
+
+    (package / "first.py").write_text("def renamed(a, b):\n    pass\n")
+    (package / "second.py").unlink()
+    (package / "third.py").write_text("def third():\n    pass\n")
+
+    structure, fingerprints, changed = extract_incrementally(
+        "pkg", str(package), structure, fingerprints
+    )
+    assert changed == ["pkg.first", "pkg.third"]
+    assert structure == extract_api_statically("pkg", str(package))
+    assert "pkg.second" not in fingerprints["modules"]
+
+
+def test_extract_incrementally_options_change(package):
+    """Test that changing the extraction options triggers a full extraction."""
+    structure, fingerprints, _ = extract_incrementally("pkg", str(package))
+
+    structure, fingerprints, changed = extract_incrementally(
+        "pkg", str(package), structure, fingerprints, disable_normalization=True
+    )
+    assert changed == ["pkg", "pkg.first", "pkg.second"]
+    assert "pkg.second.Second" in structure
+
+
+@pytest.mark.parametrize(
+    "key, target, value",
+    [
+        ("ladar", "ladar.__version__", "0.0.0"),
+        ("schema", "ladar.common.cache.CACHE_SCHEMA", 0),
+    ],
+)
+def test_extract_incrementally_version_change(package, key, target, value):
+    """
+    Test that the structures of another version of ladar, or of another output
+    format, are not reused.
+    """
+    structure, fingerprints, _ = extract_incrementally("pkg", str(package))
+    stale = dict(structure, **{"pkg.first.first": {"type": "stale"}})
+
+    with patch(target, value):
+        _, previous, _ = extract_incrementally("pkg", str(package))
+    structure, fingerprints, changed = extract_incrementally(
+        "pkg", str(package), stale, previous
+    )
+    assert changed == ["pkg", "pkg.first", "pkg.second"]
+    assert structure == extract_api_statically("pkg", str(package))
+    assert previous[key] == value
+    assert fingerprints[key] != value
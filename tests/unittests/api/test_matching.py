@@ -0,0 +1,100 @@
+import pytest
+
+from ladar.api.matching import (
+    hash_join,
+    match_tiered,
+    name_arity_key,
+    name_key,
+    nearest_matches,
+)
+
+
+def test_keys():
+    """Test that the keys are normalized, without package or parents."""
+    assert name_key("asyncio.Queue.get_nowait", {}) == "queue.getnowait"
+    assert name_key("eventlet.queue.getNowait", {}) == "queue.getnowait"
+    assert name_arity_key("asyncio.Queue.put", {"signature": "(self, item)"}) == (
+        "put",
+        1,
+    )
+
+
+def test_hash_join_skips_ambiguous_keys():
+    """Test that only the keys unique on both sides are joined."""
+    assert hash_join(["a", "b", "c", "c", "d"], ["d", "b", "c", "a", "a"]) == [
+        (1, 1),
+        (4, 0),
+    ]
+
+
+def test_nearest_matches():
+    """Test that each text is matched to its nearest text within the distance."""
+    matches = nearest_matches(["queue put", "spawn"], ["spawn_n", "queue puts"], 0.3)
+    assert [(i, j) for i, j, _ in matches] == [(0, 1), (1, 0)]
+    assert matches[0][2] == pytest.approx(0.1)
+    assert nearest_matches(["queue"], ["zzzzz"], 0.3) == []
+    assert nearest_matches([], ["queue"], 0.3) == []
+
+
+def test_nearest_matches_one_to_one():
+    """
+    Test that a target is matched once, to its nearest source, and that the other
+    sources fall back to their next nearest target.
+    """
+    matches = nearest_matches(
+        ["queue_get", "queue_gets", "queue_getx"], ["queue_gets", "queue_getxy"], 0.3
+    )
+
+    assert [(i, j) for i, j, _ in matches] == [(1, 0), (2, 1)]
+    assert matches[0][2] == 0.0
+    # Ties go to the first source
+    assert [(i, j) for i, j, _ in nearest_matches(["ab", "ab"], ["ab"], 0.3)] == [
+        (0, 0)
+    ]
+
+
+SOURCE = [
+    ("lib.Queue", {"type": "class"}),
+    ("lib.Queue.put", {"type": "method", "signature": "(self, item)"}),
+    ("lib.Queue.get", {"type": "method", "signature": "(self)"}),
+    ("lib.spawn", {"type": "function", "signature": "(func, *args)"}),
+    ("lib.sleep", {"type": "function", "signature": "(seconds)"}),
+]
+TARGET = [
+    ("lib.Queue", {"type": "class"}),
+    ("lib.Queue.put", {"type": "method", "signature": "(self, item)"}),
+    ("lib.queue.Queue.get", {"type": "method", "signature": "(self)"}),
+    ("lib.spawn_n", {"type": "function", "signature": "(func, *args)"}),
+    ("lib.exit", {"type": "function", "signature": "()"}),
+]
+
+
+def test_match_tiered():
+    """Test that each tier matches the elements left by the previous ones."""
+    matches, stats = match_tiered(SOURCE, TARGET, max_distance=0.3)
+
+    assert list(matches) == ["lib.Queue", "lib.Queue.put", "lib.Queue.get", "lib.spawn"]
+    assert matches["lib.Queue.put"] == {
+        "path": "lib.Queue.put",
+        "tier": "name",
+        "distance": 0.0,
+    }
+    assert matches["lib.Queue.get"]["tier"] == "name_arity"
+    assert matches["lib.Queue.get"]["path"] == "lib.queue.Queue.get"
+    assert matches["lib.spawn"]["tier"] == "fuzzy"
+    assert matches["lib.spawn"]["path"] == "lib.spawn_n"
+    assert 0 < matches["lib.spawn"]["distance"] <= 0.3
+    assert [(tier["tier"], tier["matched"]) for tier in stats] == [
+        ("name", 2),
+        ("name_arity", 1),
+        ("fuzzy", 1),
+    ]
+    assert all(tier["seconds"] >= 0 for tier in stats)
+
+
+def test_match_tiered_without_fuzzy():
+    """Test that the fuzzy tier can be skipped."""
+    matches, stats = match_tiered(SOURCE, TARGET, fuzzy=False)
+
+    assert "lib.spawn" not in matches
+    assert [tier["tier"] for tier in stats] == ["name", "name_arity"]
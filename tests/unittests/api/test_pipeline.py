@@ -1,6 +1,12 @@
+import subprocess
+import sys
+from unittest.mock import patch
+
 import pytest
 
-from ladar.api.pipeline import parse_step
+from ladar.api.extract import StreamedStructure, iter_api_records
+from ladar.api.pipeline import parse, parse_step, parse_step_params, run, split_steps
+from ladar.common.io import save
 
 
 def test_parse_step_no_params():
@@ -10,3 +16,88 @@ def test_parse_step_no_params():
     assert (
         algorithm_name == "minmaxscaler"
     ), "Algorithm name should be normalized to lowercase."
+
+
+def test_parse_step_params():
+    """Test parsing the parameters given inline to a step."""
+    assert parse_step_params("normalize:minmaxscaler") == {}
+    assert parse_step_params("cluster:dbscan()") == {}
+    assert parse_step_params("cluster:dbscan(eps=0.3, min_samples=2)") == {
+        "eps": 0.3,
+        "min_samples": 2,
+    }
+    assert parse_step_params("normalize:minmaxscaler(feature_range=(0, 10))") == {
+        "feature_range": (0, 10)
+    }
+    for step_str in ["cluster:dbscan(0.3)", "cluster:dbscan(eps=x)", "dbscan"]:
+        with pytest.raises(ValueError):
+            parse_step_params(step_str)
+
+
+def test_split_steps():
+    """Test that pipelines are split on the commas outside of parameters."""
+    assert split_steps("extract:tfidf, cluster:dbscan(eps=0.3, min_samples=2)") == [
+        "extract:tfidf",
+        "cluster:dbscan(eps=0.3, min_samples=2)",
+    ]
+
+
+def test_parse_only_imports_used_algorithms():
+    """Test that parsing a pipeline only imports the algorithms of its steps."""
+    code = (
+        "import sys; from ladar.api.pipeline import parse; "
+        "steps = parse('normalize:MinMaxScaler(feature_range=(0, 10))'); "
+        "assert steps[0]['params'] == {'feature_range': (0, 10)}; "
+        "print(sorted(m for m in ['sklearn', 'numpy', 'Levenshtein'] "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_run_params_precedence():
+    """Test that inline parameters take precedence over the command line ones."""
+
+    class Recorder:
+        def __init__(self, **params):
+            self.params = params
+
+        def transform(self, data):
+            return self.params
+
+    steps = [{"name": "recorder", "algorithm": Recorder, "params": {"b": 3}}]
+    params = {"recorder": {"a": 1, "b": 2}, "other": {"c": 4}}
+    assert run(steps, [], params) == {"a": 1, "b": 3}
+
+
+STRUCTURE = {
+    "queue": {
+        "type": "class",
+        "members": {
+            "put": {"type": "method", "signature": "(self, item)"},
+            "get": {"type": "method", "signature": "(self, block=True)"},
+        },
+    },
+    "spawn": {"type": "function", "signature": "(func, *args)"},
+}
+
+
+def test_run_streams_structures(tmp_path):
+    """Test that streamed structures are only loaded for the steps needing them."""
+    paths = []
+    for name in ["old", "new"]:
+        paths.append(str(tmp_path / f"{name}.jsonl"))
+        save(paths[-1], iter_api_records({"ladar": {}, "structure": STRUCTURE}))
+    structures = [StreamedStructure(path) for path in paths]
+
+    with patch.object(StreamedStructure, "load", side_effect=AssertionError):
+        streamed = run(parse("cluster:dbscan(eps=0.1)"), structures, {})
+    loaded = run(parse("cluster:dbscan(eps=0.1)"), [STRUCTURE, STRUCTURE], {})
+    assert streamed["detailed_mapping"] == loaded["detailed_mapping"]
+
+    # The structure level of TF-IDF compares whole structures
+    with patch.object(StreamedStructure, "load", wraps=structures[0].load) as load:
+        run(parse("extract:tfidf"), structures, {})
+    assert load.call_count == 2
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import scipy.sparse
+
+from ladar.api import similarity
+from ladar.api.similarity import select_top_k, top_k_similar
+
+
+@pytest.fixture
+def features():
+    return scipy.sparse.random(120, 40, density=0.1, format="csr", random_state=0)
+
+
+def brute_force_top_k(source, target, k):
+    source = source.toarray()
+    target = target.toarray()
+    norms = np.linalg.norm(source, axis=1, keepdims=True)
+    source = np.divide(source, norms, out=np.zeros_like(source), where=norms > 0)
+    norms = np.linalg.norm(target, axis=1, keepdims=True)
+    target = np.divide(target, norms, out=np.zeros_like(target), where=norms > 0)
+    similarities = source @ target.T
+    return [
+        sorted(value for value in row if value > 0)[::-1][:k] for row in similarities
+    ]
+
+
+@pytest.mark.parametrize("sparse", [True, False])
+def test_select_top_k(sparse):
+    """Test that the largest values of each row are selected, best first."""
+    matrix = np.array(
+        [[0.1, 0.9, 0.0, 0.5], [0.0, 0.0, 0.0, 0.0], [0.3, 0.0, 0.0, 0.0]],
+        dtype=np.float32,
+    )
+    if sparse:
+        matrix = scipy.sparse.csr_matrix(matrix)
+    indices, values = select_top_k(matrix, 2)
+
+    assert indices.tolist() == [[1, 3], [-1, -1], [0, -1]]
+    np.testing.assert_allclose(values, [[0.9, 0.5], [0, 0], [0.3, 0]])
+    indices, _ = select_top_k(matrix, 2, min_similarity=0.4)
+    assert indices.tolist() == [[1, 3], [-1, -1], [-1, -1]]
+    assert select_top_k(matrix, 10)[0].shape == (3, 10)
+
+
+def test_top_k_similar(features, monkeypatch):
+    """Test the matches against a brute force computation, by small blocks."""
+    monkeypatch.setattr(similarity, "BLOCK_ENTRIES", 7 * 60)
+    source, target = features[:60], features[60:]
+    indices, values = top_k_similar(source, target, k=3)
+
+    assert indices.shape == values.shape == (60, 3)
+    expected = brute_force_top_k(source, target, 3)
+    for row_indices, row_values, row_expected in zip(indices, values, expected):
+        found = [value for index, value in zip(row_indices, row_values) if index >= 0]
+        np.testing.assert_allclose(found, row_expected, rtol=1e-5)
+    # The matches are the rows with these similarities
+    dense = brute_force_top_k(source[:1], target[indices[0, :1]], 1)
+    np.testing.assert_allclose(dense[0], values[0, :1], rtol=1e-5)
@@ -0,0 +1,139 @@
+import ast
+import inspect
+import textwrap
+import types
+
+import pytest
+
+from ladar.api.extract import extract_api_from_module
+from ladar.api.static import (
+    extract_api_from_source,
+    extract_api_statically,
+    find_local_source,
+    format_signature,
+    list_source_files,
+)
+
+SOURCE = textwrap.dedent(
+    '''
+    """Sample module."""
+
+
+    def sync_func(a, b: int = 1, *args, c, d="x", **kwargs) -> str:
+        """Synchronous function."""
+
+
+    async def async_func(a, /, b):
+        """Asynchronous function."""
+
+
+    def _private_func():
+        pass
+
+
+    class SampleClass:
+        """Sample class."""
+
+        def __init__(self, value):
+            """Initialization method."""
+
+        def method(self, x, y=None):
+            """Synchronous method."""
+
+        async def async_method(self):
+            pass
+
+        @classmethod
+        def build(cls, value):
+            pass
+
+        @staticmethod
+        def helper(value):
+            pass
+
+        @property
+        def value(self):
+            pass
+
+        def __str__(self):
+            pass
+    '''
+)
+
+
+def load_source(module_name, source):
+    module = types.ModuleType(module_name)
+    exec(compile(source, module_name, "exec"), module.__dict__)
+    return module
+
+
+@pytest.mark.parametrize("disable_normalization", [True, False])
+def test_static_extraction_matches_dynamic_extraction(disable_normalization):
+    """Test that parsing the sources produces the same structure as inspecting the module."""
+    module = load_source("sample", SOURCE)
+
+    dynamic = extract_api_from_module(
+        module, disable_normalization=disable_normalization
+    )
+    static = extract_api_from_source(
+        SOURCE, "sample", disable_normalization=disable_normalization
+    )
+
+    assert static == dynamic
+
+
+@pytest.mark.parametrize(
+    "definition",
+    [
+        "def f(): pass",
+        "def f(a, b=1, *args, c, d: int = 2, **kwargs) -> None: pass",
+        "def f(a, /, b, *, c): pass",
+        "def f(a: 'str' = None): pass",
+    ],
+)
+def test_format_signature(definition):
+    """Test that signatures are formatted like inspect.signature does."""
+    node = ast.parse(definition).body[0]
+    module = load_source("sample", definition)
+    expected = str(inspect.signature(module.f))
+    assert format_signature(node.args, node.returns) == expected
+
+
+def test_extract_api_statically_package(tmp_path):
+    """Test that the submodules of a package are parsed and reported as modules."""
+    package = tmp_path / "project" / "src" / "pkg"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text("def root():\n    pass\n")
+    (package / "mod.py").write_text('"""Module."""\ndef leaf():\n    pass\n')
+    (package / "_private.py").write_text("def hidden():\n    pass\n")
+    (package / "sub" / "__init__.py").write_text("class Sub:\n    pass\n")
+
+    module_name, source_path = find_local_source(str(package))
+    assert [name for name, _ in list_source_files(module_name, source_path)] == [
+        "pkg",
+        "pkg.mod",
+        "pkg.sub",
+    ]
+
+    api = extract_api_statically(
+        module_name, source_path, disable_normalization=True, jobs=2
+    )
+    assert api["pkg.root"]["type"] == "function"
+    assert api["pkg.mod"]["type"] == "module"
+    assert api["pkg.mod"]["docstring"] == "Module."
+    assert api["pkg.mod.leaf"]["signature"] == "()"
+    assert api["pkg.sub.Sub"]["type"] == "class"
+    assert "pkg._private.hidden" not in api
+
+
+def test_find_local_source_project_root(tmp_path):
+    """Test that a project root is resolved to its package."""
+    project = tmp_path / "pkg"
+    (project / "src" / "pkg").mkdir(parents=True)
+    (project / "pyproject.toml").write_text("")
+    (project / "src" / "pkg" / "__init__.py").write_text("")
+
+    assert find_local_source(str(project)) == ("pkg", str(project / "src" / "pkg"))
+
+    with pytest.raises(ImportError):
+        find_local_source(str(tmp_path))
@@ -0,0 +1,89 @@
+import io
+import os
+import venv
+
+import pytest
+
+import ladar.common.venv as temp_env
+from ladar.api.extract import api_from_records
+from ladar.api.worker import (
+    Worker,
+    WorkerError,
+    extract_in_environment,
+    read_frame,
+    write_frame,
+)
+
+SAMPLE_MODULE = '''
+print("printed at import time")
+
+try:
+    import yaml
+except ImportError:
+    def isolated():
+        """The packages of ladar are not importable."""
+else:
+    def not_isolated():
+        pass
+
+
+class Sample:
+    def method(self, value):
+        pass
+'''
+
+
+@pytest.fixture(scope="module")
+def environment(tmp_path_factory):
+    env_dir = str(tmp_path_factory.mktemp("env"))
+    venv.create(env_dir, with_pip=False)
+    site_packages = temp_env.get_site_packages(env_dir)
+    with open(os.path.join(site_packages, "ladar_sample.py"), "w") as f:
+        f.write(SAMPLE_MODULE)
+    with open(os.path.join(site_packages, "ladar_slow.py"), "w") as f:
+        f.write("import time\ntime.sleep(30)\n")
+    return temp_env.get_python_executable(env_dir)
+
+
+def test_frames_roundtrip():
+    """Test that messages are framed with a 4-byte big-endian length."""
+    stream = io.BytesIO()
+    write_frame(stream, {"type": "done", "count": 1})
+    write_frame(stream, {"type": "records", "records": [{"path": ["a"]}]})
+
+    assert stream.getvalue()[:4] == len(b'{"type":"done","count":1}').to_bytes(4, "big")
+    stream.seek(0)
+    assert read_frame(stream) == {"type": "done", "count": 1}
+    assert read_frame(stream) == {"type": "records", "records": [{"path": ["a"]}]}
+    assert read_frame(stream) is None
+
+    truncated = io.BytesIO(stream.getvalue()[:-1])
+    assert read_frame(truncated) == {"type": "done", "count": 1}
+    with pytest.raises(EOFError):
+        read_frame(truncated)
+
+
+def test_extract_in_environment(environment):
+    """Test that the module is extracted in the interpreter of the environment."""
+    api = api_from_records(extract_in_environment(environment, "ladar_sample"))
+
+    assert api["ladar"]["module_name"] == "ladar_sample"
+    assert set(api["structure"]) == {"ladarsample.isolated", "ladarsample.sample"}
+    assert "method" in api["structure"]["ladarsample.sample"]["members"]
+
+
+def test_worker_serves_several_requests(environment):
+    """Test that a worker can extract several modules, and reports errors."""
+    with Worker(environment) as worker:
+        with pytest.raises(WorkerError, match="ModuleNotFoundError"):
+            list(worker.extract("not_an_installed_module"))
+        records = list(worker.extract("ladar_sample", include_docstrings=False))
+
+    assert records[0]["ladar"]["module_name"] == "ladar_sample"
+    assert all("docstring" not in record for record in records[1:])
+
+
+def test_worker_timeout(environment):
+    """Test that a worker is killed after its timeout."""
+    with pytest.raises(WorkerError, match="timed out"):
+        list(extract_in_environment(environment, "ladar_slow", timeout=0.5))
@@ -0,0 +1,116 @@
+import argparse
+import os
+
+import pytest
+
+import ladar
+import ladar.common.cache as cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_make_key_is_stable():
+    """Test that keys only depend on the inputs, not on their order."""
+    key = cache.make_key(module="yaml", version="6.0.2", include_private=False)
+    same_key = cache.make_key(include_private=False, version="6.0.2", module="yaml")
+    other_key = cache.make_key(module="yaml", version="6.0.2", include_private=True)
+
+    assert key == same_key
+    assert key != other_key
+
+
+def test_get_put_roundtrip(cache_dir):
+    """Test that a stored structure is returned on the next lookup."""
+    key = cache.make_key(module="json")
+    content = {"ladar": {"module_name": "json"}, "structure": {"json.dumps": {}}}
+
+    assert cache.get(key, cache_dir=cache_dir) is None
+    cache.put(key, content, inputs={"module": "json"}, cache_dir=cache_dir)
+    assert cache.get(key, cache_dir=cache_dir) == content
+
+    entries = cache.list_entries(cache_dir=cache_dir)
+    assert [entry["key"] for entry in entries] == [key]
+    assert cache.describe_entry(entries[0]) == {"module": "json"}
+
+
+def test_prune_evicts_least_recently_used(cache_dir):
+    """Test that pruning evicts the least recently used entries first."""
+    for index, name in enumerate(["old", "recent", "newest"]):
+        key = cache.make_key(module=name)
+        cache.put(key, {"data": "x" * 100}, cache_dir=cache_dir)
+        path = os.path.join(cache.get_extraction_cache_dir(cache_dir), f"{key}.json")
+        os.utime(path, (1000 + index, 1000 + index))
+
+    # Reading an entry makes it the most recently used one
+    cache.get(cache.make_key(module="old"), cache_dir=cache_dir)
+
+    entry_size = cache.list_entries(cache_dir=cache_dir)[0]["size"]
+    evicted = cache.prune(max_size=2 * entry_size, cache_dir=cache_dir)
+
+    assert [entry["key"] for entry in evicted] == [cache.make_key(module="recent")]
+    assert cache.get(cache.make_key(module="old"), cache_dir=cache_dir) is not None
+
+
+def test_clear(cache_dir):
+    """Test that clearing the cache removes every entry."""
+    cache.put(cache.make_key(module="json"), {}, cache_dir=cache_dir)
+    cache.clear(cache_dir=cache_dir)
+    assert cache.list_entries(cache_dir=cache_dir) == []
+
+
+def test_source_fingerprint_tracks_changes(tmp_path):
+    """Test that the source fingerprint changes when a source file changes."""
+    package = tmp_path / "package"
+    package.mkdir()
+    (package / "__init__.py").write_text("def foo():\n    pass\n")
+
+    fingerprint = cache.source_fingerprint(str(package))
+    assert fingerprint == cache.source_fingerprint(str(package))
+
+    (package / "__init__.py").write_text("def bar():\n    pass\n")
+    assert fingerprint != cache.source_fingerprint(str(package))
+
+
+def test_distribution_fingerprint():
+    """Test that installed distributions are fingerprinted without importing them."""
+    assert cache.distribution_fingerprint("yaml") is not None
+    assert cache.distribution_fingerprint("not_an_installed_module") is None
+
+
+def test_cached_extraction_misses_on_schema_bump(cache_dir, monkeypatch):
+    """Test that bumping the cache schema or ladar version misses the cache."""
+    from ladar.cmds.extract import cached_extraction
+
+    args = argparse.Namespace(
+        no_cache=False,
+        cache_dir=cache_dir,
+        cache_max_size=16,
+        module="json",
+        version=None,
+        include_private=False,
+        exclude_docstrings=False,
+        disable_normalization=False,
+        static=False,
+    )
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return {"ladar": {"date": "2020-01-01 00:00:00"}, "structure": {}}
+
+    cached_extraction(args, "fingerprint", extract)
+    api_structure = cached_extraction(args, "fingerprint", extract)
+    assert len(calls) == 1
+    assert api_structure["ladar"]["cached_date"] == "2020-01-01 00:00:00"
+    assert api_structure["ladar"]["date"] != "2020-01-01 00:00:00"
+
+    monkeypatch.setattr(cache, "CACHE_SCHEMA", cache.CACHE_SCHEMA + 1)
+    cached_extraction(args, "fingerprint", extract)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(ladar, "__version__", "999.0")
+    cached_extraction(args, "fingerprint", extract)
+    assert len(calls) == 3
@@ -0,0 +1,160 @@
+import os
+import subprocess
+import tempfile
+from unittest import mock
+
+import pytest
+
+import ladar.common.envpool as envpool
+import ladar.common.venv as temp_env
+import ladar.common.wheelhouse as wheelhouse
+
+
+def fake_create_virtual_env(env_dir=None):
+    env_dir = env_dir or tempfile.mkdtemp()
+    os.makedirs(env_dir, exist_ok=True)
+    return env_dir
+
+
+def fake_install(requirements, env_dir=None, options=None):
+    with open(os.path.join(env_dir, "installed.txt"), "w") as f:
+        f.write("x" * 100)
+
+
+@pytest.fixture
+def fake_venv():
+    with mock.patch.object(
+        temp_env, "create_virtual_env", side_effect=fake_create_virtual_env
+    ) as create, mock.patch.object(
+        temp_env, "install_packages_in_virtualenv", side_effect=fake_install
+    ), mock.patch.object(
+        envpool, "prepare_wheels", side_effect=lambda requirements, **_: requirements
+    ):
+        yield create
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_environments_are_reused(fake_venv, cache_dir):
+    """Test that an environment is built once per requirement set."""
+    with envpool.acquire(["six==1.16.0"], cache_dir=cache_dir) as env_dir:
+        assert os.path.exists(os.path.join(env_dir, envpool.READY_MARKER))
+    with envpool.acquire(["six==1.16.0"], cache_dir=cache_dir) as same_env_dir:
+        pass
+    with envpool.acquire(["six==1.15.0"], cache_dir=cache_dir) as other_env_dir:
+        pass
+
+    assert same_env_dir == env_dir
+    assert other_env_dir != env_dir
+    assert fake_venv.call_count == 2
+    entries = envpool.list_entries(cache_dir=cache_dir)
+    assert [entry["requirements"] for entry in entries] == [
+        ["six==1.16.0"],
+        ["six==1.15.0"],
+    ]
+
+
+def test_unpinned_requirements_are_pooled(fake_venv, cache_dir):
+    """Test that unpinned requirement sets reuse the environment they resolve to."""
+    wheels = ["/wheels/six-1.16.0-py2.py3-none-any.whl"]
+    with mock.patch.object(envpool, "prepare_wheels", return_value=wheels) as prepare:
+        with envpool.acquire(["six"], cache_dir=cache_dir) as env_dir:
+            pass
+        with envpool.acquire(["six"], cache_dir=cache_dir) as same_env_dir:
+            pass
+
+    assert same_env_dir == env_dir
+    assert os.path.isdir(env_dir)
+    assert fake_venv.call_count == 1
+    # Resolved on every run, as newer versions may be released
+    assert prepare.call_count == 2
+    assert all(not call.kwargs["record"] for call in prepare.call_args_list)
+    assert [
+        entry["requirements"] for entry in envpool.list_entries(cache_dir=cache_dir)
+    ] == [["six==1.16.0"]]
+
+
+def fake_pip_wheel(command, description):
+    """Download the latest 'six' online, or find it in the wheel cache offline."""
+    wheel_dir = command[command.index("--wheel-dir") + 1]
+    cache = command[command.index("--find-links") + 1]
+    if "--no-index" in command:
+        wheels = [wheel for wheel in os.listdir(cache) if wheel.startswith("six-")]
+        if not wheels:
+            raise subprocess.CalledProcessError(1, command)
+        wheel = wheels[0]
+    else:
+        wheel = "six-1.17.0-py3-none-any.whl"
+    with open(os.path.join(wheel_dir, wheel), "w"):
+        pass
+
+
+def test_unpinned_requirements_fill_the_wheel_cache(cache_dir):
+    """Test that an unpinned set installed online can be installed offline."""
+    with mock.patch.object(
+        temp_env, "create_virtual_env", side_effect=fake_create_virtual_env
+    ), mock.patch.object(
+        temp_env, "install_packages_in_virtualenv", side_effect=fake_install
+    ), mock.patch.object(
+        wheelhouse, "run_pip", side_effect=fake_pip_wheel
+    ):
+        with pytest.raises(subprocess.CalledProcessError):
+            with envpool.acquire(["six"], ["--no-index"], cache_dir=cache_dir):
+                pass
+        with envpool.acquire(["six"], cache_dir=cache_dir) as env_dir:
+            pass
+        with envpool.acquire(["six"], ["--no-index"], cache_dir=cache_dir) as offline:
+            pass
+
+    assert offline == env_dir
+    assert wheelhouse.wheel_cache_size(cache_dir)[0] == 1
+
+
+def test_failed_builds_are_not_kept(fake_venv, cache_dir):
+    """Test that an environment whose installation failed is not reused."""
+    with mock.patch.object(
+        temp_env, "install_packages_in_virtualenv", side_effect=RuntimeError
+    ):
+        with pytest.raises(RuntimeError):
+            with envpool.acquire(["six==1.16.0"], cache_dir=cache_dir):
+                pass
+    assert envpool.list_entries(cache_dir=cache_dir) == []
+
+    with envpool.acquire(["six==1.16.0"], cache_dir=cache_dir):
+        pass
+    assert len(envpool.list_entries(cache_dir=cache_dir)) == 1
+
+
+def test_prune_skips_environments_in_use(fake_venv, cache_dir):
+    """Test that the least recently used environments not in use are evicted."""
+    for index, version in enumerate(["1.14.0", "1.15.0", "1.16.0"]):
+        with envpool.acquire([f"six=={version}"], cache_dir=cache_dir) as env_dir:
+            marker = os.path.join(env_dir, envpool.READY_MARKER)
+        os.utime(marker, (1000 + index, 1000 + index))
+
+    with envpool.acquire(["six==1.14.0"], cache_dir=cache_dir):
+        # Acquiring makes six 1.14 the most recently used environment, and
+        # holding it prevents its eviction
+        evicted = envpool.prune(max_size=0, cache_dir=cache_dir)
+
+    assert [entry["requirements"] for entry in evicted] == [
+        ["six==1.15.0"],
+        ["six==1.16.0"],
+    ]
+    assert [
+        entry["requirements"] for entry in envpool.list_entries(cache_dir=cache_dir)
+    ] == [["six==1.14.0"]]
+
+
+def test_env_key_ignores_offline_mode():
+    """Test that environments built online are reused offline."""
+    requirements = ["six==1.16.0"]
+    assert envpool.make_env_key(requirements, ["--no-index"]) == envpool.make_env_key(
+        requirements
+    )
+    assert envpool.make_env_key(
+        requirements, ["--find-links", "/wheels"]
+    ) != envpool.make_env_key(requirements)
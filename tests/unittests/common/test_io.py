@@ -9,10 +9,14 @@ import toml
 import yaml
 
 from ladar.common.io import (
+    externalize_arrays,
+    iter_jsonl,
     load,
     save_file,
     save_json,
+    save_jsonl,
     save_md,
+    save_npz,
     save_py,
     save_toml,
     save_txt,
@@ -90,6 +94,7 @@ def test_load_parsing_error():
         ("test.toml", {"key": "value"}, save_toml),
         ("test.yaml", {"key": "value"}, save_yaml),
         ("test.json", {"key": "value"}, save_json),
+        ("test.jsonl", [{"key": "value"}], save_jsonl),
         ("test.xml", ET.Element("root"), save_xml),
     ],
 )
@@ -174,3 +179,57 @@ def test_save_yaml(monkeypatch):
             save_yaml("test.yaml", {"key": "value"})
             mock_file.assert_called_once_with("test.yaml", "w", encoding="utf-8")
             mock_yaml_dump.assert_called_once_with({"key": "value"}, mock_file())
+
+
+# Test the save_jsonl function along with the JSON Lines loaders
+def test_save_jsonl_roundtrip(tmp_path):
+    filename = str(tmp_path / "test.jsonl")
+
+    def records():
+        yield {"ladar": {"module_name": "json"}}
+        yield {"path": ["json.dumps"], "type": "function"}
+
+    save_jsonl(filename, records())
+
+    with open(filename, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert list(iter_jsonl(filename)) == list(records())
+    assert load(filename) == list(records())
+
+
+def test_save_and_load_npz(tmp_path):
+    """Test that sparse matrices are saved and loaded back in NPZ format."""
+    import numpy as np
+    import scipy.sparse
+
+    matrix = scipy.sparse.random(50, 1000, density=0.01, format="csr", random_state=0)
+    save_npz(str(tmp_path / "matrix.npz"), matrix)
+    loaded = load(str(tmp_path / "matrix.npz"))
+
+    assert scipy.sparse.isspmatrix_csr(loaded)
+    np.testing.assert_array_equal(loaded.toarray(), matrix.toarray())
+
+
+def test_externalize_arrays(tmp_path):
+    """Test that sparse matrices are saved aside and arrays turned into lists."""
+    import numpy as np
+    import scipy.sparse
+
+    matrix = scipy.sparse.identity(3, format="csr")
+    output = str(tmp_path / "results.json")
+    content = externalize_arrays(
+        output,
+        {"features": matrix, "names": np.array(["a", "b"]), "steps": [{"x": matrix}]},
+    )
+
+    assert content["features"] == {
+        "format": "npz",
+        "path": "results.features.npz",
+        "shape": [3, 3],
+        "nnz": 3,
+    }
+    assert content["names"] == ["a", "b"]
+    assert content["steps"][0]["x"]["path"] == "results.steps.0.x.npz"
+    json.dumps(content)
+    loaded = load(str(tmp_path / "results.features.npz"))
+    np.testing.assert_array_equal(loaded.toarray(), np.eye(3))
@@ -1,6 +1,8 @@
+import importlib.metadata
 import os
 import shutil
 import sys
+from unittest import mock
 
 import pytest
 
@@ -90,3 +92,38 @@ def test_error_when_no_env_created():
         RuntimeError, match="The virtual environment has not been created yet."
     ):
         temp_env.install_package_in_virtualenv("requests")
+
+
+@pytest.mark.parametrize(
+    "version, shared",
+    [("23.2.1", True), ("22.3", True), ("22.2.2", False), (None, False)],
+)
+def test_get_shared_pip(version, shared):
+    """
+    Test that the pip of ladar only drives the environments when it supports
+    the --python option.
+    """
+
+    def fake_version(name):
+        if version is None:
+            raise importlib.metadata.PackageNotFoundError(name)
+        return version
+
+    temp_env.get_shared_pip.cache_clear()
+    try:
+        with mock.patch.object(importlib.metadata, "version", side_effect=fake_version):
+            assert (temp_env.get_shared_pip() is not None) == shared
+    finally:
+        temp_env.get_shared_pip.cache_clear()
+
+
+def test_environments_without_pip():
+    """
+    Test that environments are created without pip when the shared pip can
+    install packages in them.
+    """
+    if temp_env.get_shared_pip() is None:
+        pytest.skip("The pip of ladar cannot drive other environments.")
+    env_dir = temp_env.create_persistent_virtual_env()
+
+    assert not os.path.exists(os.path.join(temp_env.get_site_packages(env_dir), "pip"))
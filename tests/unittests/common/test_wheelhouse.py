@@ -0,0 +1,150 @@
+import os
+from unittest import mock
+
+import pytest
+
+import ladar.common.wheelhouse as wheelhouse_module
+from ladar.common.wheelhouse import (
+    get_pip_options,
+    is_prerelease,
+    list_versions,
+    pin_wheels,
+    prepare_wheels,
+    resolve_versions,
+    version_key,
+    wheel_cache_size,
+)
+
+
+@pytest.fixture
+def wheelhouse(tmp_path):
+    for filename in [
+        "eventlet-0.30.0-py3-none-any.whl",
+        "eventlet-0.31.0.tar.gz",
+        "eventlet-0.33.0rc1-py3-none-any.whl",
+        "eventlet-0.33.0-py3-none-any.whl",
+        "eventlet-0.36.1-py3-none-any.whl",
+        "eventlet-0.36.1.tar.gz",
+        "zope.interface-6.0-cp311-cp311-manylinux_2_17_x86_64.whl",
+        "README.txt",
+    ]:
+        (tmp_path / filename).write_text("")
+    return str(tmp_path)
+
+
+def test_version_key():
+    """Test that versions are compared numerically, pre-releases first."""
+    versions = ["0.31", "0.4", "0.31.1", "0.31rc1", "0.30.0"]
+    assert sorted(versions, key=version_key) == [
+        "0.4",
+        "0.30.0",
+        "0.31rc1",
+        "0.31",
+        "0.31.1",
+    ]
+    assert version_key("1.0") == version_key("1.0.0")
+
+
+def test_version_key_pep440_order():
+    """Test that versions are ordered as PEP 440 does, local labels ignored."""
+    versions = ["1.0.post1", "1.0", "1.0rc1", "1.0.dev1", "1.0a1", "1.0-2", "1.0.1"]
+    assert sorted(versions, key=version_key) == [
+        "1.0.dev1",
+        "1.0a1",
+        "1.0rc1",
+        "1.0",
+        "1.0.post1",
+        "1.0-2",
+        "1.0.1",
+    ]
+    assert version_key("1.0+abc") == version_key("1.0")
+    assert version_key("1.0rc1.dev2") < version_key("1.0rc1")
+
+
+def test_is_prerelease():
+    """Test that only the suffix after the release segment marks pre-releases."""
+    for version in ["1.0rc1", "1.0a2", "1.0.dev3", "2.0b1", "1.0.post1.dev1"]:
+        assert is_prerelease(version)
+    for version in ["1.0", "1.0.post1", "1.0+abc", "1.0+cpu.dev", "1.0-1"]:
+        assert not is_prerelease(version)
+
+
+def test_list_versions(wheelhouse):
+    """Test that the versions are read from the wheels and source distributions."""
+    assert list_versions(wheelhouse, "eventlet") == [
+        "0.30.0",
+        "0.31.0",
+        "0.33.0rc1",
+        "0.33.0",
+        "0.36.1",
+    ]
+    assert list_versions(wheelhouse, "Zope_Interface") == ["6.0"]
+
+
+def test_resolve_versions(wheelhouse):
+    """Test that lists are kept as is and ranges are resolved from the wheelhouse."""
+    assert resolve_versions("0.30.0, 0.31.0,0.30.0", "eventlet") == ["0.30.0", "0.31.0"]
+    assert resolve_versions("0.31..0.36", "eventlet", wheelhouse) == [
+        "0.31.0",
+        "0.33.0",
+    ]
+    assert resolve_versions("0.33..", "eventlet", wheelhouse) == ["0.33.0", "0.36.1"]
+
+    with pytest.raises(ValueError):
+        resolve_versions("0.31..0.36", "eventlet")
+    with pytest.raises(ValueError):
+        resolve_versions("1.0..2.0", "eventlet", wheelhouse)
+
+
+def test_get_pip_options(wheelhouse):
+    """Test that a wheelhouse is searched by pip."""
+    assert get_pip_options() == []
+    assert get_pip_options(wheelhouse) == ["--find-links", wheelhouse]
+    assert get_pip_options(wheelhouse, offline=True) == [
+        "--no-index",
+        "--find-links",
+        wheelhouse,
+    ]
+
+
+def fake_pip_wheel(command, description):
+    wheel_dir = command[command.index("--wheel-dir") + 1]
+    for requirement in command[command.index("--find-links") + 2 :]:
+        name, _, version = requirement.partition("==")
+        with open(os.path.join(wheel_dir, f"{name}-{version}-py3-none-any.whl"), "w"):
+            pass
+        # A dependency
+        with open(os.path.join(wheel_dir, "six-1.16.0-py3-none-any.whl"), "w"):
+            pass
+
+
+def test_prepare_wheels(tmp_path):
+    """Test that requirement sets are resolved to cached wheels once."""
+    cache_dir = str(tmp_path)
+    with mock.patch.object(
+        wheelhouse_module, "run_pip", side_effect=fake_pip_wheel
+    ) as run_pip:
+        wheels = prepare_wheels(["idna==3.6"], cache_dir=cache_dir)
+        assert prepare_wheels(["idna==3.6"], cache_dir=cache_dir) == wheels
+        assert run_pip.call_count == 1
+
+        prepare_wheels(["idna==3.5"], cache_dir=cache_dir, record=False)
+        prepare_wheels(["idna==3.5"], cache_dir=cache_dir, record=False)
+        assert run_pip.call_count == 3
+
+    assert [os.path.basename(wheel) for wheel in wheels] == [
+        "idna-3.6-py3-none-any.whl",
+        "six-1.16.0-py3-none-any.whl",
+    ]
+    assert all(os.path.dirname(wheel) == str(tmp_path / "wheels") for wheel in wheels)
+    assert wheel_cache_size(cache_dir) == (3, 0)
+
+
+def test_pin_wheels():
+    """Test that wheels are pinned to their normalized project and version."""
+    assert pin_wheels(
+        [
+            "/cache/wheels/urllib3-2.2.3-py3-none-any.whl",
+            "/cache/wheels/Zope_Interface-6.0-cp311-cp311-linux_x86_64.whl",
+        ]
+    ) == ["urllib3==2.2.3", "zope-interface==6.0"]
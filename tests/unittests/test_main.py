@@ -0,0 +1,88 @@
+import argparse
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+from ladar.cmds import COMMANDS
+from ladar.cmds.compare import add_arguments, find_pipeline_algorithms
+from ladar.main import find_command
+
+# Modules that are slow to import, and only needed to run some commands
+HEAVY_MODULES = ["sklearn", "numpy", "Levenshtein"]
+
+
+def test_find_command():
+    """Test that the selected command is found before parsing the command line."""
+    assert find_command(["extract", "--module", "json"], COMMANDS) == "extract"
+    assert find_command(["-vv", "extract-batch", "--spec", "x"], COMMANDS) == (
+        "extract-batch"
+    )
+    assert find_command(["--help"], COMMANDS) is None
+    assert find_command(["unknown", "extract"], COMMANDS) is None
+    assert find_command([], COMMANDS) is None
+
+
+def test_find_pipeline_algorithms():
+    """Test that the algorithms of the pipeline are found before parsing."""
+    assert find_pipeline_algorithms(
+        ["--pipeline", "extract:TFIDF, cluster:dbscan(eps=0.3, min_samples=2)"]
+    ) == ["tfidf", "dbscan"]
+    assert find_pipeline_algorithms(["--pipeline=match:tiered,invalid"]) == ["tiered"]
+    assert find_pipeline_algorithms(["--output", "x", "--pipeline"]) == []
+
+
+def test_compare_arguments_of_pipeline():
+    """Test that the compare command only has the options of its algorithms."""
+    argv = ["--structures", "a", "b", "--output", "c", "--pipeline", "cluster:dbscan"]
+    parser = argparse.ArgumentParser()
+    add_arguments(parser, argv)
+
+    args = parser.parse_args([*argv, "--dbscan-min_samples", "4"])
+    assert args.dbscan_min_samples == 4
+    assert args.dbscan_eps == 0.5
+    with pytest.raises(SystemExit):
+        parser.parse_args([*argv, "--tfidf-max_features", "10"])
+
+
+@pytest.mark.parametrize("command_name", sorted(COMMANDS))
+def test_manifest_matches_commands(command_name):
+    """Test that the manifest of the commands matches their modules."""
+    module = importlib.import_module(COMMANDS[command_name]["module"])
+
+    assert hasattr(module, "add_arguments") and hasattr(module, "main")
+    assert getattr(module, "command_name", module.__name__.split(".")[-1]) == (
+        command_name
+    )
+    assert " ".join(module.command_description.split()) == (
+        COMMANDS[command_name]["description"]
+    )
+
+
+@pytest.mark.parametrize(
+    "argv", [["--help"], ["normalize", "--help"], ["compare", "--help"]]
+)
+def test_startup_imports(argv):
+    """
+    Test that building the command line parser does not import the algorithms
+    and their dependencies.
+    """
+    code = (
+        "import sys; from ladar.main import main; "
+        f"sys.argv = ['ladar', *{argv!r}]; main()"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    imported = {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+    assert result.returncode == 0
+    assert "ladar.main" in imported
+    assert not [module for module in HEAVY_MODULES if module in imported]